@@ -0,0 +1,321 @@
+"""Benchmark the gotify clients against an in-process stand-in for the server.
+
+HTTP requests are answered by an `httpx.MockTransport` with pre-encoded
+responses and push messages are sent by a local websocket server, so the
+numbers mostly reflect the overhead of this library. Run it with
+`nox -s benchmark` or `python benchmarks/bench.py --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+import warnings
+from typing import Any, Awaitable, Callable, Union
+
+import httpx
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import ServerConnection, serve
+
+from gotify import AsyncGotify, Gotify
+
+BASE_URL = "http://gotify.example.com"
+APP_TOKEN = "AWH0wZ5r0Mbac.r"
+CLIENT_TOKEN = "C4er8DTiNk08mtt"
+
+Runner = Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+
+
+def message(id: int) -> dict[str, Any]:
+    return {
+        "id": id,
+        "appid": 1,
+        "message": f"Backup #{id} was successfully finished.",
+        "title": "Backup",
+        "priority": 2,
+        "date": "2018-02-27T19:36:10.5045044+01:00",
+        "extras": {"client::display": {"contentType": "text/markdown"}},
+    }
+
+
+class FakeServer:
+    """Answers gotify API requests with pre-encoded responses."""
+
+    def __init__(self, messages: int = 0, page_size: int = 100) -> None:
+        self.version = json.dumps({"version": "2.4.0", "commit": "", "buildDate": ""})
+        self.created = json.dumps(message(1))
+        # pages of `messages` messages, newest first, keyed by `since`
+        self.pages: dict[int, str] = {}
+        since = 0
+        remaining = messages
+        while True:
+            ids = range(remaining, max(remaining - page_size, 0), -1)
+            remaining -= len(ids)
+            paging: dict[str, Any] = {"size": len(ids), "limit": page_size}
+            if remaining:
+                paging["since"] = ids[-1]
+                paging["next"] = f"{BASE_URL}/message?limit={page_size}&since={ids[-1]}"
+            page = {"messages": [message(id) for id in ids], "paging": paging}
+            self.pages[since] = json.dumps(page)
+            if not remaining:
+                break
+            since = ids[-1]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            content = self.created
+        elif request.url.path == "/version":
+            content = self.version
+        else:
+            content = self.pages[int(request.url.params.get("since", 0))]
+        return httpx.Response(
+            200, content=content, headers={"Content-Type": "application/json"}
+        )
+
+
+class StreamServer:
+    """Local websocket server that sends a number of push messages."""
+
+    def __init__(self, frames: int) -> None:
+        self.frames = [json.dumps(message(id)) for id in range(1, frames + 1)]
+        self.server = serve(self.handler, "127.0.0.1", 0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.socket.getsockname()[:2]
+        self.base_url = f"http://{host}:{port}"
+
+    def handler(self, websocket: ServerConnection) -> None:
+        for frame in self.frames:
+            websocket.send(frame)
+        try:
+            websocket.recv()  # wait until the client disconnects
+        except ConnectionClosed:
+            pass
+
+
+def sync_client(server: FakeServer, base_url: str = BASE_URL) -> Gotify:
+    return Gotify(
+        base_url,
+        app_token=APP_TOKEN,
+        client_token=CLIENT_TOKEN,
+        transport=httpx.MockTransport(server.handler),
+    )
+
+
+def async_client(server: FakeServer, base_url: str = BASE_URL) -> AsyncGotify:
+    return AsyncGotify(
+        base_url,
+        app_token=APP_TOKEN,
+        client_token=CLIENT_TOKEN,
+        transport=httpx.MockTransport(server.handler),
+    )
+
+
+# --- Benchmarks ---------------------------------------------------------------
+# Each benchmark returns a function that performs `n` operations.
+
+
+def sync_request(n: int) -> Runner:
+    gf = sync_client(FakeServer())
+
+    def run() -> None:
+        for _ in range(n):
+            gf.get_version()
+
+    return run
+
+
+def sync_create_message(n: int) -> Runner:
+    gf = sync_client(FakeServer())
+
+    def run() -> None:
+        for _ in range(n):
+            gf.create_message("Backup was successfully finished.", priority=2)
+
+    return run
+
+
+def sync_create_messages(n: int) -> Runner:
+    gf = sync_client(FakeServer())
+    messages = [f"Backup #{i} was successfully finished." for i in range(n)]
+
+    def run() -> None:
+        gf.create_messages(messages, max_workers=10)
+
+    return run
+
+
+def sync_iter_messages(n: int) -> Runner:
+    gf = sync_client(FakeServer(messages=n))
+
+    def run() -> None:
+        for _ in gf.iter_messages(page_size=100):
+            pass
+
+    return run
+
+
+def sync_stream(n: int) -> Runner:
+    server = StreamServer(n)
+    gf = Gotify(server.base_url, client_token=CLIENT_TOKEN)
+
+    def run() -> None:
+        received = 0
+        stream = gf.stream(max_queue=256)
+        try:
+            for _ in stream:
+                received += 1
+                if received == n:
+                    break
+        finally:
+            stream.close()
+
+    return run
+
+
+def async_request(n: int) -> Runner:
+    agf = async_client(FakeServer())
+
+    async def run() -> None:
+        for _ in range(n):
+            await agf.get_version()
+
+    return run
+
+
+def async_create_message(n: int) -> Runner:
+    agf = async_client(FakeServer())
+
+    async def run() -> None:
+        for _ in range(n):
+            await agf.create_message("Backup was successfully finished.", priority=2)
+
+    return run
+
+
+def async_create_messages(n: int) -> Runner:
+    agf = async_client(FakeServer())
+    messages = [f"Backup #{i} was successfully finished." for i in range(n)]
+
+    async def run() -> None:
+        await agf.create_messages(messages, concurrency=10)
+
+    return run
+
+
+def async_iter_messages(n: int) -> Runner:
+    agf = async_client(FakeServer(messages=n))
+
+    async def run() -> None:
+        async for _ in agf.iter_messages(page_size=100):
+            pass
+
+    return run
+
+
+def async_stream(n: int) -> Runner:
+    server = StreamServer(n)
+    agf = AsyncGotify(server.base_url, client_token=CLIENT_TOKEN)
+
+    async def run() -> None:
+        received = 0
+        stream = agf.stream()
+        try:
+            async for _ in stream:
+                received += 1
+                if received == n:
+                    break
+        finally:
+            await stream.aclose()
+
+    return run
+
+
+# name, setup, number of operations
+BENCHMARKS: list[tuple[str, Callable[[int], Runner], int]] = [
+    ("sync_request", sync_request, 2000),
+    ("sync_create_message", sync_create_message, 2000),
+    ("sync_create_messages", sync_create_messages, 2000),
+    ("sync_iter_messages", sync_iter_messages, 10000),
+    ("sync_stream", sync_stream, 10000),
+    ("async_request", async_request, 2000),
+    ("async_create_message", async_create_message, 2000),
+    ("async_create_messages", async_create_messages, 2000),
+    ("async_iter_messages", async_iter_messages, 10000),
+    ("async_stream", async_stream, 10000),
+]
+
+
+def measure(run: Runner, repeat: int) -> list[float]:
+    """Return the duration of each repetition in seconds."""
+
+    async def measure_async() -> list[float]:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await run()  # type: ignore[misc]
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    if asyncio.iscoroutinefunction(run):
+        return asyncio.run(measure_async())
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k", dest="filter", default="", help="only run benchmarks containing this"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiply the number of operations"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions (best wins)")
+    parser.add_argument("--json", help="save the results to a JSON file")
+    parser.add_argument(
+        "--compare", help="compare with the results in a JSON file created by --json"
+    )
+    args = parser.parse_args()
+
+    # AsyncGotify.stream() uses the legacy websockets client
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    baseline: dict[str, float] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results: dict[str, float] = {}
+    print(f"{'benchmark':<24} {'ops/s':>12} {'µs/op':>10} {'stdev':>8}")
+    for name, setup, number in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        n = max(1, int(number * args.scale))
+        timings = measure(setup(n), args.repeat + 1)[1:]  # first run warms up
+        per_op = min(timings) / n
+        results[name] = per_op
+        line = (
+            f"{name:<24} {1 / per_op:>12,.0f} {per_op * 1e6:>10.2f}"
+            f" {statistics.pstdev(timings) / min(timings):>7.1%}"
+        )
+        if name in baseline:
+            line += f" {per_op / baseline[name] - 1:>+8.1%} vs. baseline"
+        print(line, flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
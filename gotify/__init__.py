@@ -2,8 +2,97 @@
 
 from __future__ import annotations
 
-from .async_gotify import AsyncGotify
-from .errors import GotifyConfigurationError, GotifyError
-from .gotify import Gotify
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["AsyncGotify", "Gotify", "GotifyError", "GotifyConfigurationError"]
+if TYPE_CHECKING:
+    from .app_index import ApplicationIndex
+    from .async_gotify import AsyncGotify
+    from .cache import ResponseCache
+    from .circuit_breaker import CircuitBreaker
+    from .endpoints import EndpointPool
+    from .errors import (
+        GotifyCircuitOpenError,
+        GotifyConfigurationError,
+        GotifyError,
+        GotifyQuorumError,
+        GotifyRateLimitError,
+    )
+    from .gotify import Gotify
+    from .images import ImageManifest
+    from .metrics import Metrics
+    from .multi import AsyncMultiGotify, FanOutResult, MultiGotify
+    from .observer import Observer, RequestEvent
+    from .outbox import AsyncOutbox, Outbox
+    from .rate_limit import RateLimiter
+    from .retry import RetryPolicy
+    from .spool import Spool
+
+__all__ = [
+    "ApplicationIndex",
+    "AsyncGotify",
+    "AsyncMultiGotify",
+    "AsyncOutbox",
+    "CircuitBreaker",
+    "EndpointPool",
+    "FanOutResult",
+    "Gotify",
+    "GotifyError",
+    "GotifyCircuitOpenError",
+    "GotifyConfigurationError",
+    "GotifyQuorumError",
+    "GotifyRateLimitError",
+    "ImageManifest",
+    "Metrics",
+    "MultiGotify",
+    "Observer",
+    "Outbox",
+    "RateLimiter",
+    "RequestEvent",
+    "ResponseCache",
+    "RetryPolicy",
+    "Spool",
+]
+
+# submodules are only imported when one of their attributes is accessed, so
+# that `import gotify` doesn't load httpx or asyncio
+_LAZY_ATTRIBUTES = {
+    "ApplicationIndex": "app_index",
+    "AsyncGotify": "async_gotify",
+    "AsyncMultiGotify": "multi",
+    "AsyncOutbox": "outbox",
+    "CircuitBreaker": "circuit_breaker",
+    "EndpointPool": "endpoints",
+    "FanOutResult": "multi",
+    "Gotify": "gotify",
+    "GotifyError": "errors",
+    "GotifyCircuitOpenError": "errors",
+    "GotifyConfigurationError": "errors",
+    "GotifyQuorumError": "errors",
+    "GotifyRateLimitError": "errors",
+    "ImageManifest": "images",
+    "Metrics": "metrics",
+    "MultiGotify": "multi",
+    "Observer": "observer",
+    "Outbox": "outbox",
+    "RateLimiter": "rate_limit",
+    "RequestEvent": "observer",
+    "ResponseCache": "cache",
+    "RetryPolicy": "retry",
+    "Spool": "spool",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,92 @@
+"""Look up applications by name or token without scanning all of them."""
+
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from .response_types import Application
+
+__all__ = ["ApplicationIndex"]
+
+
+class ApplicationIndex:
+    """Index of applications by id, name and token.
+
+    `Gotify` and `AsyncGotify` keep an index that is rebuilt from the response
+    of `get_applications()` and updated incrementally when applications are
+    created, updated or deleted through the same client.
+    """
+
+    def __init__(self, applications: Iterable[Application] | None = None) -> None:
+        """Initialise the index, optionally with a list of applications."""
+        self.loaded = False
+        self._by_id: dict[int, Application] = {}
+        self._by_name: dict[str, list[Application]] = {}
+        self._by_token: dict[str, Application] = {}
+        self._lock = threading.Lock()
+        if applications is not None:
+            self.replace(applications)
+
+    def __len__(self) -> int:
+        """Return the number of indexed applications."""
+        return len(self._by_id)
+
+    def replace(self, applications: Iterable[Application]) -> None:
+        """Replace all indexed applications."""
+        with self._lock:
+            self._by_id = {}
+            self._by_name = {}
+            self._by_token = {}
+            for app in applications:
+                self._add(app)
+            self.loaded = True
+
+    def update(self, application: Application) -> None:
+        """Add or update a single application."""
+        with self._lock:
+            self._remove(application["id"])
+            self._add(application)
+
+    def remove(self, id: int) -> None:
+        """Remove an application."""
+        with self._lock:
+            self._remove(id)
+
+    def clear(self) -> None:
+        """Remove all applications and mark the index as not loaded."""
+        with self._lock:
+            self._by_id = {}
+            self._by_name = {}
+            self._by_token = {}
+            self.loaded = False
+
+    def by_id(self, id: int) -> Application | None:
+        """Return the application with an id."""
+        return self._by_id.get(id)
+
+    def by_name(self, name: str) -> list[Application]:
+        """Return all applications with a name."""
+        return list(self._by_name.get(name, ()))
+
+    def by_token(self, token: str) -> Application | None:
+        """Return the application with a token."""
+        return self._by_token.get(token)
+
+    def _add(self, app: Application) -> None:
+        self._by_id[app["id"]] = app
+        self._by_name.setdefault(app["name"], []).append(app)
+        if "token" in app:
+            self._by_token[app["token"]] = app
+
+    def _remove(self, id: int) -> None:
+        app = self._by_id.pop(id, None)
+        if app is None:
+            return
+        apps = [other for other in self._by_name[app["name"]] if other["id"] != id]
+        if apps:
+            self._by_name[app["name"]] = apps
+        else:
+            del self._by_name[app["name"]]
+        if "token" in app:
+            del self._by_token[app["token"]]
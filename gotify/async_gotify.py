@@ -2,12 +2,46 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import time
+import weakref
+from datetime import datetime, timedelta
 from types import TracebackType
-from typing import Any, AsyncGenerator, BinaryIO, TypeVar
-
-import httpx
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Collection,
+    Iterable,
+    Mapping,
+    TypeVar,
+    Union,
+)
 
-from .errors import GotifyConfigurationError, GotifyError
+from .app_index import ApplicationIndex
+from .backoff import exponential_backoff
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker
+from .endpoints import BaseURL, EndpointPool, is_failover_error
+from .errors import (
+    GotifyCircuitOpenError,
+    GotifyConfigurationError,
+    GotifyError,
+    GotifyRateLimitError,
+)
+from .filters import MessagePredicate, message_filter
+from .images import ImageManifest, file_digest
+from .json_codec import JSONCodec, default_codec
+from .metrics import Metrics
+from .models import ApplicationModel, ClientModel, MessageModel, UserModel, _Model
+from .ndjson import open_ndjson, read_ndjson_by_id
+from .observer import Observer, RequestEvent, endpoint_template, notify
+from .rate_limit import RateLimiter
 from .response_types import (
     Application,
     Client,
@@ -18,42 +52,175 @@ from .response_types import (
     User,
     VersionInfo,
 )
+from .retry import RetryPolicy
+from .spool import Spool, is_spoolable
+
+if TYPE_CHECKING:
+    import httpx
+    from websockets.legacy.client import WebSocketClientProtocol
 
 __all__ = ["AsyncGotify"]
 
 
 AsyncGotifyType = TypeVar("AsyncGotifyType", bound="AsyncGotify")
 
+MessageItem = Union[str, Mapping[str, Any]]
+
+
+def _send_errors() -> tuple[type[Exception], ...]:
+    # errors that only affect a single message of a batch
+    import httpx
+
+    return (
+        GotifyError,
+        GotifyCircuitOpenError,
+        GotifyRateLimitError,
+        httpx.HTTPError,
+    )
+
+
+# fields of exported messages that are sent when they are imported
+_IMPORTED_FIELDS = ("message", "title", "priority", "extras")
+
+
+def _next_since(page: PagedMessages) -> int | None:
+    # gotify only includes a link to the next page if there are more messages
+    paging = page.get("paging", {})
+    if not page.get("messages") or not paging.get("next"):
+        return None
+    return paging.get("since")
+
+
+_background_tasks: set[asyncio.Future] = set()
+
+
+def _close_http_client(
+    http_client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop
+) -> None:
+    # called by the finalizer of an AsyncGotify object; the client can only be
+    # closed from the event loop it was created in
+    if loop.is_closed():
+        return
+    try:
+        running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        task: asyncio.Future = loop.create_task(http_client.aclose())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(http_client.aclose(), loop)
+
 
 class AsyncGotify:
     """Asynchronous implementation of a Gotify client."""
 
     def __init__(
         self,
-        base_url: str | None = None,
+        base_url: BaseURL = None,
         app_token: str | None = None,
         client_token: str | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        spool: Spool | None = None,
+        rate_limit: RateLimiter | None = None,
+        client_rate_limit: RateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+        models: bool = False,
+        json_codec: JSONCodec | None = None,
+        observers: Iterable[Observer] | None = None,
+        metrics: Metrics | None = None,
     ) -> None:
         """Initialise the Gotify object.
 
         Args:
-            base_url (str, optional): Base URL of your Gotify instance,
-                eg. https://gotify.example.com.
+            base_url (str, list of str or EndpointPool, optional): Base URL of
+                your Gotify instance, eg. https://gotify.example.com. Requests
+                to multiple replicas fail over and are balanced by an
+                `EndpointPool`.
 
             app_token (str, optional): token to authenticate to receive
                 messages and manage stuff.
 
             client_token (str, optional): token to authenticate to send
                 messages.
+
+            limits (httpx.Limits, optional): connection pool limits and
+                keep-alive expiry of the underlying HTTP client.
+
+            http2 (bool, optional): enable HTTP/2 to multiplex concurrent
+                requests over a single connection. Requires `h2`, which can be
+                installed with `pip install gotify[http2]`.
+
+            transport (httpx.AsyncBaseTransport, optional): transport of the
+                underlying HTTP client, e.g. to configure retries of failed
+                connections, a proxy or a Unix domain socket. `limits` and
+                `http2` need to be configured on the transport in this case.
+
+            spool (Spool, optional): persist messages that can't be delivered
+                and send them again before the next message.
+
+            rate_limit (RateLimiter, optional): limit the rate of requests that
+                are authenticated with an application token.
+
+            client_rate_limit (RateLimiter, optional): limit the rate of
+                requests that are authenticated with a client token.
+
+            retry (RetryPolicy, optional): send requests again that failed
+                because of transient errors.
+
+            circuit_breaker (CircuitBreaker, optional): reject requests without
+                contacting the server after repeated failures.
+
+            cache (ResponseCache, optional): cache responses of rarely changing
+                endpoints like `get_applications()`.
+
+            models (bool, optional): return compact objects from
+                `gotify.models` instead of dicts for messages, applications,
+                clients and users.
+
+            json_codec (JSONCodec, optional): encode and decode JSON of
+                requests, responses and push messages. By default, orjson or
+                msgspec are used if installed.
+
+            observers (iterable of Observer, optional): get notified about
+                requests and push message streams.
+
+            metrics (Metrics, optional): collect request latencies, counters
+                and queue depths.
         """
-        self.base_url: str | None = base_url
+        self.base_url: str | None = None
+        self.endpoints: EndpointPool | None = None
+        self._set_base_url(base_url)
         self.app_token: str | None = app_token
         self.client_token: str | None = client_token
+        self.limits: httpx.Limits | None = limits
+        self.http2: bool = http2
+        self.transport: httpx.AsyncBaseTransport | None = transport
+        self.spool: Spool | None = spool
+        self.rate_limit: RateLimiter | None = rate_limit
+        self.client_rate_limit: RateLimiter | None = client_rate_limit
+        self.retry: RetryPolicy | None = retry
+        self.circuit_breaker: CircuitBreaker | None = circuit_breaker
+        self.cache: ResponseCache | None = cache
+        self.models: bool = models
+        self.json_codec: JSONCodec = json_codec or default_codec()
+        self.observers: list[Observer] = list(observers or ())
+        self.metrics: Metrics | None = metrics
+        if metrics is not None:
+            self.observers.append(metrics)
+        self.app_index = ApplicationIndex()
         self.http_client: httpx.AsyncClient | None = None
+        self._http_client_loop: asyncio.AbstractEventLoop | None = None
+        self._http_client_finalizer: weakref.finalize | None = None
+        self._spool_lock: asyncio.Lock | None = None
 
     async def __aenter__(self: AsyncGotifyType) -> AsyncGotifyType:  # -> Self:
-        if self.http_client is None:
-            self.http_client = await httpx.AsyncClient().__aenter__()
+        self._get_http_client()
         return self
 
     async def __aexit__(
@@ -62,19 +229,26 @@ class AsyncGotify:
         exc_value: BaseException,
         traceback: TracebackType,
     ) -> None:
-        if self.http_client is not None:
-            await self.http_client.__aexit__(exc_type, exc_value, traceback)
-            self.http_client = None
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool.
+
+        A new pool is created automatically when the next request is sent.
+        """
+        http_client = self._detach_http_client()
+        if http_client is not None:
+            await http_client.aclose()
 
     def config(
         self,
-        base_url: str | None = None,
+        base_url: BaseURL = None,
         app_token: str | None = None,
         client_token: str | None = None,
     ) -> None:
         """Set up the gotify object."""
         if base_url:
-            self.base_url = base_url
+            self._set_base_url(base_url)
         if app_token:
             self.app_token = app_token
         if client_token:
@@ -84,7 +258,9 @@ class AsyncGotify:
 
     async def get_applications(self) -> list[Application]:
         """Return all applications."""
-        return await self._request("/application")
+        applications = await self._request("/application", model=ApplicationModel)
+        self.app_index.replace(applications)
+        return applications
 
     async def create_application(
         self,
@@ -93,7 +269,7 @@ class AsyncGotify:
         default_priority: int | None = None,
     ) -> Application:
         """Create an application."""
-        return await self._request(
+        application = await self._request(
             "/application",
             data={
                 "name": name,
@@ -101,7 +277,10 @@ class AsyncGotify:
                 "defaultPriority": default_priority,
             },
             method="post",
+            model=ApplicationModel,
         )
+        self.app_index.update(application)
+        return application
 
     async def update_application(
         self,
@@ -111,7 +290,7 @@ class AsyncGotify:
         default_priority: int | None = None,
     ) -> Application:
         """Update an application."""
-        return await self._request(
+        application = await self._request(
             f"/application/{id}",
             data={
                 "name": name,
@@ -119,37 +298,188 @@ class AsyncGotify:
                 "defaultPriority": default_priority,
             },
             method="put",
+            model=ApplicationModel,
         )
+        self.app_index.update(application)
+        return application
 
     async def delete_application(self, id: int) -> None:
         """Delete an application."""
-        return await self._request(f"/application/{id}", method="delete")
+        await self._request(f"/application/{id}", method="delete")
+        self.app_index.remove(id)
 
-    async def upload_application_image(self, id: int, image: BinaryIO) -> Application:
-        """Upload an image for an application."""
-        return await self._request(
-            f"/application/{id}/image", file=image, method="post"
+    async def upload_application_image(
+        self, id: int, image: BinaryIO | str | os.PathLike[str]
+    ) -> Application:
+        """Upload an image for an application.
+
+        `image` is a file opened in binary mode or the path of an image file.
+        The file is streamed in chunks instead of being read into memory.
+        """
+        if isinstance(image, (str, os.PathLike)):
+            with open(image, "rb") as f:
+                return await self.upload_application_image(id, f)
+        application = await self._request(
+            f"/application/{id}/image",
+            file=image,
+            method="post",
+            model=ApplicationModel,
+        )
+        self.app_index.update(application)
+        return application
+
+    async def sync_application_images(
+        self,
+        images: Mapping[int | str, str | os.PathLike[str]],
+        manifest: ImageManifest | str | os.PathLike[str] | None = None,
+        concurrency: int = 4,
+    ) -> dict[int | str, Application | Exception | None]:
+        """Upload the images of many applications, skipping unchanged ones.
+
+        `images` maps application ids or names to paths of image files. An
+        image is only uploaded if its SHA-256 hash differs from the one in
+        `manifest` or if the image of the application was replaced on the
+        server since. The manifest is saved afterwards, also if some uploads
+        failed.
+
+        Returns the updated application, `None` for an unchanged image or the
+        raised exception for each item of `images`.
+        """
+        if not isinstance(manifest, ImageManifest):
+            manifest = ImageManifest(manifest)
+        uploaded = {
+            app["id"]: app.get("image") for app in await self.get_applications()
+        }
+        # KeyError and ValueError: unknown or ambiguous application names
+        errors: tuple[type[Exception], ...] = (
+            *_send_errors(),
+            OSError,
+            KeyError,
+            ValueError,
         )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def sync(key: int | str) -> Application | Exception | None:
+            async with semaphore:
+                try:
+                    app_id = await self._resolve_app_id(key)
+                    digest = await asyncio.to_thread(file_digest, images[key])
+                    if manifest.is_current(app_id, digest, uploaded.get(app_id)):
+                        return None
+                    application = await self.upload_application_image(
+                        app_id, images[key]
+                    )
+                except errors as exc:
+                    return exc
+            manifest.set(app_id, digest, application.get("image"))
+            return application
+
+        try:
+            results = await asyncio.gather(*(sync(key) for key in images))
+        finally:
+            manifest.save()
+        return dict(zip(images, results))
+
+    async def get_application_by_name(self, name: str) -> Application:
+        """Return the application with a name.
+
+        The application is looked up in `app_index`, which is refreshed from
+        the server if the name is unknown.
+
+        Raises:
+            KeyError: if there is no application with this name.
+            ValueError: if there are multiple applications with this name.
+        """
+        applications = self.app_index.by_name(name)
+        if not applications:
+            await self._refresh_app_index()
+            applications = self.app_index.by_name(name)
+        if not applications:
+            raise KeyError(f"There is no application named '{name}'.")
+        if len(applications) > 1:
+            raise ValueError(f"There are multiple applications named '{name}'.")
+        return applications[0]
+
+    async def get_application_by_token(self, token: str) -> Application:
+        """Return the application with a token.
+
+        The application is looked up in `app_index`, which is refreshed from
+        the server if the token is unknown.
+
+        Raises:
+            KeyError: if there is no application with this token.
+        """
+        application = self.app_index.by_token(token)
+        if application is None:
+            await self._refresh_app_index()
+            application = self.app_index.by_token(token)
+        if application is None:
+            raise KeyError("There is no application with this token.")
+        return application
 
     # --- Messages -----------------------------------------------------------
 
     async def get_messages(
         self,
-        app_id: int | None = None,
+        app_id: int | str | None = None,
         limit: int | None = None,
         since: int | None = None,
     ) -> PagedMessages:
-        """Return all messages, optionally from a specific application."""
+        """Return all messages, optionally from a specific application.
+
+        The application can be specified by its id or name.
+        """
         if app_id is None:
             return await self._request(
-                "/message", data={"limit": limit, "since": since}
+                "/message",
+                data={"limit": limit, "since": since},
+                model=MessageModel,
             )
         else:
             return await self._request(
-                f"/application/{app_id}/message",
+                f"/application/{await self._resolve_app_id(app_id)}/message",
                 data={"limit": limit, "since": since},
+                model=MessageModel,
             )
 
+    async def iter_messages(
+        self,
+        app_id: int | str | None = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+    ) -> AsyncGenerator[Message, None]:
+        """Iterate over all messages, optionally from a specific application.
+
+        The application can be specified by its id or name.
+
+        Messages are requested page by page (newest first) while iterating,
+        so only a single page is held in memory. With `prefetch`, the next page
+        is requested in a background task while the current one is consumed.
+        """
+        next_page: asyncio.Task[PagedMessages] | None = None
+        try:
+            page = await self.get_messages(app_id, limit=page_size)
+            while True:
+                since = _next_since(page)
+                if since is not None and prefetch:
+                    next_page = asyncio.create_task(
+                        self.get_messages(app_id, limit=page_size, since=since)
+                    )
+                messages = page.get("messages", [])
+                del page
+                for message in messages:
+                    yield message
+                if since is None:
+                    return
+                if next_page is not None:
+                    page = await next_page
+                    next_page = None
+                else:
+                    page = await self.get_messages(app_id, limit=page_size, since=since)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
     async def create_message(
         self,
         message: str,
@@ -157,45 +487,357 @@ class AsyncGotify:
         priority: int | None = None,
         title: str | None = None,
     ) -> Message:
-        """Create a message."""
-        return await self._request(
-            "/message",
-            data={
-                "message": message,
-                "extras": extras,
-                "priority": priority,
-                "title": title,
-            },
-            method="post",
-            auth_mode="app",
-        )
+        """Create a message.
 
-    async def delete_messages(self, app_id: int | None = None) -> None:
-        """Delete all messages, optionally from a specific application."""
+        If a spool is configured, messages that were spooled earlier are sent
+        first. If the server is unreachable or responds with a server error,
+        the message is added to the spool before the exception is raised.
+        """
+        data = {
+            "message": message,
+            "extras": extras,
+            "priority": priority,
+            "title": title,
+        }
+        if self.spool is None:
+            return await self._request(
+                "/message",
+                data=data,
+                method="post",
+                auth_mode="app",
+                model=MessageModel,
+            )
+
+        import httpx
+
+        try:
+            if self.spool:
+                await self.flush_spool()
+            return await self._request(
+                "/message",
+                data=dict(data),
+                method="post",
+                auth_mode="app",
+                model=MessageModel,
+            )
+        except (GotifyError, GotifyCircuitOpenError, httpx.TransportError) as exc:
+            if is_spoolable(exc):
+                await asyncio.to_thread(self.spool.append, data)
+            raise
+
+    async def flush_spool(self) -> int:
+        """Send all spooled messages in their original order.
+
+        Returns the number of sent messages. Messages that are rejected by the
+        server with a client error are discarded.
+        """
+        if self.spool is None:
+            return 0
+        if self._spool_lock is None:
+            # created lazily to bind it to the running event loop
+            self._spool_lock = asyncio.Lock()
+        sent = 0
+        async with self._spool_lock:
+            # SQLite queries block, so they are run in a thread
+            spooled = iter(self.spool)
+            while item := await asyncio.to_thread(next, spooled, None):
+                key, data = item
+                try:
+                    await self._request(
+                        "/message", data=data, method="post", auth_mode="app"
+                    )
+                except GotifyError as exc:
+                    if is_spoolable(exc):
+                        raise
+                else:
+                    sent += 1
+                await asyncio.to_thread(self.spool.remove, key)
+        return sent
+
+    async def create_messages(
+        self,
+        messages: Iterable[MessageItem] | AsyncIterable[MessageItem],
+        concurrency: int = 10,
+    ) -> list[Message | Exception]:
+        """Create many messages concurrently.
+
+        Each item is either the message text or a mapping of keyword arguments
+        for `create_message()`. Both iterables and asynchronous iterables are
+        accepted and consumed lazily, with at most `concurrency` requests in
+        flight at the same time.
+
+        Returns a list with the created message or the raised exception for
+        each item in input order. A failed message doesn't abort the batch.
+        """
+        send_errors = _send_errors()
+        semaphore = asyncio.BoundedSemaphore(concurrency)
+        results: list[Any] = []
+        tasks: set[asyncio.Task] = set()
+
+        async def send(index: int, item: MessageItem) -> None:
+            try:
+                if isinstance(item, str):
+                    results[index] = await self.create_message(item)
+                else:
+                    results[index] = await self.create_message(**item)
+            except send_errors as exc:
+                results[index] = exc
+            finally:
+                semaphore.release()
+
+        async def submit(item: MessageItem) -> None:
+            await semaphore.acquire()
+            results.append(None)
+            task = asyncio.create_task(send(len(results) - 1, item))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            if isinstance(messages, AsyncIterable):
+                async for item in messages:
+                    await submit(item)
+            else:
+                for item in messages:
+                    await submit(item)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results
+
+    async def delete_messages(self, app_id: int | str | None = None) -> None:
+        """Delete all messages, optionally from a specific application.
+
+        The application can be specified by its id or name.
+        """
         if app_id is None:
             return await self._request("/message", method="delete")
         else:
             return await self._request(
-                f"/application/{app_id}/message", method="delete"
+                f"/application/{await self._resolve_app_id(app_id)}/message",
+                method="delete",
             )
 
     async def delete_message(self, msg_id: int) -> None:
         """Delete a message with an id."""
         return await self._request(f"/message/{msg_id}", method="delete")
 
+    async def delete_messages_where(
+        self,
+        predicate: MessagePredicate | None = None,
+        older_than: datetime | timedelta | None = None,
+        priority_below: int | None = None,
+        ids: Collection[int] | None = None,
+        app_id: int | str | None = None,
+        concurrency: int = 10,
+        page_size: int = 100,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> int:
+        """Delete the messages that match all given criteria concurrently.
+
+        See `gotify.filters.message_filter()` for the criteria. Messages are
+        requested page by page with `iter_messages()` and the matching ones
+        are deleted by concurrent tasks while the next pages are checked, so
+        only a few pages are held in memory. If only `ids` are given, the
+        messages are deleted without requesting them first. Messages that
+        were already deleted are skipped.
+
+        `progress` is called regularly with the number of checked and deleted
+        messages. If a message can't be deleted, the exception is raised after
+        the requests in flight have finished.
+
+        Returns the number of deleted messages.
+        """
+        match = message_filter(predicate, older_than, priority_below, ids)
+        only_ids = (
+            None
+            if ids is None
+            or app_id is not None
+            or predicate is not None
+            or older_than is not None
+            or priority_below is not None
+            else list(ids)
+        )
+        checked = deleted = 0
+        failure: Exception | None = None
+        semaphore = asyncio.BoundedSemaphore(concurrency)
+        tasks: set[asyncio.Task] = set()
+
+        async def select() -> AsyncIterator[int]:
+            nonlocal checked
+            if only_ids is not None:
+                for msg_id in only_ids:
+                    checked += 1
+                    yield msg_id
+                return
+            async for message in self.iter_messages(app_id, page_size=page_size):
+                checked += 1
+                if match(message):
+                    yield message["id"]
+
+        async def delete(msg_id: int) -> None:
+            nonlocal deleted, failure
+            try:
+                await self.delete_message(msg_id)
+            except GotifyError as exc:
+                if exc.response.status_code != 404:
+                    failure = failure or exc
+            except Exception as exc:
+                failure = failure or exc
+            else:
+                deleted += 1
+                if progress is not None:
+                    progress(checked, deleted)
+            finally:
+                semaphore.release()
+
+        try:
+            async for msg_id in select():
+                await semaphore.acquire()
+                if failure is not None:
+                    semaphore.release()
+                    break
+                task = asyncio.create_task(delete(msg_id))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if failure is not None:
+            raise failure
+        return deleted
+
+    async def export_messages(
+        self,
+        fp: BinaryIO | str | os.PathLike[str],
+        app_id: int | str | None = None,
+        compress: bool | None = None,
+        page_size: int = 100,
+    ) -> int:
+        """Write all messages, optionally from a specific application, as NDJSON.
+
+        Every message is written as a JSON object on its own line, newest
+        first. Messages are requested page by page while writing, so the
+        memory usage doesn't depend on the number of messages. `fp` is a path
+        or a file opened in binary mode, see `gotify.ndjson.open_ndjson()` for
+        gzip compression.
+
+        Returns the number of exported messages.
+        """
+        count = 0
+        with open_ndjson(fp, "wb", compress) as f:
+            async for message in self.iter_messages(
+                app_id, page_size=page_size, prefetch=True
+            ):
+                if isinstance(message, MessageModel):
+                    message = message.to_dict()
+                f.write(self.json_codec.dumps(message) + b"\n")
+                count += 1
+        return count
+
+    async def import_messages(
+        self,
+        fp: BinaryIO | str | os.PathLike[str],
+        app_tokens: Mapping[int, str] | None = None,
+        fallback_token: str | None = None,
+        concurrency: int = 10,
+        rate_limit: RateLimiter | None = None,
+    ) -> int:
+        """Create the messages of an NDJSON file written by `export_messages()`.
+
+        Each message is created with the token of its application: from
+        `app_tokens` (by application id) if given, otherwise the token of the
+        application with the same id on this server, e.g. to restore a backup.
+        Messages of other applications are created with `fallback_token`, e.g.
+        `app_token` to import them into a single application, or a `KeyError`
+        is raised. The server assigns new ids and dates.
+
+        Messages are created oldest first and sent by concurrent tasks with a
+        bounded number of messages in flight. Messages of the same application
+        are sent one after another to keep their order. Only the ids of the
+        messages are kept in memory, see `gotify.ndjson.read_ndjson_by_id()`.
+        `rate_limit` limits the number of messages per second and application
+        token. Gzip compressed files are detected automatically.
+
+        If a message can't be created, the exception is raised after the
+        requests in flight have finished.
+
+        Returns the number of created messages.
+        """
+        tokens: dict[int, str] = dict(app_tokens or {})
+        created = 0
+        failure: Exception | None = None
+        semaphore = asyncio.BoundedSemaphore(concurrency)
+        tasks: set[asyncio.Task] = set()
+        # the last message of each application
+        previous: dict[int, asyncio.Task] = {}
+
+        async def create(
+            after: asyncio.Task | None, token: str, data: dict[str, Any]
+        ) -> None:
+            nonlocal created, failure
+            try:
+                if after is not None:
+                    await asyncio.wait((after,))
+                if failure is not None:
+                    return
+                if rate_limit is not None:
+                    await rate_limit.aacquire(token)
+                await self._request(
+                    "/message", data=data, method="post", auth_mode="app", token=token
+                )
+            except Exception as exc:
+                failure = failure or exc
+            else:
+                created += 1
+            finally:
+                semaphore.release()
+
+        try:
+            with open_ndjson(fp, "rb") as f:
+                for message in read_ndjson_by_id(f, self.json_codec):
+                    app_id = message["appid"]
+                    if app_id not in tokens:
+                        tokens[app_id] = await self._get_import_token(
+                            app_id, fallback_token
+                        )
+                    data = {key: message.get(key) for key in _IMPORTED_FIELDS}
+                    await semaphore.acquire()
+                    if failure is not None:
+                        semaphore.release()
+                        break
+                    task = asyncio.create_task(
+                        create(previous.get(app_id), tokens[app_id], data)
+                    )
+                    previous[app_id] = task
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if failure is not None:
+            raise failure
+        return created
+
     # --- Clients -------------------------------------------------------------
 
     async def get_clients(self) -> list[Client]:
         """Return all clients."""
-        return await self._request("/client")
+        return await self._request("/client", model=ClientModel)
 
     async def create_client(self, name: str) -> Client:
         """Create a client."""
-        return await self._request("/client", data={"name": name}, method="post")
+        return await self._request(
+            "/client", data={"name": name}, method="post", model=ClientModel
+        )
 
     async def update_client(self, id: int, name: str) -> Client:
         """Update a client."""
-        return await self._request(f"/client/{id}", data={"name": name}, method="put")
+        return await self._request(
+            f"/client/{id}", data={"name": name}, method="put", model=ClientModel
+        )
 
     async def delete_client(self, id: int) -> None:
         """Delete a client."""
@@ -205,7 +847,7 @@ class AsyncGotify:
 
     async def get_current_user(self) -> User:
         """Return the current user."""
-        return await self._request("/current/user")
+        return await self._request("/current/user", model=UserModel)
 
     async def set_password(self, passwd: str) -> None:
         """Update the password of the current user."""
@@ -217,7 +859,7 @@ class AsyncGotify:
 
     async def get_users(self) -> list[User]:
         """Return all users."""
-        return await self._request("/user")
+        return await self._request("/user", model=UserModel)
 
     async def create_user(
         self, name: str, passwd: str, admin: bool | None = None
@@ -227,11 +869,12 @@ class AsyncGotify:
             "/user",
             data={"name": name, "pass": passwd, "admin": admin},
             method="post",
+            model=UserModel,
         )
 
     async def get_user(self, id: int) -> User:
         """Get a user."""
-        return await self._request(f"/user/{id}")
+        return await self._request(f"/user/{id}", model=UserModel)
 
     async def update_user(
         self,
@@ -245,6 +888,7 @@ class AsyncGotify:
             f"/user/{id}",
             data={"name": name, "pass": passwd, "admin": admin},
             method="post",
+            model=UserModel,
         )
 
     async def delete_user(self, id: int) -> None:
@@ -257,6 +901,22 @@ class AsyncGotify:
         """Get health information."""
         return await self._request("/health")
 
+    async def check_endpoints(self) -> dict[str, bool]:
+        """Check the health of every endpoint of `base_url`.
+
+        With multiple endpoints, unhealthy ones are ejected and healthy ones
+        are re-admitted, so this can be called periodically to detect failed
+        replicas before requests are sent to them.
+
+        Returns whether each endpoint is healthy.
+        """
+        http_client = self._get_http_client()
+        urls = [self.base_url] if self.endpoints is None else self.endpoints.urls
+        healthy = await asyncio.gather(
+            *(self._check_endpoint(http_client, url) for url in urls)
+        )
+        return dict(zip(map(str, urls), healthy))
+
     # --- Plugins -------------------------------------------------------------
 
     async def get_plugins(self) -> list[PluginConf]:
@@ -291,19 +951,37 @@ class AsyncGotify:
 
     # --- Push Messages -------------------------------------------------------
 
-    async def stream(self) -> AsyncGenerator[Message, None]:
+    async def stream(
+        self,
+        reconnect: bool = False,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+    ) -> AsyncGenerator[Message, None]:
         """Wait for incoming push messages and yield them.
 
         Make sure you installed this library with `pip install gotify[stream]`
         to use this method.
+
+        Args:
+            reconnect (bool, optional): reconnect with a jittered exponential
+                backoff if the connection is lost. Messages that were missed in
+                the meantime are fetched from the server and every message is
+                yielded exactly once in order.
+
+            backoff_base (float, optional): delay in seconds before the first
+                reconnection attempt.
+
+            backoff_max (float, optional): maximum delay in seconds between
+                reconnection attempts.
         """
-        import json
+        import httpx
 
         try:
             # Consider replacing 'websockets' with native httpx implementation
             # if it will be implemented.
             # See https://github.com/encode/httpx/issues/304
             from websockets.client import connect as ws_connect
+            from websockets.exceptions import WebSocketException
         except ImportError as exc:  # pragma: no cover
             raise ImportError(  # pragma: no cover
                 "AsyncGotify.stream() requires 'websockets' to be installed. "
@@ -313,14 +991,88 @@ class AsyncGotify:
 
         url = httpx.URL(self._get_url("/stream"))
         url = url.copy_with(scheme="wss" if url.scheme == "https" else "ws")
+        headers = {"X-Gotify-Key": self._get_token("client")}
 
-        async with ws_connect(
-            str(url),
-            extra_headers={"X-Gotify-Key": self._get_token("client")},
-        ) as websocket:
-            while True:
-                data = await websocket.recv()
-                yield json.loads(data)
+        stream_url = str(url)
+        error: BaseException | None = None
+
+        async def receive(websocket: WebSocketClientProtocol) -> Message:
+            frame = await websocket.recv()
+            size = len(frame.encode()) if isinstance(frame, str) else len(frame)
+            self._notify("on_stream_frame", stream_url, size)
+            return self._to_model(MessageModel, self.json_codec.loads(frame))
+
+        if not reconnect:
+            async with ws_connect(stream_url, extra_headers=headers) as websocket:
+                self._notify("on_stream_connect", stream_url)
+                try:
+                    while True:
+                        yield await receive(websocket)
+                except Exception as exc:
+                    error = exc
+                    raise
+                finally:
+                    self._notify("on_stream_disconnect", stream_url, error)
+
+        last_id: int | None = None
+        attempt = 0
+        while True:
+            try:
+                if last_id is None:
+                    # remember the newest message before connecting so that
+                    # messages sent while connecting can be fetched afterwards
+                    page = await self.get_messages(limit=1)
+                    last_id = max((msg["id"] for msg in page["messages"]), default=0)
+
+                async with ws_connect(stream_url, extra_headers=headers) as websocket:
+                    self._notify("on_stream_connect", stream_url)
+                    error = None
+                    try:
+                        # messages that arrive over the websocket in the
+                        # meantime are buffered and skipped below if they were
+                        # fetched here
+                        for msg in await self._get_messages_after(last_id):
+                            last_id = msg["id"]
+                            yield msg
+                        attempt = 0
+
+                        while True:
+                            msg = await receive(websocket)
+                            if msg["id"] <= last_id:
+                                continue
+                            last_id = msg["id"]
+                            yield msg
+                    except Exception as exc:
+                        error = exc
+                        raise
+                    finally:
+                        self._notify("on_stream_disconnect", stream_url, error)
+            except (
+                WebSocketException,
+                OSError,
+                asyncio.TimeoutError,
+                httpx.TransportError,
+            ):
+                pass
+            except GotifyError as exc:
+                if not exc.response.is_server_error:
+                    raise
+            await asyncio.sleep(exponential_backoff(attempt, backoff_base, backoff_max))
+            attempt += 1
+
+    async def _get_messages_after(self, msg_id: int) -> list[Message]:
+        # return all messages newer than `msg_id` in chronological order
+        messages: list[Message] = []
+        pages = self.iter_messages()
+        try:
+            async for msg in pages:
+                if msg["id"] <= msg_id:
+                    break
+                messages.append(msg)
+        finally:
+            await pages.aclose()
+        messages.reverse()
+        return messages
 
     # --- Utils ---------------------------------------------------------------
 
@@ -331,47 +1083,359 @@ class AsyncGotify:
         file: BinaryIO | None = None,
         method: str = "get",
         auth_mode: str = "client",
+        model: type[_Model] | None = None,
+        token: str | None = None,
     ) -> Any:  # noqa: ANN401
-        # if AsyncGotify isn't used as a context manager
-        if self.http_client is None:
-            async with self:
-                return await self._request(
-                    url_endpoint=url_endpoint,
-                    data=data,
-                    file=file,
-                    method=method,
-                    auth_mode=auth_mode,
-                )
+        http_client = self._get_http_client()
 
         if data:
             # remove items that are None
             for key in [k for k, v in data.items() if v is None]:
                 del data[key]
 
-        r = await self.http_client.request(
-            method,
-            self._get_url(url_endpoint),
-            headers={"X-Gotify-Key": self._get_token(auth_mode)},
-            params=data if method == "get" else None,
-            json=data if method != "get" else None,
-            files={"file": file} if file is not None else {},
+        token = token or self._get_token(auth_mode)
+
+        if self.cache is None:
+            result = await self._send(
+                http_client, method, url_endpoint, token, auth_mode, data, file
+            )
+        elif method != "get":
+            try:
+                result = await self._send(
+                    http_client, method, url_endpoint, token, auth_mode, data, file
+                )
+            finally:
+                self.cache.invalidate(url_endpoint)
+        else:
+            cache_key = (
+                url_endpoint,
+                token,
+                tuple(sorted(data.items())) if data else (),
+            )
+            found, result = self.cache.get(url_endpoint, cache_key)
+            if not found:
+                result = await self._send(
+                    http_client, method, url_endpoint, token, auth_mode, data, file
+                )
+                self.cache.set(url_endpoint, cache_key, result)
+
+        if model is None:
+            return result
+        return self._to_model(model, result)
+
+    async def _send(
+        self,
+        http_client: httpx.AsyncClient,
+        method: str,
+        url_endpoint: str,
+        token: str,
+        auth_mode: str,
+        data: dict[str, Any] | None,
+        file: BinaryIO | None,
+    ) -> Any:  # noqa: ANN401
+        rate_limit = (
+            self.rate_limit if auth_mode.lower() == "app" else self.client_rate_limit
         )
-        if r.is_success:
+        headers = {"X-Gotify-Key": token}
+        content = None
+        if data is not None and method != "get":
+            headers["Content-Type"] = "application/json"
+            content = self.json_codec.dumps(data)
+        endpoint = endpoint_template(url_endpoint)
+        start = time.monotonic()
+        attempt = 0
+        failovers = 0
+        # endpoints that failed since the last retry
+        tried: set[str] = set()
+        while True:
+            attempt += 1
+            base_url = await self._select_endpoint(http_client, tried)
+            url = self._get_url(url_endpoint, base_url)
+            event = RequestEvent(method.upper(), endpoint, url, attempt)
+            breaker = self.circuit_breaker
+            try:
+                if rate_limit is not None:
+                    await rate_limit.aacquire(token)
+                if (
+                    breaker is not None
+                    and breaker.before_request()
+                    and breaker.probe_health
+                ):
+                    await self._probe_health(http_client)
+            except (GotifyCircuitOpenError, GotifyRateLimitError) as exc:
+                event.exception = exc
+                self._notify("on_error", event)
+                raise
+
+            self._notify("on_request", event)
+            request_start = time.perf_counter()
             try:
-                return r.json()
-            except ValueError:
-                return r.text if r.text else None
+                request = http_client.build_request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=data if method == "get" else None,
+                    content=content,
+                    files={"file": file} if file is not None else {},
+                )
+                event.request_bytes = int(request.headers.get("Content-Length", 0))
+                r = await http_client.send(request, stream=True)
+                try:
+                    event.ttfb = time.perf_counter() - request_start
+                    await r.aread()
+                finally:
+                    await r.aclose()
+            except Exception as exc:
+                event.elapsed = time.perf_counter() - request_start
+                event.exception = exc
+                if breaker is not None:
+                    breaker.record_failure()
+                self._record_endpoint(base_url, failed=True)
+                if self._can_fail_over(failovers, exception=exc):
+                    failovers += 1
+                    if base_url is not None:
+                        tried.add(base_url)
+                    delay: float | None = 0.0
+                else:
+                    tried.clear()
+                    delay = self._get_retry_delay(
+                        method, attempt - failovers, start, exception=exc
+                    )
+                if delay is None:
+                    self._notify("on_error", event)
+                    raise
+            else:
+                event.elapsed = time.perf_counter() - request_start
+                event.status_code = r.status_code
+                event.response_bytes = len(r.content)
+                self._notify("on_response", event)
+                if breaker is not None:
+                    if r.is_server_error:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                self._record_endpoint(base_url, event.elapsed, failed=r.is_server_error)
+                if r.is_success:
+                    try:
+                        return self.json_codec.loads(r.content)
+                    except ValueError:
+                        return r.text if r.text else None
+                if self._can_fail_over(failovers, response=r):
+                    failovers += 1
+                    if base_url is not None:
+                        tried.add(base_url)
+                    delay = 0.0
+                else:
+                    tried.clear()
+                    delay = self._get_retry_delay(
+                        method, attempt - failovers, start, response=r
+                    )
+                if delay is None:
+                    error = GotifyError(r, self.json_codec)
+                    event.exception = error
+                    self._notify("on_error", event)
+                    raise error
+            event.retry_delay = delay
+            self._notify("on_retry", event)
+            await asyncio.sleep(delay)
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        # lazily create a long-lived connection pool that is shared by all
+        # requests until `aclose()` is called
+        loop = asyncio.get_running_loop()
+        if (
+            self.http_client is not None
+            and self._http_client_loop is not None
+            and self._http_client_loop is not loop
+        ):
+            # connections can't be shared between event loops, e.g. when
+            # `asyncio.run()` is called multiple times with the same object
+            old_loop = self._http_client_loop
+            old_http_client = self._detach_http_client()
+            if old_http_client is not None:
+                _close_http_client(old_http_client, old_loop)
+        if self.http_client is None:
+            http_client = self._create_http_client()
+            self._http_client_finalizer = weakref.finalize(
+                self, _close_http_client, http_client, loop
+            )
+            self._http_client_loop = loop
+            self.http_client = http_client
+        return self.http_client
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        import httpx
+
+        kwargs: dict[str, Any] = {}
+        if self.limits is not None:
+            kwargs["limits"] = self.limits
+        if self.transport is not None:
+            kwargs["transport"] = self.transport
+        return httpx.AsyncClient(http2=self.http2, **kwargs)
+
+    def _detach_http_client(self) -> httpx.AsyncClient | None:
+        if self._http_client_finalizer is not None:
+            self._http_client_finalizer.detach()
+            self._http_client_finalizer = None
+        http_client, self.http_client = self.http_client, None
+        self._http_client_loop = None
+        return http_client
+
+    async def _probe_health(self, http_client: httpx.AsyncClient) -> None:
+        # probe a half-open circuit breaker with a health check
+        import httpx
+
+        assert self.circuit_breaker is not None
+        try:
+            r = await http_client.get(self._get_url("/health"))
+            healthy = (
+                r.is_success
+                and self.json_codec.loads(r.content).get("health") == "green"
+            )
+        except (httpx.TransportError, ValueError):
+            healthy = False
+        if not healthy:
+            self.circuit_breaker.record_failure()
+            raise GotifyCircuitOpenError("The gotify server is unhealthy.")
+        self.circuit_breaker.record_success()
+
+    async def _select_endpoint(
+        self, http_client: httpx.AsyncClient, exclude: Collection[str] = ()
+    ) -> str | None:
+        # base URL of the next attempt if `base_url` has multiple endpoints
+        if self.endpoints is None:
+            return None
+        for _ in range(len(self.endpoints)):
+            base_url = self.endpoints.select(exclude)
+            if not (
+                self.endpoints.probe_health and self.endpoints.is_recovering(base_url)
+            ):
+                return base_url
+            if await self._check_endpoint(http_client, base_url):
+                return base_url
+        return self.endpoints.select(exclude)
+
+    async def _check_endpoint(
+        self, http_client: httpx.AsyncClient, base_url: str | None
+    ) -> bool:
+        # probe an endpoint with a health check and eject or re-admit it
+        import httpx
+
+        try:
+            r = await http_client.get(self._get_url("/health", base_url))
+            healthy = (
+                r.is_success
+                and self.json_codec.loads(r.content).get("health") == "green"
+            )
+        except (httpx.TransportError, ValueError):
+            healthy = False
+        if self.endpoints is not None and base_url is not None:
+            if healthy:
+                self.endpoints.record_success(base_url)
+            else:
+                self.endpoints.eject(base_url)
+        return healthy
+
+    def _record_endpoint(
+        self,
+        base_url: str | None,
+        latency: float | None = None,
+        failed: bool = False,
+    ) -> None:
+        if self.endpoints is None or base_url is None:
+            return
+        if failed:
+            self.endpoints.record_failure(base_url)
+        else:
+            self.endpoints.record_success(base_url, latency)
+
+    def _can_fail_over(
+        self,
+        failovers: int,
+        response: httpx.Response | None = None,
+        exception: BaseException | None = None,
+    ) -> bool:
+        # requests that weren't processed are sent to another endpoint at once
+        return (
+            self.endpoints is not None
+            and failovers < len(self.endpoints) - 1
+            and is_failover_error(exception, response)
+        )
+
+    def _get_retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        start: float,
+        response: httpx.Response | None = None,
+        exception: BaseException | None = None,
+    ) -> float | None:
+        if self.retry is None:
+            return None
+        return self.retry.get_delay(
+            method, attempt, time.monotonic() - start, response, exception
+        )
+
+    async def _get_import_token(
+        self, app_id: int, fallback_token: str | None = None
+    ) -> str:
+        # token to import messages of an application without a given token
+        application = self.app_index.by_id(app_id)
+        if application is None:
+            await self._refresh_app_index()
+            application = self.app_index.by_id(app_id)
+        if application is not None and application.get("token"):
+            return application["token"]
+        if fallback_token is not None:
+            return fallback_token
+        raise KeyError(f"There is no application with id {app_id}.")
+
+    async def _refresh_app_index(self) -> None:
+        # bypass the cache, it doesn't contain applications created since
+        if self.cache is not None:
+            self.cache.invalidate("/application")
+        await self.get_applications()
+
+    async def _resolve_app_id(self, app_id: int | str) -> int:
+        if isinstance(app_id, str):
+            return (await self.get_application_by_name(app_id))["id"]
+        return app_id
+
+    def _notify(self, hook: str, *args: object) -> None:
+        if self.observers:
+            notify(self.observers, hook, *args)
+
+    def _to_model(self, model: type[_Model], result: Any) -> Any:  # noqa: ANN401
+        if not self.models:
+            return result
+        if isinstance(result, list):
+            return [model.from_dict(item) for item in result]
+        if model is MessageModel and "messages" in result:
+            # paged messages
+            result["messages"] = [model.from_dict(msg) for msg in result["messages"]]
+            return result
+        return model.from_dict(result)
+
+    def _set_base_url(self, base_url: BaseURL) -> None:
+        if base_url is None or isinstance(base_url, str):
+            self.base_url, self.endpoints = base_url, None
         else:
-            raise GotifyError(r)
+            if not isinstance(base_url, EndpointPool):
+                base_url = EndpointPool(base_url)
+            self.base_url, self.endpoints = base_url.urls[0], base_url
 
-    def _get_url(self, url_endpoint: str) -> str:
-        if not self.base_url:
+    def _get_url(self, url_endpoint: str, base_url: str | None = None) -> str:
+        if base_url is None:
+            base_url = (
+                self.base_url if self.endpoints is None else self.endpoints.select()
+            )
+        if not base_url:
             raise GotifyConfigurationError(
                 "'base_url' is not defined. You need to set it up before "
                 "accessing your Gotify server. It should be something like "
                 "'https://gotify.example.com/'"
             )
-        return self.base_url.strip("/") + "/" + url_endpoint.strip("/")
+        return base_url.strip("/") + "/" + url_endpoint.strip("/")
 
     def _get_token(self, auth_mode: str) -> str:
         if auth_mode.lower() == "client":
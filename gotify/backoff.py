@@ -0,0 +1,33 @@
+"""Delays between repeated attempts to reach a gotify server."""
+
+from __future__ import annotations
+
+import random
+
+__all__ = ["exponential_backoff"]
+
+
+def exponential_backoff(
+    attempt: int,
+    base: float = 0.5,
+    maximum: float = 60.0,
+    jitter: bool = True,
+) -> float:
+    """Return the delay in seconds before the next attempt.
+
+    Args:
+        attempt (int): number of failed attempts so far, starting at 0.
+
+        base (float, optional): delay after the first failed attempt which is
+            doubled after every further failure.
+
+        maximum (float, optional): upper bound for the delay.
+
+        jitter (bool, optional): return a random delay between zero and the
+            computed one ("full jitter") so that many clients don't retry at
+            the same time.
+    """
+    delay = min(maximum, base * 2 ** min(attempt, 64))
+    if jitter:
+        return random.uniform(0, delay)
+    return delay
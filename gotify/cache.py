@@ -0,0 +1,108 @@
+"""Cache responses of rarely changing endpoints."""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Mapping
+
+__all__ = ["ResponseCache"]
+
+DEFAULT_TTLS: Mapping[str, float] = {
+    "/application": 60.0,
+    "/client": 60.0,
+    "/health": 5.0,
+    "/plugin": 60.0,
+    "/user": 60.0,
+    "/version": 3600.0,
+}
+
+
+def _resource(url_endpoint: str) -> str:
+    # e.g. "/application/42/image" -> "application"
+    resource = url_endpoint.strip("/").split("/", 1)[0]
+    return "user" if resource == "current" else resource
+
+
+class ResponseCache:
+    """In-memory LRU cache with per-endpoint expiry for GET requests.
+
+    Cached responses of a resource (e.g. all applications) are invalidated as
+    soon as a request modifying that resource (e.g. `create_application()`) is
+    sent through the same client.
+    """
+
+    def __init__(
+        self,
+        ttl: float | Mapping[str, float] | None = None,
+        maxsize: int = 128,
+    ) -> None:
+        """Initialise the cache.
+
+        Args:
+            ttl (float or mapping, optional): seconds after which a cached
+                response expires. Either a mapping of endpoints (e.g.
+                `"/application"`) to expiry times or a single expiry time for
+                the default endpoints `/application`, `/client`, `/health`,
+                `/plugin`, `/user` and `/version`. Other endpoints aren't cached.
+
+            maxsize (int, optional): maximum number of cached responses, the
+                least recently used ones are evicted first.
+        """
+        if ttl is None:
+            self.ttl: Mapping[str, float] = DEFAULT_TTLS
+        elif isinstance(ttl, Mapping):
+            self.ttl = dict(ttl)
+        else:
+            self.ttl = dict.fromkeys(DEFAULT_TTLS, ttl)
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def get(self, url_endpoint: str, key: Hashable) -> tuple[bool, Any]:
+        """Look up a response.
+
+        Returns a tuple `(found, response)`.
+        """
+        if url_endpoint not in self.ttl:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, _, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, copy.deepcopy(value)
+
+    def set(self, url_endpoint: str, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        """Store a response if the endpoint is cacheable."""
+        ttl = self.ttl.get(url_endpoint)
+        if ttl is None:
+            return
+        entry = (time.monotonic() + ttl, _resource(url_endpoint), copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url_endpoint: str) -> None:
+        """Remove all responses of the resource that `url_endpoint` belongs to."""
+        resource = _resource(url_endpoint)
+        with self._lock:
+            for key in [k for k, v in self._entries.items() if v[1] == resource]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
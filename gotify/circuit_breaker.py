@@ -0,0 +1,123 @@
+"""Fail fast while a gotify server is unavailable."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from .errors import GotifyCircuitOpenError
+
+__all__ = ["CircuitBreaker"]
+
+
+class CircuitBreaker:
+    """Stop sending requests to a server after repeated failures.
+
+    The breaker starts *closed* and lets all requests pass. After
+    `failure_threshold` consecutive failures (connection errors or server
+    errors) it *opens* and rejects requests with `GotifyCircuitOpenError`.
+    After `recovery_timeout` seconds it becomes *half-open* and lets a limited
+    number of probe requests pass: a success closes the breaker again, a failure
+    opens it for another `recovery_timeout` seconds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        probe_health: bool = False,
+    ) -> None:
+        """Initialise the circuit breaker.
+
+        Args:
+            failure_threshold (int, optional): number of consecutive failures
+                after which the breaker opens.
+
+            recovery_timeout (float, optional): seconds after which an open
+                breaker lets probe requests pass.
+
+            half_open_max_calls (int, optional): number of concurrent probe
+                requests while the breaker is half-open.
+
+            probe_health (bool, optional): probe gotify's `/health` endpoint
+                before sending the first request after `recovery_timeout`.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.probe_health = probe_health
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return the current state (`"closed"`, `"open"` or `"half-open"`)."""
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.recovery_timeout
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def before_request(self) -> bool:
+        """Check if a request may be sent.
+
+        Returns `True` if the request is a probe of a half-open breaker.
+
+        Raises:
+            GotifyCircuitOpenError: if the breaker is open.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return False
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    raise GotifyCircuitOpenError(
+                        "The gotify server is unavailable, "
+                        f"requests are rejected for another {remaining:.1f} seconds."
+                    )
+                self._state = self.HALF_OPEN
+                self._probes = 0
+            now = time.monotonic()
+            if (
+                self._probes >= self.half_open_max_calls
+                and now - self._probe_started_at >= self.recovery_timeout
+            ):
+                # the result of the probes was never recorded, e.g. because
+                # they were cancelled
+                self._probes = 0
+            if self._probes >= self.half_open_max_calls:
+                raise GotifyCircuitOpenError(
+                    "The gotify server is unavailable, "
+                    "waiting for the result of a probe request."
+                )
+            self._probes += 1
+            self._probe_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful request and close the breaker."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed request and open the breaker if necessary."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
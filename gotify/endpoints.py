@@ -0,0 +1,192 @@
+"""Fail over and balance requests between replicas of a gotify server."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Collection, Sequence, Union
+
+if TYPE_CHECKING:
+    import httpx
+
+__all__ = ["EndpointPool"]
+
+
+class _Endpoint:
+    __slots__ = ("failures", "ejected", "ejected_until", "latency")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.ejected = False
+        self.ejected_until = 0.0
+        self.latency: float | None = None
+
+
+class EndpointPool:
+    """Choose one of several base URLs of replicated gotify servers.
+
+    Endpoints are selected by a strategy:
+
+    - `"priority"`: the first available endpoint, i.e. the others are only
+      used if it fails.
+    - `"round-robin"`: all available endpoints in turns.
+    - `"least-latency"`: the available endpoint with the lowest average
+      response time. Endpoints without a response yet are tried first.
+
+    After `failure_threshold` consecutive failures (connection errors or
+    server errors), an endpoint is *ejected* and only used again after
+    `recovery_timeout` seconds. The next request re-admits it if it succeeds,
+    or ejects it again if it fails. With `probe_health`, gotify's `/health`
+    endpoint is checked before that request. If all endpoints are ejected, the
+    one that can be re-admitted first is used.
+    """
+
+    PRIORITY = "priority"
+    ROUND_ROBIN = "round-robin"
+    LEAST_LATENCY = "least-latency"
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        strategy: str = PRIORITY,
+        failure_threshold: int = 1,
+        recovery_timeout: float = 10.0,
+        probe_health: bool = False,
+        smoothing: float = 0.2,
+    ) -> None:
+        """Initialise the pool.
+
+        Args:
+            urls (sequence of str): base URLs of the replicas, eg.
+                `["https://gotify1.example.com", "https://gotify2.example.com"]`.
+
+            strategy (str, optional): `"priority"`, `"round-robin"` or
+                `"least-latency"`.
+
+            failure_threshold (int, optional): number of consecutive failures
+                after which an endpoint is ejected.
+
+            recovery_timeout (float, optional): seconds after which an ejected
+                endpoint is used again.
+
+            probe_health (bool, optional): probe gotify's `/health` endpoint
+                before re-admitting an ejected endpoint.
+
+            smoothing (float, optional): weight of the latest response time in
+                the moving average used by `"least-latency"`.
+        """
+        if not urls:
+            raise ValueError("At least one URL is required.")
+        if strategy not in (self.PRIORITY, self.ROUND_ROBIN, self.LEAST_LATENCY):
+            raise ValueError(f"Unknown strategy '{strategy}'.")
+        self.urls = list(urls)
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.probe_health = probe_health
+        self.smoothing = smoothing
+        self._endpoints = {url: _Endpoint() for url in self.urls}
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of endpoints."""
+        return len(self.urls)
+
+    def select(self, exclude: Collection[str] = ()) -> str:
+        """Return the base URL to send the next request to.
+
+        Args:
+            exclude (collection of str, optional): endpoints that shouldn't be
+                used, e.g. because they already failed for this request. They
+                are only returned if all endpoints are excluded.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [url for url in self.urls if url not in exclude] or self.urls
+            available = [
+                url for url in candidates if self._endpoints[url].ejected_until <= now
+            ]
+            if not available:
+                return min(
+                    candidates, key=lambda url: self._endpoints[url].ejected_until
+                )
+            if self.strategy == self.ROUND_ROBIN:
+                # skip unavailable endpoints without changing the order of the others
+                while True:
+                    url = self.urls[self._turn % len(self.urls)]
+                    self._turn += 1
+                    if url in available:
+                        return url
+            if self.strategy == self.LEAST_LATENCY:
+                return min(
+                    available, key=lambda url: self._endpoints[url].latency or 0.0
+                )
+            return available[0]
+
+    def healthy(self) -> list[str]:
+        """Return the endpoints that aren't ejected."""
+        with self._lock:
+            return [url for url in self.urls if not self._endpoints[url].ejected]
+
+    def is_recovering(self, url: str) -> bool:
+        """Check if an ejected endpoint may be re-admitted."""
+        with self._lock:
+            endpoint = self._endpoints[url]
+            return endpoint.ejected and endpoint.ejected_until <= time.monotonic()
+
+    def latency(self, url: str) -> float | None:
+        """Return the average response time of an endpoint in seconds."""
+        with self._lock:
+            return self._endpoints[url].latency
+
+    def record_success(self, url: str, latency: float | None = None) -> None:
+        """Record a successful request and re-admit the endpoint."""
+        with self._lock:
+            endpoint = self._endpoints[url]
+            endpoint.failures = 0
+            endpoint.ejected = False
+            endpoint.ejected_until = 0.0
+            if latency is not None:
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency is None
+                    else self.smoothing * latency
+                    + (1 - self.smoothing) * endpoint.latency
+                )
+
+    def record_failure(self, url: str) -> None:
+        """Record a failed request and eject the endpoint if necessary."""
+        with self._lock:
+            endpoint = self._endpoints[url]
+            endpoint.failures += 1
+            if endpoint.ejected or endpoint.failures >= self.failure_threshold:
+                self._eject(endpoint)
+
+    def eject(self, url: str) -> None:
+        """Eject an endpoint for `recovery_timeout` seconds."""
+        with self._lock:
+            self._eject(self._endpoints[url])
+
+    def _eject(self, endpoint: _Endpoint) -> None:
+        endpoint.ejected = True
+        endpoint.ejected_until = time.monotonic() + self.recovery_timeout
+
+
+BaseURL = Union[str, Sequence[str], EndpointPool, None]
+
+
+def is_failover_error(
+    exception: BaseException | None = None,
+    response: httpx.Response | None = None,
+) -> bool:
+    """Check if a request can safely be sent to another endpoint at once.
+
+    This is the case if the connection couldn't be established or the server
+    is unavailable, so the request wasn't processed.
+    """
+    import httpx
+
+    if response is not None:
+        return response.status_code == 503
+    return isinstance(exception, (httpx.ConnectError, httpx.ConnectTimeout))
@@ -1,23 +1,50 @@
 """Error classes for gotify."""
-import httpx
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from .json_codec import JSONCodec, default_codec
 from .response_types import Error
 
-__all__ = ["GotifyError", "GotifyConfigurationError"]
+if TYPE_CHECKING:
+    import httpx
+
+    from .multi import FanOutResult
+
+__all__ = [
+    "GotifyError",
+    "GotifyCircuitOpenError",
+    "GotifyConfigurationError",
+    "GotifyQuorumError",
+    "GotifyRateLimitError",
+]
 
 
 class GotifyError(Exception):
     """Raised if gotify serves an error response."""
 
-    def __init__(self, response: httpx.Response) -> None:
+    def __init__(
+        self, response: httpx.Response, json_codec: JSONCodec | None = None
+    ) -> None:
         """Raise if gotify serves an error response.
 
         Args:
             response (requests.Response): The response object returned by the
                 requests library.
+
+            json_codec (JSONCodec, optional): codec to decode the error
+                response.
         """
         self.response = response
-        self.error: Error = self.response.json()
+        try:
+            self.error: Error = (json_codec or default_codec()).loads(response.content)
+        except ValueError:
+            # e.g. an HTML error page of a reverse proxy
+            self.error = {
+                "error": response.reason_phrase,
+                "errorCode": response.status_code,
+                "errorDescription": response.text,
+            }
 
     def __str__(self) -> str:
         """Parse json error into string."""
@@ -37,3 +64,31 @@ class GotifyConfigurationError(Exception):
     """Raised if the server URL or a required token is missing."""
 
     pass
+
+
+class GotifyRateLimitError(Exception):
+    """Raised if a request exceeds the client-side rate limit."""
+
+    pass
+
+
+class GotifyCircuitOpenError(Exception):
+    """Raised if requests are rejected because the server is unavailable."""
+
+    pass
+
+
+class GotifyQuorumError(Exception):
+    """Raised if not enough servers accepted a message sent to several servers."""
+
+    def __init__(self, result: FanOutResult) -> None:
+        """Raise if not enough servers accepted a message.
+
+        Args:
+            result (FanOutResult): the result of each server.
+        """
+        self.result = result
+        super().__init__(
+            f"Message was accepted by {len(result.succeeded)} of "
+            f"{len(result.results)} servers, {result.required} required."
+        )
@@ -0,0 +1,62 @@
+"""Select messages by their attributes, e.g. for bulk deletion."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Collection
+
+from .models import parse_date
+from .response_types import Message
+
+__all__ = ["message_filter"]
+
+MessagePredicate = Callable[[Message], bool]
+
+
+def message_filter(
+    predicate: MessagePredicate | None = None,
+    older_than: datetime | timedelta | None = None,
+    priority_below: int | None = None,
+    ids: Collection[int] | None = None,
+) -> MessagePredicate:
+    """Combine criteria into a function that checks if a message matches.
+
+    A message matches if it meets all given criteria.
+
+    Args:
+        predicate (callable, optional): returns whether a message matches.
+
+        older_than (datetime or timedelta, optional): messages created before
+            this time or longer ago than this duration. A naive datetime is
+            interpreted as local time.
+
+        priority_below (int, optional): messages with a lower priority.
+            Messages without a priority have priority 0.
+
+        ids (collection of int, optional): messages with one of these ids.
+
+    Raises:
+        ValueError: if no criterion is given.
+    """
+    if predicate is None and older_than is None and priority_below is None:
+        if ids is None:
+            raise ValueError("At least one criterion is required.")
+    if isinstance(older_than, timedelta):
+        older_than = datetime.now(timezone.utc) - older_than
+    elif older_than is not None and older_than.tzinfo is None:
+        older_than = older_than.astimezone()
+    id_set = None if ids is None else frozenset(ids)
+
+    def match(message: Message) -> bool:
+        if id_set is not None and message["id"] not in id_set:
+            return False
+        if (
+            priority_below is not None
+            and (message.get("priority") or 0) >= priority_below
+        ):
+            return False
+        if older_than is not None and parse_date(message["date"]) >= older_than:
+            return False
+        return predicate is None or predicate(message)
+
+    return match
@@ -2,12 +2,47 @@
 
 from __future__ import annotations
 
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
 from types import TracebackType
-from typing import Any, BinaryIO, TypeVar
-
-import httpx
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Collection,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    TypeVar,
+    Union,
+)
 
-from .errors import GotifyConfigurationError, GotifyError
+from .app_index import ApplicationIndex
+from .backoff import exponential_backoff
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker
+from .endpoints import BaseURL, EndpointPool, is_failover_error
+from .errors import (
+    GotifyCircuitOpenError,
+    GotifyConfigurationError,
+    GotifyError,
+    GotifyRateLimitError,
+)
+from .filters import MessagePredicate, message_filter
+from .images import ImageManifest, file_digest
+from .json_codec import JSONCodec, default_codec
+from .metrics import Metrics
+from .models import ApplicationModel, ClientModel, MessageModel, UserModel, _Model
+from .ndjson import open_ndjson, read_ndjson_by_id
+from .observer import Observer, RequestEvent, endpoint_template, notify
+from .rate_limit import RateLimiter
 from .response_types import (
     Application,
     Client,
@@ -18,11 +53,83 @@ from .response_types import (
     User,
     VersionInfo,
 )
+from .retry import RetryPolicy
+from .spool import Spool, is_spoolable
+
+if TYPE_CHECKING:
+    import httpx
+    from websockets.sync.client import ClientConnection
 
 __all__ = ["Gotify"]
 
 GotifyType = TypeVar("GotifyType", bound="Gotify")
 
+MessageItem = Union[str, Mapping[str, Any]]
+
+
+def _send_errors() -> tuple[type[Exception], ...]:
+    # errors that only affect a single message of a batch
+    import httpx
+
+    return (
+        GotifyError,
+        GotifyCircuitOpenError,
+        GotifyRateLimitError,
+        httpx.HTTPError,
+    )
+
+
+# fields of exported messages that are sent when they are imported
+_IMPORTED_FIELDS = ("message", "title", "priority", "extras")
+
+
+def _next_since(page: PagedMessages) -> int | None:
+    # gotify only includes a link to the next page if there are more messages
+    paging = page.get("paging", {})
+    if not page.get("messages") or not paging.get("next"):
+        return None
+    return paging.get("since")
+
+
+class _WebSocketReader:
+    # receives frames of a websocket in a background thread and buffers them
+    # in a bounded queue until they are consumed with `recv()`
+
+    def __init__(self, websocket: ClientConnection, max_queue: int) -> None:
+        self.websocket = websocket
+        self.queue: queue.Queue[str | bytes | BaseException] = queue.Queue(max_queue)
+        self.closed = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, name="gotify-stream", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                self._put(self.websocket.recv())
+        except BaseException as exc:
+            self._put(exc)
+
+    def _put(self, item: str | bytes | BaseException) -> None:
+        while not self.closed.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def recv(self) -> str | bytes:
+        item = self.queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self) -> None:
+        self.closed.set()
+        self.websocket.close()
+        self.thread.join()
+
 
 # --- Main Class ----------------------------------------------------
 
@@ -32,44 +139,123 @@ class Gotify:
 
     def __init__(
         self,
-        base_url: str | None = None,
+        base_url: BaseURL = None,
         app_token: str | None = None,
         client_token: str | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        transport: httpx.BaseTransport | None = None,
+        spool: Spool | None = None,
+        rate_limit: RateLimiter | None = None,
+        client_rate_limit: RateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+        models: bool = False,
+        json_codec: JSONCodec | None = None,
+        observers: Iterable[Observer] | None = None,
+        metrics: Metrics | None = None,
     ) -> None:
         """Initialise the Gotify object.
 
         Args:
-            base_url (str, optional): Base URL of your Gotify instance,
-                eg. https://gotify.example.com.
+            base_url (str, list of str or EndpointPool, optional): Base URL of
+                your Gotify instance, eg. https://gotify.example.com. Requests
+                to multiple replicas fail over and are balanced by an
+                `EndpointPool`.
 
             app_token (str, optional): token to authenticate to receive
                 messages and manage stuff.
 
             client_token (str, optional): token to authenticate to send
                 messages.
+
+            limits (httpx.Limits, optional): connection pool limits and
+                keep-alive expiry of the underlying HTTP client.
+
+            http2 (bool, optional): enable HTTP/2 to multiplex concurrent
+                requests over a single connection. Requires `h2`, which can be
+                installed with `pip install gotify[http2]`.
+
+            transport (httpx.BaseTransport, optional): transport of the
+                underlying HTTP client, e.g. to configure retries of failed
+                connections, a proxy or a Unix domain socket. `limits` and
+                `http2` need to be configured on the transport in this case.
+
+            spool (Spool, optional): persist messages that can't be delivered
+                and send them again before the next message.
+
+            rate_limit (RateLimiter, optional): limit the rate of requests that
+                are authenticated with an application token.
+
+            client_rate_limit (RateLimiter, optional): limit the rate of
+                requests that are authenticated with a client token.
+
+            retry (RetryPolicy, optional): send requests again that failed
+                because of transient errors.
+
+            circuit_breaker (CircuitBreaker, optional): reject requests without
+                contacting the server after repeated failures.
+
+            cache (ResponseCache, optional): cache responses of rarely changing
+                endpoints like `get_applications()`.
+
+            models (bool, optional): return compact objects from
+                `gotify.models` instead of dicts for messages, applications,
+                clients and users.
+
+            json_codec (JSONCodec, optional): encode and decode JSON of
+                requests, responses and push messages. By default, orjson or
+                msgspec are used if installed.
+
+            observers (iterable of Observer, optional): get notified about
+                requests and push message streams.
+
+            metrics (Metrics, optional): collect request latencies, counters
+                and queue depths.
         """
-        self.base_url: str | None = base_url
+        self.base_url: str | None = None
+        self.endpoints: EndpointPool | None = None
+        self._set_base_url(base_url)
         self.app_token: str | None = app_token
         self.client_token: str | None = client_token
+        self.limits: httpx.Limits | None = limits
+        self.http2: bool = http2
+        self.transport: httpx.BaseTransport | None = transport
+        self.spool: Spool | None = spool
+        self.rate_limit: RateLimiter | None = rate_limit
+        self.client_rate_limit: RateLimiter | None = client_rate_limit
+        self.retry: RetryPolicy | None = retry
+        self.circuit_breaker: CircuitBreaker | None = circuit_breaker
+        self.cache: ResponseCache | None = cache
+        self.models: bool = models
+        self.json_codec: JSONCodec = json_codec or default_codec()
+        self.observers: list[Observer] = list(observers or ())
+        self.metrics: Metrics | None = metrics
+        if metrics is not None:
+            self.observers.append(metrics)
+        self.app_index = ApplicationIndex()
         self.http_client: httpx.Client | None = None
+        self._http_client_lock = threading.Lock()
+        self._http_client_finalizer: weakref.finalize | None = None
+        self._spool_lock = threading.Lock()
 
     def config(
         self,
-        base_url: str | None = None,
+        base_url: BaseURL = None,
         app_token: str | None = None,
         client_token: str | None = None,
     ) -> None:
         """Set up the gotify object."""
         if base_url:
-            self.base_url = base_url
+            self._set_base_url(base_url)
         if app_token:
             self.app_token = app_token
         if client_token:
             self.client_token = client_token
 
     def __enter__(self: GotifyType) -> GotifyType:  # -> Self:
-        if self.http_client is None:
-            self.http_client = httpx.Client().__enter__()
+        self._get_http_client()
         return self
 
     def __exit__(
@@ -78,15 +264,28 @@ class Gotify:
         exc_value: BaseException,
         traceback: TracebackType,
     ) -> None:
-        if self.http_client is not None:
-            self.http_client.__exit__(exc_type, exc_value, traceback)
-            self.http_client = None
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool.
+
+        A new pool is created automatically when the next request is sent.
+        """
+        with self._http_client_lock:
+            if self._http_client_finalizer is not None:
+                self._http_client_finalizer.detach()
+                self._http_client_finalizer = None
+            if self.http_client is not None:
+                self.http_client.close()
+                self.http_client = None
 
     # --- Applications -------------------------------------------------------
 
     def get_applications(self) -> list[Application]:
         """Return all applications."""
-        return self._request("/application")
+        applications = self._request("/application", model=ApplicationModel)
+        self.app_index.replace(applications)
+        return applications
 
     def create_application(
         self,
@@ -95,7 +294,7 @@ class Gotify:
         default_priority: int | None = None,
     ) -> Application:
         """Create an application."""
-        return self._request(
+        application = self._request(
             "/application",
             data={
                 "name": name,
@@ -103,7 +302,10 @@ class Gotify:
                 "defaultPriority": default_priority,
             },
             method="post",
+            model=ApplicationModel,
         )
+        self.app_index.update(application)
+        return application
 
     def update_application(
         self,
@@ -113,7 +315,7 @@ class Gotify:
         default_priority: int | None = None,
     ) -> Application:
         """Update an application."""
-        return self._request(
+        application = self._request(
             f"/application/{id}",
             data={
                 "name": name,
@@ -121,33 +323,181 @@ class Gotify:
                 "defaultPriority": default_priority,
             },
             method="put",
+            model=ApplicationModel,
         )
+        self.app_index.update(application)
+        return application
 
     def delete_application(self, id: int) -> None:
         """Delete an application."""
-        return self._request(f"/application/{id}", method="delete")
+        self._request(f"/application/{id}", method="delete")
+        self.app_index.remove(id)
+
+    def upload_application_image(
+        self, id: int, image: BinaryIO | str | os.PathLike[str]
+    ) -> Application:
+        """Upload an image for an application.
+
+        `image` is a file opened in binary mode or the path of an image file.
+        The file is streamed in chunks instead of being read into memory.
+        """
+        if isinstance(image, (str, os.PathLike)):
+            with open(image, "rb") as f:
+                return self.upload_application_image(id, f)
+        application = self._request(
+            f"/application/{id}/image",
+            file=image,
+            method="post",
+            model=ApplicationModel,
+        )
+        self.app_index.update(application)
+        return application
+
+    def sync_application_images(
+        self,
+        images: Mapping[int | str, str | os.PathLike[str]],
+        manifest: ImageManifest | str | os.PathLike[str] | None = None,
+        max_workers: int = 4,
+    ) -> dict[int | str, Application | Exception | None]:
+        """Upload the images of many applications, skipping unchanged ones.
+
+        `images` maps application ids or names to paths of image files. An
+        image is only uploaded if its SHA-256 hash differs from the one in
+        `manifest` or if the image of the application was replaced on the
+        server since. The manifest is saved afterwards, also if some uploads
+        failed.
+
+        Returns the updated application, `None` for an unchanged image or the
+        raised exception for each item of `images`.
+        """
+        if not isinstance(manifest, ImageManifest):
+            manifest = ImageManifest(manifest)
+        uploaded = {app["id"]: app.get("image") for app in self.get_applications()}
+        # KeyError and ValueError: unknown or ambiguous application names
+        errors: tuple[type[Exception], ...] = (
+            *_send_errors(),
+            OSError,
+            KeyError,
+            ValueError,
+        )
 
-    def upload_application_image(self, id: int, image: BinaryIO) -> Application:
-        """Upload an image for an application."""
-        return self._request(f"/application/{id}/image", file=image, method="post")
+        def sync(key: int | str) -> Application | Exception | None:
+            try:
+                app_id = self._resolve_app_id(key)
+                digest = file_digest(images[key])
+                if manifest.is_current(app_id, digest, uploaded.get(app_id)):
+                    return None
+                application = self.upload_application_image(app_id, images[key])
+            except errors as exc:
+                return exc
+            manifest.set(app_id, digest, application.get("image"))
+            return application
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="gotify"
+            ) as executor:
+                return dict(zip(images, executor.map(sync, images)))
+        finally:
+            manifest.save()
+
+    def get_application_by_name(self, name: str) -> Application:
+        """Return the application with a name.
+
+        The application is looked up in `app_index`, which is refreshed from
+        the server if the name is unknown.
+
+        Raises:
+            KeyError: if there is no application with this name.
+            ValueError: if there are multiple applications with this name.
+        """
+        applications = self.app_index.by_name(name)
+        if not applications:
+            self._refresh_app_index()
+            applications = self.app_index.by_name(name)
+        if not applications:
+            raise KeyError(f"There is no application named '{name}'.")
+        if len(applications) > 1:
+            raise ValueError(f"There are multiple applications named '{name}'.")
+        return applications[0]
+
+    def get_application_by_token(self, token: str) -> Application:
+        """Return the application with a token.
+
+        The application is looked up in `app_index`, which is refreshed from
+        the server if the token is unknown.
+
+        Raises:
+            KeyError: if there is no application with this token.
+        """
+        application = self.app_index.by_token(token)
+        if application is None:
+            self._refresh_app_index()
+            application = self.app_index.by_token(token)
+        if application is None:
+            raise KeyError("There is no application with this token.")
+        return application
 
     # --- Messages -----------------------------------------------------------
 
     def get_messages(
         self,
-        app_id: int | None = None,
+        app_id: int | str | None = None,
         limit: int | None = None,
         since: int | None = None,
     ) -> PagedMessages:
-        """Return all messages, optionally from a specific application."""
+        """Return all messages, optionally from a specific application.
+
+        The application can be specified by its id or name.
+        """
         if app_id is None:
-            return self._request("/message", data={"limit": limit, "since": since})
+            return self._request(
+                "/message", data={"limit": limit, "since": since}, model=MessageModel
+            )
         else:
             return self._request(
-                f"/application/{app_id}/message",
+                f"/application/{self._resolve_app_id(app_id)}/message",
                 data={"limit": limit, "since": since},
+                model=MessageModel,
             )
 
+    def iter_messages(
+        self,
+        app_id: int | str | None = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+    ) -> Generator[Message, None, None]:
+        """Iterate over all messages, optionally from a specific application.
+
+        The application can be specified by its id or name.
+
+        Messages are requested page by page (newest first) while iterating,
+        so only a single page is held in memory. With `prefetch`, the next page
+        is requested in a background thread while the current one is consumed.
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = self.get_messages(app_id, limit=page_size)
+            while True:
+                since = _next_since(page)
+                next_page: Future[PagedMessages] | None = None
+                if since is not None and executor is not None:
+                    next_page = executor.submit(
+                        self.get_messages, app_id, page_size, since
+                    )
+                messages = page.get("messages", [])
+                del page
+                yield from messages
+                if since is None:
+                    return
+                if next_page is not None:
+                    page = next_page.result()
+                else:
+                    page = self.get_messages(app_id, limit=page_size, since=since)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
     def create_message(
         self,
         message: str,
@@ -155,43 +505,336 @@ class Gotify:
         priority: int | None = None,
         title: str | None = None,
     ) -> Message:
-        """Create a message."""
-        return self._request(
-            "/message",
-            data={
-                "message": message,
-                "extras": extras,
-                "priority": priority,
-                "title": title,
-            },
-            method="post",
-            auth_mode="app",
+        """Create a message.
+
+        If a spool is configured, messages that were spooled earlier are sent
+        first. If the server is unreachable or responds with a server error,
+        the message is added to the spool before the exception is raised.
+        """
+        data = {
+            "message": message,
+            "extras": extras,
+            "priority": priority,
+            "title": title,
+        }
+        if self.spool is None:
+            return self._request(
+                "/message",
+                data=data,
+                method="post",
+                auth_mode="app",
+                model=MessageModel,
+            )
+
+        import httpx
+
+        try:
+            if self.spool:
+                self.flush_spool()
+            return self._request(
+                "/message",
+                data=dict(data),
+                method="post",
+                auth_mode="app",
+                model=MessageModel,
+            )
+        except (GotifyError, GotifyCircuitOpenError, httpx.TransportError) as exc:
+            if is_spoolable(exc):
+                self.spool.append(data)
+            raise
+
+    def flush_spool(self) -> int:
+        """Send all spooled messages in their original order.
+
+        Returns the number of sent messages. Messages that are rejected by the
+        server with a client error are discarded.
+        """
+        if self.spool is None:
+            return 0
+        sent = 0
+        with self._spool_lock:
+            for key, data in self.spool:
+                try:
+                    self._request("/message", data=data, method="post", auth_mode="app")
+                except GotifyError as exc:
+                    if is_spoolable(exc):
+                        raise
+                else:
+                    sent += 1
+                self.spool.remove(key)
+        return sent
+
+    def create_messages(
+        self,
+        messages: Iterable[MessageItem],
+        max_workers: int = 10,
+        timeout: float | None = None,
+    ) -> list[Message | Exception]:
+        """Create many messages concurrently using a thread pool.
+
+        Each item is either the message text or a mapping of keyword arguments
+        for `create_message()`. All threads share the same connection pool.
+
+        Returns a list with the created message or the raised exception for
+        each item in input order. A failed message doesn't abort the batch.
+        Messages that haven't been sent after `timeout` seconds are reported
+        as `TimeoutError`, requests that are already in flight at this point
+        are not interrupted though.
+        """
+
+        def send(item: MessageItem) -> Message:
+            if isinstance(item, str):
+                return self.create_message(item)
+            return self.create_message(**item)
+
+        self._get_http_client()
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gotify"
         )
+        try:
+            futures: list[Future[Message]] = [
+                executor.submit(send, item) for item in messages
+            ]
+            wait(futures, timeout=timeout)
+        finally:
+            executor.shutdown(wait=timeout is None, cancel_futures=True)
+
+        results: list[Message | Exception] = []
+        for future in futures:
+            if not future.done() or future.cancelled():
+                results.append(
+                    TimeoutError(f"Message was not sent within {timeout} seconds.")
+                )
+                continue
+            exc = future.exception()
+            if exc is None:
+                results.append(future.result())
+            elif isinstance(exc, _send_errors()):
+                results.append(exc)
+            else:
+                raise exc
+        return results
 
-    def delete_messages(self, app_id: int | None = None) -> None:
-        """Delete all messages, optionally from a specific application."""
+    def delete_messages(self, app_id: int | str | None = None) -> None:
+        """Delete all messages, optionally from a specific application.
+
+        The application can be specified by its id or name.
+        """
         if app_id is None:
             return self._request("/message", method="delete")
         else:
-            return self._request(f"/application/{app_id}/message", method="delete")
+            return self._request(
+                f"/application/{self._resolve_app_id(app_id)}/message",
+                method="delete",
+            )
 
     def delete_message(self, msg_id: int) -> None:
         """Delete a message with an id."""
         return self._request(f"/message/{msg_id}", method="delete")
 
+    def delete_messages_where(
+        self,
+        predicate: MessagePredicate | None = None,
+        older_than: datetime | timedelta | None = None,
+        priority_below: int | None = None,
+        ids: Collection[int] | None = None,
+        app_id: int | str | None = None,
+        max_workers: int = 10,
+        page_size: int = 100,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> int:
+        """Delete the messages that match all given criteria concurrently.
+
+        See `gotify.filters.message_filter()` for the criteria. Messages are
+        requested page by page with `iter_messages()` and the matching ones
+        are deleted by a thread pool while the next pages are checked, so
+        only a few pages are held in memory. If only `ids` are given, the
+        messages are deleted without requesting them first. Messages that
+        were already deleted are skipped.
+
+        `progress` is called regularly with the number of checked and deleted
+        messages. If a message can't be deleted, the exception is raised after
+        the requests in flight have finished.
+
+        Returns the number of deleted messages.
+        """
+        match = message_filter(predicate, older_than, priority_below, ids)
+        only_ids = (
+            None
+            if ids is None
+            or app_id is not None
+            or predicate is not None
+            or older_than is not None
+            or priority_below is not None
+            else list(ids)
+        )
+        checked = deleted = 0
+
+        def select() -> Iterator[int]:
+            nonlocal checked
+            if only_ids is not None:
+                for msg_id in only_ids:
+                    checked += 1
+                    yield msg_id
+                return
+            for message in self.iter_messages(app_id, page_size=page_size):
+                checked += 1
+                if match(message):
+                    yield message["id"]
+
+        def delete(msg_id: int) -> bool:
+            try:
+                self.delete_message(msg_id)
+            except GotifyError as exc:
+                if exc.response.status_code == 404:
+                    return False
+                raise
+            return True
+
+        def collect(done: set[Future[bool]]) -> None:
+            nonlocal deleted
+            for future in done:
+                if future.result():
+                    deleted += 1
+            if progress is not None:
+                progress(checked, deleted)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gotify"
+        )
+        pending: set[Future[bool]] = set()
+        try:
+            for msg_id in select():
+                if len(pending) >= 2 * max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(delete, msg_id))
+            collect(wait(pending).done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return deleted
+
+    def export_messages(
+        self,
+        fp: BinaryIO | str | os.PathLike[str],
+        app_id: int | str | None = None,
+        compress: bool | None = None,
+        page_size: int = 100,
+    ) -> int:
+        """Write all messages, optionally from a specific application, as NDJSON.
+
+        Every message is written as a JSON object on its own line, newest
+        first. Messages are requested page by page while writing, so the
+        memory usage doesn't depend on the number of messages. `fp` is a path
+        or a file opened in binary mode, see `gotify.ndjson.open_ndjson()` for
+        gzip compression.
+
+        Returns the number of exported messages.
+        """
+        count = 0
+        with open_ndjson(fp, "wb", compress) as f:
+            for message in self.iter_messages(
+                app_id, page_size=page_size, prefetch=True
+            ):
+                if isinstance(message, MessageModel):
+                    message = message.to_dict()
+                f.write(self.json_codec.dumps(message) + b"\n")
+                count += 1
+        return count
+
+    def import_messages(
+        self,
+        fp: BinaryIO | str | os.PathLike[str],
+        app_tokens: Mapping[int, str] | None = None,
+        fallback_token: str | None = None,
+        max_workers: int = 10,
+        rate_limit: RateLimiter | None = None,
+    ) -> int:
+        """Create the messages of an NDJSON file written by `export_messages()`.
+
+        Each message is created with the token of its application: from
+        `app_tokens` (by application id) if given, otherwise the token of the
+        application with the same id on this server, e.g. to restore a backup.
+        Messages of other applications are created with `fallback_token`, e.g.
+        `app_token` to import them into a single application, or a `KeyError`
+        is raised. The server assigns new ids and dates.
+
+        Messages are created oldest first and sent by a thread pool with a
+        bounded number of messages in flight. Messages of the same application
+        are sent one after another to keep their order. Only the ids of the
+        messages are kept in memory, see `gotify.ndjson.read_ndjson_by_id()`.
+        `rate_limit` limits the number of messages per second and application
+        token. Gzip compressed files are detected automatically.
+
+        If a message can't be created, the exception is raised after the
+        requests in flight have finished.
+
+        Returns the number of created messages.
+        """
+        tokens: dict[int, str] = dict(app_tokens or {})
+        created = 0
+        # the last message of each application
+        previous: dict[int, Future[None]] = {}
+
+        def create(
+            after: Future[None] | None, token: str, data: dict[str, Any]
+        ) -> None:
+            # tasks are started in order, so `after` was started before
+            if after is not None:
+                after.result()
+            if rate_limit is not None:
+                rate_limit.acquire(token)
+            self._request(
+                "/message", data=data, method="post", auth_mode="app", token=token
+            )
+
+        def collect(done: set[Future[None]]) -> None:
+            nonlocal created
+            for future in done:
+                future.result()
+                created += 1
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gotify"
+        )
+        pending: set[Future[None]] = set()
+        try:
+            with open_ndjson(fp, "rb") as f:
+                for message in read_ndjson_by_id(f, self.json_codec):
+                    app_id = message["appid"]
+                    if app_id not in tokens:
+                        tokens[app_id] = self._get_import_token(app_id, fallback_token)
+                    data = {key: message.get(key) for key in _IMPORTED_FIELDS}
+                    if len(pending) >= 2 * max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    future = executor.submit(
+                        create, previous.get(app_id), tokens[app_id], data
+                    )
+                    previous[app_id] = future
+                    pending.add(future)
+            collect(wait(pending).done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return created
+
     # --- Clients -------------------------------------------------------------
 
     def get_clients(self) -> list[Client]:
         """Return all clients."""
-        return self._request("/client")
+        return self._request("/client", model=ClientModel)
 
     def create_client(self, name: str) -> Client:
         """Create a client."""
-        return self._request("/client", data={"name": name}, method="post")
+        return self._request(
+            "/client", data={"name": name}, method="post", model=ClientModel
+        )
 
     def update_client(self, id: int, name: str) -> Client:
         """Update a client."""
-        return self._request(f"/client/{id}", data={"name": name}, method="put")
+        return self._request(
+            f"/client/{id}", data={"name": name}, method="put", model=ClientModel
+        )
 
     def delete_client(self, id: int) -> None:
         """Delete a client."""
@@ -201,7 +844,7 @@ class Gotify:
 
     def get_current_user(self) -> User:
         """Return the current user."""
-        return self._request("/current/user")
+        return self._request("/current/user", model=UserModel)
 
     def set_password(self, passwd: str) -> None:
         """Update the password of the current user."""
@@ -213,7 +856,7 @@ class Gotify:
 
     def get_users(self) -> list[User]:
         """Return all users."""
-        return self._request("/user")
+        return self._request("/user", model=UserModel)
 
     def create_user(self, name: str, passwd: str, admin: bool | None = None) -> User:
         """Create a user."""
@@ -221,11 +864,12 @@ class Gotify:
             "/user",
             data={"name": name, "pass": passwd, "admin": admin},
             method="post",
+            model=UserModel,
         )
 
     def get_user(self, id: int) -> User:
         """Get a user."""
-        return self._request(f"/user/{id}")
+        return self._request(f"/user/{id}", model=UserModel)
 
     def update_user(
         self,
@@ -239,6 +883,7 @@ class Gotify:
             f"/user/{id}",
             data={"name": name, "pass": passwd, "admin": admin},
             method="post",
+            model=UserModel,
         )
 
     def delete_user(self, id: int) -> None:
@@ -251,6 +896,19 @@ class Gotify:
         """Get health information."""
         return self._request("/health")
 
+    def check_endpoints(self) -> dict[str, bool]:
+        """Check the health of every endpoint of `base_url`.
+
+        With multiple endpoints, unhealthy ones are ejected and healthy ones
+        are re-admitted, so this can be called periodically to detect failed
+        replicas before requests are sent to them.
+
+        Returns whether each endpoint is healthy.
+        """
+        http_client = self._get_http_client()
+        urls = [self.base_url] if self.endpoints is None else self.endpoints.urls
+        return {str(url): self._check_endpoint(http_client, url) for url in urls}
+
     # --- Plugins -------------------------------------------------------------
 
     def get_plugins(self) -> list[PluginConf]:
@@ -283,6 +941,146 @@ class Gotify:
         """Get version information."""
         return self._request("/version")
 
+    # --- Push Messages -------------------------------------------------------
+
+    def stream(
+        self,
+        reconnect: bool = False,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+        max_queue: int = 32,
+    ) -> Iterator[Message]:
+        """Wait for incoming push messages and yield them.
+
+        Messages are received in a background thread and buffered in a bounded
+        queue. The connection is closed when the generator is closed.
+
+        Make sure you installed this library with `pip install gotify[stream]`
+        to use this method.
+
+        Args:
+            reconnect (bool, optional): reconnect with a jittered exponential
+                backoff if the connection is lost. Messages that were missed in
+                the meantime are fetched from the server and every message is
+                yielded exactly once in order.
+
+            backoff_base (float, optional): delay in seconds before the first
+                reconnection attempt.
+
+            backoff_max (float, optional): maximum delay in seconds between
+                reconnection attempts.
+
+            max_queue (int, optional): maximum number of received messages
+                that are buffered until they are consumed.
+        """
+        import httpx
+
+        try:
+            from websockets.exceptions import WebSocketException
+            from websockets.sync.client import connect as ws_connect
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError(  # pragma: no cover
+                "Gotify.stream() requires 'websockets' to be installed. "
+                "You can install it with 'pip install websockets' "
+                "or 'pip install gotify[stream]'."
+            ) from exc
+
+        url = httpx.URL(self._get_url("/stream"))
+        url = url.copy_with(scheme="wss" if url.scheme == "https" else "ws")
+        headers = {"X-Gotify-Key": self._get_token("client")}
+
+        stream_url = str(url)
+        error: BaseException | None = None
+
+        def connect() -> _WebSocketReader:
+            reader = _WebSocketReader(
+                ws_connect(stream_url, additional_headers=headers), max_queue
+            )
+            self._notify("on_stream_connect", stream_url)
+            if self.metrics is not None:
+                self.metrics.add_gauge(
+                    "stream_queue_depth",
+                    reader.queue.qsize,
+                    "Received push messages that haven't been consumed.",
+                )
+            return reader
+
+        def receive(reader: _WebSocketReader) -> Message:
+            frame = reader.recv()
+            size = len(frame.encode()) if isinstance(frame, str) else len(frame)
+            self._notify("on_stream_frame", stream_url, size)
+            return self._to_model(MessageModel, self.json_codec.loads(frame))
+
+        def disconnect(reader: _WebSocketReader, error: BaseException | None) -> None:
+            reader.close()
+            self._notify("on_stream_disconnect", stream_url, error)
+            if self.metrics is not None:
+                self.metrics.remove_gauge("stream_queue_depth", reader.queue.qsize)
+
+        if not reconnect:
+            reader = connect()
+            try:
+                while True:
+                    yield receive(reader)
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                disconnect(reader, error)
+
+        last_id: int | None = None
+        attempt = 0
+        while True:
+            try:
+                if last_id is None:
+                    # remember the newest message before connecting so that
+                    # messages sent while connecting can be fetched afterwards
+                    page = self.get_messages(limit=1)
+                    last_id = max((msg["id"] for msg in page["messages"]), default=0)
+
+                reader = connect()
+                error = None
+                try:
+                    # messages that arrive over the websocket in the meantime
+                    # are buffered and skipped below if they were fetched here
+                    for msg in self._get_messages_after(last_id):
+                        last_id = msg["id"]
+                        yield msg
+                    attempt = 0
+
+                    while True:
+                        msg = receive(reader)
+                        if msg["id"] <= last_id:
+                            continue
+                        last_id = msg["id"]
+                        yield msg
+                except Exception as exc:
+                    error = exc
+                    raise
+                finally:
+                    disconnect(reader, error)
+            except (WebSocketException, OSError, httpx.TransportError):
+                pass
+            except GotifyError as exc:
+                if not exc.response.is_server_error:
+                    raise
+            time.sleep(exponential_backoff(attempt, backoff_base, backoff_max))
+            attempt += 1
+
+    def _get_messages_after(self, msg_id: int) -> list[Message]:
+        # return all messages newer than `msg_id` in chronological order
+        messages: list[Message] = []
+        pages = self.iter_messages()
+        try:
+            for msg in pages:
+                if msg["id"] <= msg_id:
+                    break
+                messages.append(msg)
+        finally:
+            pages.close()
+        messages.reverse()
+        return messages
+
     # --- Utils ---------------------------------------------------------------
 
     def _request(
@@ -292,47 +1090,336 @@ class Gotify:
         file: BinaryIO | None = None,
         method: str = "get",
         auth_mode: str = "client",
+        model: type[_Model] | None = None,
+        token: str | None = None,
     ) -> Any:  # noqa: ANN401
-        # if Gotify isn't used as a context manager
-        if self.http_client is None:
-            with self:
-                return self._request(
-                    url_endpoint=url_endpoint,
-                    data=data,
-                    file=file,
-                    method=method,
-                    auth_mode=auth_mode,
-                )
+        http_client = self._get_http_client()
 
         if data:
             # remove items that are None
             for key in [k for k, v in data.items() if v is None]:
                 del data[key]
 
-        r = self.http_client.request(
-            method,
-            self._get_url(url_endpoint),
-            headers={"X-Gotify-Key": self._get_token(auth_mode)},
-            params=data if method == "get" else None,
-            json=data if method != "get" else None,
-            files={"file": file} if file is not None else {},
+        token = token or self._get_token(auth_mode)
+
+        if self.cache is None:
+            result = self._send(
+                http_client, method, url_endpoint, token, auth_mode, data, file
+            )
+        elif method != "get":
+            try:
+                result = self._send(
+                    http_client, method, url_endpoint, token, auth_mode, data, file
+                )
+            finally:
+                self.cache.invalidate(url_endpoint)
+        else:
+            cache_key = (
+                url_endpoint,
+                token,
+                tuple(sorted(data.items())) if data else (),
+            )
+            found, result = self.cache.get(url_endpoint, cache_key)
+            if not found:
+                result = self._send(
+                    http_client, method, url_endpoint, token, auth_mode, data, file
+                )
+                self.cache.set(url_endpoint, cache_key, result)
+
+        if model is None:
+            return result
+        return self._to_model(model, result)
+
+    def _send(
+        self,
+        http_client: httpx.Client,
+        method: str,
+        url_endpoint: str,
+        token: str,
+        auth_mode: str,
+        data: dict[str, Any] | None,
+        file: BinaryIO | None,
+    ) -> Any:  # noqa: ANN401
+        rate_limit = (
+            self.rate_limit if auth_mode.lower() == "app" else self.client_rate_limit
         )
-        if r.is_success:
+        headers = {"X-Gotify-Key": token}
+        content = None
+        if data is not None and method != "get":
+            headers["Content-Type"] = "application/json"
+            content = self.json_codec.dumps(data)
+        endpoint = endpoint_template(url_endpoint)
+        start = time.monotonic()
+        attempt = 0
+        failovers = 0
+        # endpoints that failed since the last retry
+        tried: set[str] = set()
+        while True:
+            attempt += 1
+            base_url = self._select_endpoint(http_client, tried)
+            url = self._get_url(url_endpoint, base_url)
+            event = RequestEvent(method.upper(), endpoint, url, attempt)
+            breaker = self.circuit_breaker
+            try:
+                if rate_limit is not None:
+                    rate_limit.acquire(token)
+                if (
+                    breaker is not None
+                    and breaker.before_request()
+                    and breaker.probe_health
+                ):
+                    self._probe_health(http_client)
+            except (GotifyCircuitOpenError, GotifyRateLimitError) as exc:
+                event.exception = exc
+                self._notify("on_error", event)
+                raise
+
+            self._notify("on_request", event)
+            request_start = time.perf_counter()
             try:
-                return r.json()
-            except ValueError:
-                return r.text if r.text else None
+                request = http_client.build_request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=data if method == "get" else None,
+                    content=content,
+                    files={"file": file} if file is not None else {},
+                )
+                event.request_bytes = int(request.headers.get("Content-Length", 0))
+                r = http_client.send(request, stream=True)
+                try:
+                    event.ttfb = time.perf_counter() - request_start
+                    r.read()
+                finally:
+                    r.close()
+            except Exception as exc:
+                event.elapsed = time.perf_counter() - request_start
+                event.exception = exc
+                if breaker is not None:
+                    breaker.record_failure()
+                self._record_endpoint(base_url, failed=True)
+                if self._can_fail_over(failovers, exception=exc):
+                    failovers += 1
+                    if base_url is not None:
+                        tried.add(base_url)
+                    delay: float | None = 0.0
+                else:
+                    tried.clear()
+                    delay = self._get_retry_delay(
+                        method, attempt - failovers, start, exception=exc
+                    )
+                if delay is None:
+                    self._notify("on_error", event)
+                    raise
+            else:
+                event.elapsed = time.perf_counter() - request_start
+                event.status_code = r.status_code
+                event.response_bytes = len(r.content)
+                self._notify("on_response", event)
+                if breaker is not None:
+                    if r.is_server_error:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                self._record_endpoint(base_url, event.elapsed, failed=r.is_server_error)
+                if r.is_success:
+                    try:
+                        return self.json_codec.loads(r.content)
+                    except ValueError:
+                        return r.text if r.text else None
+                if self._can_fail_over(failovers, response=r):
+                    failovers += 1
+                    if base_url is not None:
+                        tried.add(base_url)
+                    delay = 0.0
+                else:
+                    tried.clear()
+                    delay = self._get_retry_delay(
+                        method, attempt - failovers, start, response=r
+                    )
+                if delay is None:
+                    error = GotifyError(r, self.json_codec)
+                    event.exception = error
+                    self._notify("on_error", event)
+                    raise error
+            event.retry_delay = delay
+            self._notify("on_retry", event)
+            time.sleep(delay)
+
+    def _get_http_client(self) -> httpx.Client:
+        # lazily create a long-lived connection pool that is shared by all
+        # requests (and threads) until `close()` is called
+        if self.http_client is None:
+            with self._http_client_lock:
+                if self.http_client is None:
+                    http_client = self._create_http_client()
+                    self._http_client_finalizer = weakref.finalize(
+                        self, http_client.close
+                    )
+                    self.http_client = http_client
+        return self.http_client
+
+    def _create_http_client(self) -> httpx.Client:
+        import httpx
+
+        kwargs: dict[str, Any] = {}
+        if self.limits is not None:
+            kwargs["limits"] = self.limits
+        if self.transport is not None:
+            kwargs["transport"] = self.transport
+        return httpx.Client(http2=self.http2, **kwargs)
+
+    def _probe_health(self, http_client: httpx.Client) -> None:
+        # probe a half-open circuit breaker with a health check
+        import httpx
+
+        assert self.circuit_breaker is not None
+        try:
+            r = http_client.get(self._get_url("/health"))
+            healthy = (
+                r.is_success
+                and self.json_codec.loads(r.content).get("health") == "green"
+            )
+        except (httpx.TransportError, ValueError):
+            healthy = False
+        if not healthy:
+            self.circuit_breaker.record_failure()
+            raise GotifyCircuitOpenError("The gotify server is unhealthy.")
+        self.circuit_breaker.record_success()
+
+    def _select_endpoint(
+        self, http_client: httpx.Client, exclude: Collection[str] = ()
+    ) -> str | None:
+        # base URL of the next attempt if `base_url` has multiple endpoints
+        if self.endpoints is None:
+            return None
+        for _ in range(len(self.endpoints)):
+            base_url = self.endpoints.select(exclude)
+            if not (
+                self.endpoints.probe_health and self.endpoints.is_recovering(base_url)
+            ):
+                return base_url
+            if self._check_endpoint(http_client, base_url):
+                return base_url
+        return self.endpoints.select(exclude)
+
+    def _check_endpoint(self, http_client: httpx.Client, base_url: str | None) -> bool:
+        # probe an endpoint with a health check and eject or re-admit it
+        import httpx
+
+        try:
+            r = http_client.get(self._get_url("/health", base_url))
+            healthy = (
+                r.is_success
+                and self.json_codec.loads(r.content).get("health") == "green"
+            )
+        except (httpx.TransportError, ValueError):
+            healthy = False
+        if self.endpoints is not None and base_url is not None:
+            if healthy:
+                self.endpoints.record_success(base_url)
+            else:
+                self.endpoints.eject(base_url)
+        return healthy
+
+    def _record_endpoint(
+        self,
+        base_url: str | None,
+        latency: float | None = None,
+        failed: bool = False,
+    ) -> None:
+        if self.endpoints is None or base_url is None:
+            return
+        if failed:
+            self.endpoints.record_failure(base_url)
+        else:
+            self.endpoints.record_success(base_url, latency)
+
+    def _can_fail_over(
+        self,
+        failovers: int,
+        response: httpx.Response | None = None,
+        exception: BaseException | None = None,
+    ) -> bool:
+        # requests that weren't processed are sent to another endpoint at once
+        return (
+            self.endpoints is not None
+            and failovers < len(self.endpoints) - 1
+            and is_failover_error(exception, response)
+        )
+
+    def _get_retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        start: float,
+        response: httpx.Response | None = None,
+        exception: BaseException | None = None,
+    ) -> float | None:
+        if self.retry is None:
+            return None
+        return self.retry.get_delay(
+            method, attempt, time.monotonic() - start, response, exception
+        )
+
+    def _get_import_token(self, app_id: int, fallback_token: str | None = None) -> str:
+        # token to import messages of an application without a given token
+        application = self.app_index.by_id(app_id)
+        if application is None:
+            self._refresh_app_index()
+            application = self.app_index.by_id(app_id)
+        if application is not None and application.get("token"):
+            return application["token"]
+        if fallback_token is not None:
+            return fallback_token
+        raise KeyError(f"There is no application with id {app_id}.")
+
+    def _refresh_app_index(self) -> None:
+        # bypass the cache, it doesn't contain applications created since
+        if self.cache is not None:
+            self.cache.invalidate("/application")
+        self.get_applications()
+
+    def _resolve_app_id(self, app_id: int | str) -> int:
+        if isinstance(app_id, str):
+            return self.get_application_by_name(app_id)["id"]
+        return app_id
+
+    def _notify(self, hook: str, *args: object) -> None:
+        if self.observers:
+            notify(self.observers, hook, *args)
+
+    def _to_model(self, model: type[_Model], result: Any) -> Any:  # noqa: ANN401
+        if not self.models:
+            return result
+        if isinstance(result, list):
+            return [model.from_dict(item) for item in result]
+        if model is MessageModel and "messages" in result:
+            # paged messages
+            result["messages"] = [model.from_dict(msg) for msg in result["messages"]]
+            return result
+        return model.from_dict(result)
+
+    def _set_base_url(self, base_url: BaseURL) -> None:
+        if base_url is None or isinstance(base_url, str):
+            self.base_url, self.endpoints = base_url, None
         else:
-            raise GotifyError(r)
+            if not isinstance(base_url, EndpointPool):
+                base_url = EndpointPool(base_url)
+            self.base_url, self.endpoints = base_url.urls[0], base_url
 
-    def _get_url(self, url_endpoint: str) -> str:
-        if not self.base_url:
+    def _get_url(self, url_endpoint: str, base_url: str | None = None) -> str:
+        if base_url is None:
+            base_url = (
+                self.base_url if self.endpoints is None else self.endpoints.select()
+            )
+        if not base_url:
             raise GotifyConfigurationError(
                 "'base_url' is not defined. You need to set it up before "
                 "accessing your Gotify server. It should be something like "
                 "'https://gotify.example.com/'"
             )
-        return self.base_url.strip("/") + "/" + url_endpoint.strip("/")
+        return base_url.strip("/") + "/" + url_endpoint.strip("/")
 
     def _get_token(self, auth_mode: str) -> str:
         if auth_mode.lower() == "client":
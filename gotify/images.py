@@ -0,0 +1,83 @@
+"""Keep track of uploaded application images to skip unchanged ones."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from typing import Any
+
+__all__ = ["ImageManifest", "file_digest"]
+
+
+def file_digest(path: str | os.PathLike[str]) -> str:
+    """Return the SHA-256 hex digest of a file.
+
+    The file is memory-mapped instead of being read into memory.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # empty files can't be mapped
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+class ImageManifest:
+    """Content hashes of uploaded application images stored in a JSON file.
+
+    For each application, the hash of the uploaded file and the image path
+    returned by gotify are stored. An image is up to date if both match, so
+    images that were replaced on the server are uploaded again.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        """Load a manifest or create an empty one.
+
+        Args:
+            path (str or path-like, optional): path of the JSON file. Without a
+                path, the manifest is only kept in memory.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._images: dict[str, dict[str, Any]] = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._images = json.load(f)
+
+    def __len__(self) -> int:
+        """Return the number of applications in the manifest."""
+        return len(self._images)
+
+    def is_current(self, app_id: int, digest: str, image: str | None) -> bool:
+        """Check if the image of an application was uploaded from this file."""
+        with self._lock:
+            entry = self._images.get(str(app_id))
+        return (
+            entry is not None
+            and entry.get("sha256") == digest
+            and entry.get("image") == image
+        )
+
+    def set(self, app_id: int, digest: str, image: str | None) -> None:
+        """Record the upload of an image."""
+        with self._lock:
+            self._images[str(app_id)] = {"sha256": digest, "image": image}
+
+    def remove(self, app_id: int) -> None:
+        """Forget the image of an application."""
+        with self._lock:
+            self._images.pop(str(app_id), None)
+
+    def save(self) -> None:
+        """Write the manifest to its file, replacing it atomically."""
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps(self._images, indent=2, sort_keys=True)
+        tmp_path = f"{os.fspath(self.path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,91 @@
+"""Encode and decode JSON with the fastest available library."""
+
+from __future__ import annotations
+
+import functools
+import json
+from typing import Any, Protocol
+
+__all__ = [
+    "JSONCodec",
+    "MsgspecCodec",
+    "OrjsonCodec",
+    "StdlibJSONCodec",
+    "default_codec",
+]
+
+
+class JSONCodec(Protocol):
+    """Interface of the JSON codecs used by `Gotify` and `AsyncGotify`."""
+
+    def dumps(self, obj: Any) -> bytes:  # noqa: ANN401
+        """Encode an object as UTF-8 encoded JSON."""
+        ...
+
+    def loads(self, data: str | bytes) -> Any:  # noqa: ANN401
+        """Decode JSON, raising `ValueError` if it is invalid."""
+        ...
+
+
+class StdlibJSONCodec:
+    """Codec that uses the `json` module of the standard library."""
+
+    def dumps(self, obj: Any) -> bytes:  # noqa: ANN401
+        """Encode an object as UTF-8 encoded JSON."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, data: str | bytes) -> Any:  # noqa: ANN401
+        """Decode JSON, raising `ValueError` if it is invalid."""
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec that uses `orjson`."""
+
+    def __init__(self) -> None:
+        """Initialise the codec, raises `ImportError` if orjson is missing."""
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:  # noqa: ANN401
+        """Encode an object as UTF-8 encoded JSON."""
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: str | bytes) -> Any:  # noqa: ANN401
+        """Decode JSON, raising `ValueError` if it is invalid."""
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec:
+    """Codec that uses `msgspec`."""
+
+    def __init__(self) -> None:
+        """Initialise the codec, raises `ImportError` if msgspec is missing."""
+        import msgspec
+
+        self._decode_error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:  # noqa: ANN401
+        """Encode an object as UTF-8 encoded JSON."""
+        return self._encoder.encode(obj)
+
+    def loads(self, data: str | bytes) -> Any:  # noqa: ANN401
+        """Decode JSON, raising `ValueError` if it is invalid."""
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as exc:
+            raise ValueError(str(exc)) from exc
+
+
+@functools.lru_cache(maxsize=None)
+def default_codec() -> JSONCodec:
+    """Return a codec for orjson or msgspec if installed, else for `json`."""
+    for codec in (OrjsonCodec, MsgspecCodec):
+        try:
+            return codec()
+        except ImportError:
+            pass
+    return StdlibJSONCodec()
@@ -0,0 +1,348 @@
+"""Collect request and stream metrics, e.g. to export them to Prometheus."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import weakref
+from typing import Any, Callable, Sequence
+
+from .observer import Observer, RequestEvent
+
+__all__ = ["Histogram", "Metrics"]
+
+# default buckets of the Prometheus client libraries, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Gauge = Callable[[], float]
+
+
+def _status_class(status_code: int | None) -> str:
+    return f"{(status_code or 0) // 100}xx"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Count observed values in fixed buckets."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialise an empty histogram.
+
+        Args:
+            buckets (sequence of float, optional): sorted upper bounds of the
+                buckets. A bucket for larger values is added automatically.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """Return the number of values less than or equal to each bound."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cumulative bucket counts, the sum and the count."""
+        return {
+            "buckets": {
+                _format_value(bound): count for bound, count in self.cumulative_counts()
+            },
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class _RequestStats:
+    __slots__ = ("count", "request_bytes", "response_bytes", "duration", "ttfb")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.count = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.duration = Histogram(buckets)
+        self.ttfb = Histogram(buckets)
+
+
+class Metrics(Observer):
+    """Count requests and record their latency per endpoint and status class.
+
+    Pass it to `Gotify` or `AsyncGotify` with `metrics`. Besides requests, it
+    counts retries, errors and push messages, and reports the depth of the
+    queues of outboxes and synchronous streams using the same client.
+
+    The duration of requests is recorded together with the time to first byte,
+    i.e. the time the server needed to respond, so slow requests can be
+    attributed to the server or the network and client.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialise the collector.
+
+        Args:
+            buckets (sequence of float, optional): upper bounds in seconds of
+                the latency histogram buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._gauges: dict[str, list[Callable[[], Gauge | None]]] = {}
+        self._gauge_help: dict[str, str] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded values, but keep the gauges."""
+        with self._lock:
+            # (method, endpoint, status class) -> stats
+            self._requests: dict[tuple[str, str, str], _RequestStats] = {}
+            self._retries: dict[tuple[str, str], int] = {}
+            self._errors: dict[tuple[str, str, str], int] = {}
+            self._stream_connects = 0
+            self._stream_disconnects = 0
+            self._stream_frames = 0
+            self._stream_bytes = 0
+            self._stream_start: float | None = None
+
+    # --- Gauges --------------------------------------------------------------
+
+    def add_gauge(self, name: str, func: Gauge, help: str = "") -> None:
+        """Report the value returned by `func` as gauge `name`.
+
+        Values of functions that are added with the same name are summed up.
+        Bound methods are only weakly referenced, so their objects can still
+        be garbage collected.
+
+        Args:
+            name (str): name of the gauge, e.g. `"outbox_queue_depth"`.
+
+            func (callable): returns the current value.
+
+            help (str, optional): description for the Prometheus export.
+        """
+        ref: Callable[[], Gauge | None]
+        if hasattr(func, "__self__"):
+            ref = weakref.WeakMethod(func)
+        else:
+            ref = lambda: func  # noqa: E731
+        with self._lock:
+            self._gauges.setdefault(name, []).append(ref)
+            if help:
+                self._gauge_help[name] = help
+
+    def remove_gauge(self, name: str, func: Gauge) -> None:
+        """Stop reporting a function that was added with `add_gauge()`."""
+        with self._lock:
+            refs = self._gauges.get(name, [])
+            self._gauges[name] = [ref for ref in refs if ref() not in (func, None)]
+
+    def gauges(self) -> dict[str, float]:
+        """Return the current value of all gauges."""
+        with self._lock:
+            gauges = {name: list(refs) for name, refs in self._gauges.items()}
+        result = {}
+        for name, refs in gauges.items():
+            funcs = [func for func in (ref() for ref in refs) if func is not None]
+            result[name] = sum(func() for func in funcs)
+        return result
+
+    # --- Observer hooks ------------------------------------------------------
+
+    def on_response(self, event: RequestEvent) -> None:
+        """Record the response of a request."""
+        key = (event.method, event.endpoint, _status_class(event.status_code))
+        with self._lock:
+            stats = self._requests.get(key)
+            if stats is None:
+                stats = self._requests[key] = _RequestStats(self.buckets)
+            stats.count += 1
+            stats.request_bytes += event.request_bytes
+            stats.response_bytes += event.response_bytes or 0
+            if event.elapsed is not None:
+                stats.duration.observe(event.elapsed)
+            if event.ttfb is not None:
+                stats.ttfb.observe(event.ttfb)
+
+    def on_retry(self, event: RequestEvent) -> None:
+        """Count a retry."""
+        key = (event.method, event.endpoint)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def on_error(self, event: RequestEvent) -> None:
+        """Count a failed request."""
+        key = (event.method, event.endpoint, type(event.exception).__name__)
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def on_stream_connect(self, url: str) -> None:
+        """Count a stream connection."""
+        with self._lock:
+            self._stream_connects += 1
+            if self._stream_start is None:
+                self._stream_start = time.monotonic()
+
+    def on_stream_frame(self, url: str, size: int) -> None:
+        """Count a push message."""
+        with self._lock:
+            self._stream_frames += 1
+            self._stream_bytes += size
+
+    def on_stream_disconnect(self, url: str, exception: BaseException | None) -> None:
+        """Count a disconnected stream."""
+        with self._lock:
+            self._stream_disconnects += 1
+
+    # --- Export --------------------------------------------------------------
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics as a JSON serializable dict."""
+        with self._lock:
+            elapsed = (
+                None
+                if self._stream_start is None
+                else time.monotonic() - self._stream_start
+            )
+            result: dict[str, Any] = {
+                "requests": [
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "status": status,
+                        "count": stats.count,
+                        "request_bytes": stats.request_bytes,
+                        "response_bytes": stats.response_bytes,
+                        "duration": stats.duration.as_dict(),
+                        "ttfb": stats.ttfb.as_dict(),
+                    }
+                    for (method, endpoint, status), stats in self._requests.items()
+                ],
+                "retries": [
+                    {"method": method, "endpoint": endpoint, "count": count}
+                    for (method, endpoint), count in self._retries.items()
+                ],
+                "errors": [
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "error": error,
+                        "count": count,
+                    }
+                    for (method, endpoint, error), count in self._errors.items()
+                ],
+                "stream": {
+                    "connects": self._stream_connects,
+                    "disconnects": self._stream_disconnects,
+                    "frames": self._stream_frames,
+                    "bytes": self._stream_bytes,
+                    "frames_per_second": (
+                        self._stream_frames / elapsed if elapsed else 0.0
+                    ),
+                },
+            }
+        result["gauges"] = self.gauges()
+        return result
+
+    def to_prometheus(self, prefix: str = "gotify") -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def metric(name: str, type: str, help: str) -> str:
+            name = f"{prefix}_{name}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            return name
+
+        def sample(name: str, labels: dict[str, str], value: float) -> None:
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        def histogram(name: str, labels: dict[str, str], hist: Histogram) -> None:
+            for bound, count in hist.cumulative_counts():
+                sample(f"{name}_bucket", {**labels, "le": _format_value(bound)}, count)
+            sample(f"{name}_sum", labels, hist.sum)
+            sample(f"{name}_count", labels, hist.count)
+
+        with self._lock:
+            requests = [
+                ({"method": m, "endpoint": e, "status": s}, stats)
+                for (m, e, s), stats in self._requests.items()
+            ]
+
+            name = metric("requests_total", "counter", "Responses received.")
+            for labels, stats in requests:
+                sample(name, labels, stats.count)
+            name = metric("request_bytes_total", "counter", "Bytes sent in requests.")
+            for labels, stats in requests:
+                sample(name, labels, stats.request_bytes)
+            name = metric(
+                "response_bytes_total", "counter", "Bytes received in responses."
+            )
+            for labels, stats in requests:
+                sample(name, labels, stats.response_bytes)
+            name = metric(
+                "request_duration_seconds", "histogram", "Duration of requests."
+            )
+            for labels, stats in requests:
+                histogram(name, labels, stats.duration)
+            name = metric(
+                "time_to_first_byte_seconds",
+                "histogram",
+                "Time until the response headers were received.",
+            )
+            for labels, stats in requests:
+                histogram(name, labels, stats.ttfb)
+
+            name = metric("retries_total", "counter", "Retried requests.")
+            for (method, endpoint), count in self._retries.items():
+                sample(name, {"method": method, "endpoint": endpoint}, count)
+            name = metric("errors_total", "counter", "Failed requests.")
+            for (method, endpoint, error), count in self._errors.items():
+                labels = {"method": method, "endpoint": endpoint, "error": error}
+                sample(name, labels, count)
+
+            name = metric(
+                "stream_connects_total", "counter", "Push message stream connections."
+            )
+            sample(name, {}, self._stream_connects)
+            name = metric(
+                "stream_disconnects_total",
+                "counter",
+                "Push message stream disconnections.",
+            )
+            sample(name, {}, self._stream_disconnects)
+            name = metric("stream_frames_total", "counter", "Push messages received.")
+            sample(name, {}, self._stream_frames)
+            name = metric(
+                "stream_bytes_total", "counter", "Size of received push messages."
+            )
+            sample(name, {}, self._stream_bytes)
+
+        for gauge, value in self.gauges().items():
+            help = self._gauge_help.get(gauge, gauge)
+            sample(metric(gauge, "gauge", help), {}, value)
+
+        return "\n".join(lines) + "\n"
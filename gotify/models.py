@@ -0,0 +1,182 @@
+"""Compact objects as an alternative to the response dicts.
+
+Pass `models=True` to `Gotify` or `AsyncGotify` to receive these objects
+instead of dicts. They store their fields in `__slots__`, which needs a
+fraction of the memory of a dict, and only parse dates when they are accessed.
+Items can still be accessed like dict keys, e.g. `message["appid"]`, to ease
+switching between both modes.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import Any, ClassVar, Mapping, TypeVar
+
+__all__ = [
+    "ApplicationModel",
+    "ClientModel",
+    "MessageModel",
+    "UserModel",
+    "parse_date",
+]
+
+ModelType = TypeVar("ModelType", bound="_Model")
+
+_DATE_RE = re.compile(r"([^.]*)(?:\.(\d+))?(.*)")
+
+
+def parse_date(value: str) -> datetime:
+    """Parse a timestamp returned by the gotify server.
+
+    gotify uses up to nine fractional digits (e.g.
+    `2018-02-27T19:36:10.5045044+01:00`), but `datetime.fromisoformat()` only
+    supports microseconds, so the fraction is truncated. A trailing `Z`,
+    which Python < 3.11 doesn't support either, is replaced with `+00:00`.
+    """
+    if value.endswith("Z"):
+        # the fraction is omitted if it is zero, e.g. `2024-01-01T00:00:00Z`
+        value = value[:-1] + "+00:00"
+    match = _DATE_RE.fullmatch(value)
+    if match is None:  # pragma: no cover
+        raise ValueError(f"Invalid date: {value!r}")
+    head, fraction, offset = match.groups()
+    if fraction:
+        head += "." + fraction[:6].ljust(6, "0")
+    return datetime.fromisoformat(head + offset)
+
+
+class _Model:
+    # maps JSON keys to slot names
+    _fields: ClassVar[dict[str, str]] = {}
+    __slots__: tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls: type[ModelType], data: Mapping[str, Any]) -> ModelType:
+        """Create an object from a JSON response."""
+        obj = cls.__new__(cls)
+        for key, slot in cls._fields.items():
+            setattr(obj, slot, data.get(key))
+        return obj
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the fields that are set as a JSON-like dict."""
+        return {key: self[key] for key in self._fields if key in self}
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        try:
+            slot = self._fields[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return getattr(self, slot)
+
+    def __contains__(self, key: object) -> bool:
+        slot = self._fields.get(key) if isinstance(key, str) else None
+        return slot is not None and getattr(self, slot) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        """Return the value of a JSON key, like `dict.get()`."""
+        return self[key] if key in self else default
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{slot}={getattr(self, slot)!r}"
+            for slot in self._fields.values()
+            if getattr(self, slot) is not None
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class ApplicationModel(_Model):
+    """An application, see `response_types.Application`."""
+
+    _fields = {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "token": "token",
+        "image": "image",
+        "internal": "internal",
+        "defaultPriority": "default_priority",
+        "lastUsed": "_last_used",
+    }
+    __slots__ = tuple(_fields.values())
+
+    id: int
+    name: str
+    description: str | None
+    token: str | None
+    image: str | None
+    internal: bool | None
+    default_priority: int | None
+    _last_used: str | None
+
+    @property
+    def last_used(self) -> datetime | None:
+        """Time when the application was used last."""
+        return None if self._last_used is None else parse_date(self._last_used)
+
+
+class ClientModel(_Model):
+    """A client, see `response_types.Client`."""
+
+    _fields = {"id": "id", "name": "name", "token": "token", "lastUsed": "_last_used"}
+    __slots__ = tuple(_fields.values())
+
+    id: int
+    name: str
+    token: str | None
+    _last_used: str | None
+
+    @property
+    def last_used(self) -> datetime | None:
+        """Time when the client was used last."""
+        return None if self._last_used is None else parse_date(self._last_used)
+
+
+class MessageModel(_Model):
+    """A message, see `response_types.Message`.
+
+    `date` is parsed into a `datetime` on every access, `message["date"]`
+    returns the original string.
+    """
+
+    _fields = {
+        "id": "id",
+        "appid": "appid",
+        "message": "message",
+        "title": "title",
+        "priority": "priority",
+        "date": "_date",
+        "extras": "extras",
+    }
+    __slots__ = tuple(_fields.values())
+
+    id: int
+    appid: int
+    message: str
+    title: str | None
+    priority: int | None
+    _date: str
+    extras: dict | None
+
+    @property
+    def date(self) -> datetime:
+        """Time when the message was created."""
+        return parse_date(self._date)
+
+
+class UserModel(_Model):
+    """A user, see `response_types.User`."""
+
+    _fields = {"id": "id", "name": "name", "admin": "admin"}
+    __slots__ = tuple(_fields.values())
+
+    id: int
+    name: str
+    admin: bool | None
@@ -0,0 +1,362 @@
+"""Send messages to several gotify servers at once."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Iterable, Mapping, TypeVar, Union
+
+from .async_gotify import AsyncGotify
+from .errors import GotifyQuorumError
+from .gotify import Gotify
+from .response_types import Message
+
+__all__ = ["AsyncMultiGotify", "FanOutResult", "MultiGotify"]
+
+MultiGotifyType = TypeVar("MultiGotifyType", bound="MultiGotify")
+AsyncMultiGotifyType = TypeVar("AsyncMultiGotifyType", bound="AsyncMultiGotify")
+
+# "any", "quorum", "all" or the number of servers
+Completion = Union[str, int]
+
+ClientType = TypeVar("ClientType", Gotify, AsyncGotify)
+
+
+def _named_targets(
+    targets: Mapping[str, ClientType] | Iterable[ClientType],
+) -> dict[str, ClientType]:
+    if isinstance(targets, Mapping):
+        named = dict(targets)
+    else:
+        named = {}
+        for client in targets:
+            name = str(client.base_url)
+            if name in named:
+                raise ValueError(
+                    f"Multiple targets for '{name}', pass a mapping of names to "
+                    "clients instead."
+                )
+            named[name] = client
+    if not named:
+        raise ValueError("At least one target is required.")
+    return named
+
+
+def _required_successes(complete: Completion, targets: int) -> int:
+    if complete == "any":
+        return 1
+    if complete == "quorum":
+        return targets // 2 + 1
+    if complete == "all":
+        return targets
+    if isinstance(complete, int) and 0 < complete <= targets:
+        return complete
+    raise ValueError(
+        f"complete must be 'any', 'quorum', 'all' or between 1 and {targets}, "
+        f"not {complete!r}."
+    )
+
+
+def _timeout_error(timeout: float | None) -> TimeoutError:
+    return TimeoutError(f"Message was not sent within {timeout} seconds.")
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of sending a message to several servers.
+
+    The result is returned as soon as enough servers have accepted the
+    message. Targets that haven't responded by then are `pending` and the
+    entries in `results` are updated in the background once they respond.
+
+    Attributes:
+        required (int): number of servers that have to accept the message.
+
+        results (dict): created message, raised exception or `None` while
+            pending for each target name.
+    """
+
+    required: int
+    results: dict[str, Message | Exception | None] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> list[str]:
+        """Return the names of the targets that accepted the message."""
+        return [
+            name
+            for name, result in self.results.items()
+            if result is not None and not isinstance(result, Exception)
+        ]
+
+    @property
+    def failed(self) -> dict[str, Exception]:
+        """Return the exception raised for each failed target."""
+        return {
+            name: result
+            for name, result in self.results.items()
+            if isinstance(result, Exception)
+        }
+
+    @property
+    def pending(self) -> list[str]:
+        """Return the names of the targets that haven't responded yet."""
+        return [name for name, result in self.results.items() if result is None]
+
+    @property
+    def ok(self) -> bool:
+        """Return whether enough targets accepted the message."""
+        return len(self.succeeded) >= self.required
+
+    def _decided(self) -> bool:
+        # either enough targets succeeded or too many failed
+        succeeded = len(self.succeeded)
+        return (
+            succeeded >= self.required or succeeded + len(self.pending) < self.required
+        )
+
+
+class MultiGotify:
+    """Send messages to several gotify servers concurrently using threads."""
+
+    def __init__(
+        self,
+        targets: Mapping[str, Gotify] | Iterable[Gotify],
+        complete: Completion = "all",
+        timeout: float | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        """Initialise the fan-out client.
+
+        Args:
+            targets (mapping or iterable of Gotify): clients of the servers,
+                optionally by name. Without names, the base URLs are used.
+                Every client keeps its own connection pool.
+
+            complete (str or int, optional): when `create_message()` returns:
+                as soon as `"any"` server, a `"quorum"` (the majority) or
+                `"all"` servers accepted the message, or a number of servers.
+
+            timeout (float, optional): seconds to wait for the servers.
+                Targets that haven't responded by then fail with a
+                `TimeoutError`.
+
+            max_workers (int, optional): number of threads, by default twice
+                the number of targets.
+        """
+        self.targets: dict[str, Gotify] = _named_targets(targets)
+        self.complete: Completion = complete
+        self.timeout: float | None = timeout
+        _required_successes(complete, len(self.targets))
+        for client in self.targets.values():
+            client._get_http_client()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or 2 * len(self.targets),
+            thread_name_prefix="gotify-multi",
+        )
+
+    def __enter__(self: MultiGotifyType) -> MultiGotifyType:  # -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException],
+        exc_value: BaseException,
+        traceback: TracebackType,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for messages that are still sent in the background.
+
+        The clients of the targets are not closed.
+        """
+        self._executor.shutdown(wait=True)
+
+    def create_message(
+        self,
+        message: str,
+        extras: dict | None = None,
+        priority: int | None = None,
+        title: str | None = None,
+        complete: Completion | None = None,
+        timeout: float | None = None,
+    ) -> FanOutResult:
+        """Send a message to all targets concurrently.
+
+        `complete` and `timeout` override the defaults of the object. Once
+        enough targets accepted the message, the result is returned while the
+        message is still sent to the remaining targets in the background.
+
+        Raises:
+            GotifyQuorumError: if not enough targets accepted the message.
+        """
+        complete = self.complete if complete is None else complete
+        timeout = self.timeout if timeout is None else timeout
+        result = FanOutResult(_required_successes(complete, len(self.targets)))
+        kwargs: dict[str, Any] = {
+            "message": message,
+            "extras": extras,
+            "priority": priority,
+            "title": title,
+        }
+        futures: dict[Future[Message], str] = {}
+        for name, client in self.targets.items():
+            result.results[name] = None
+            futures[self._executor.submit(client.create_message, **kwargs)] = name
+
+        def record(future: Future[Message]) -> None:
+            exc = future.exception()
+            if exc is not None and not isinstance(exc, Exception):
+                # e.g. KeyboardInterrupt
+                raise exc
+            result.results[futures[future]] = future.result() if exc is None else exc
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = set(futures)
+        while pending and not result._decided():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = wait(pending, remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(future)
+
+        decided = result._decided()
+        for future in pending:
+            if decided:
+                future.add_done_callback(record)
+            else:
+                # requests that are already in flight are not interrupted
+                future.cancel()
+                result.results[futures[future]] = _timeout_error(timeout)
+
+        if not result.ok:
+            raise GotifyQuorumError(result)
+        return result
+
+
+class AsyncMultiGotify:
+    """Send messages to several gotify servers concurrently using tasks."""
+
+    def __init__(
+        self,
+        targets: Mapping[str, AsyncGotify] | Iterable[AsyncGotify],
+        complete: Completion = "all",
+        timeout: float | None = None,
+    ) -> None:
+        """Initialise the fan-out client.
+
+        Args:
+            targets (mapping or iterable of AsyncGotify): clients of the
+                servers, optionally by name. Without names, the base URLs are
+                used. Every client keeps its own connection pool.
+
+            complete (str or int, optional): when `create_message()` returns:
+                as soon as `"any"` server, a `"quorum"` (the majority) or
+                `"all"` servers accepted the message, or a number of servers.
+
+            timeout (float, optional): seconds to wait for the servers.
+                Requests to targets that haven't responded by then are
+                cancelled and fail with a `TimeoutError`.
+        """
+        self.targets: dict[str, AsyncGotify] = _named_targets(targets)
+        self.complete: Completion = complete
+        self.timeout: float | None = timeout
+        _required_successes(complete, len(self.targets))
+        self._background: set[asyncio.Task] = set()
+
+    async def __aenter__(
+        self: AsyncMultiGotifyType,
+    ) -> AsyncMultiGotifyType:  # -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException],
+        exc_value: BaseException,
+        traceback: TracebackType,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for messages that are still sent in the background.
+
+        The clients of the targets are not closed.
+        """
+        while self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def create_message(
+        self,
+        message: str,
+        extras: dict | None = None,
+        priority: int | None = None,
+        title: str | None = None,
+        complete: Completion | None = None,
+        timeout: float | None = None,
+    ) -> FanOutResult:
+        """Send a message to all targets concurrently.
+
+        `complete` and `timeout` override the defaults of the object. Once
+        enough targets accepted the message, the result is returned while the
+        message is still sent to the remaining targets in the background.
+
+        Raises:
+            GotifyQuorumError: if not enough targets accepted the message.
+        """
+        complete = self.complete if complete is None else complete
+        timeout = self.timeout if timeout is None else timeout
+        result = FanOutResult(_required_successes(complete, len(self.targets)))
+        kwargs: dict[str, Any] = {
+            "message": message,
+            "extras": extras,
+            "priority": priority,
+            "title": title,
+        }
+        tasks: dict[asyncio.Task[Message], str] = {}
+        for name, client in self.targets.items():
+            result.results[name] = None
+            tasks[asyncio.create_task(client.create_message(**kwargs))] = name
+
+        def record(task: asyncio.Task[Message]) -> None:
+            if task.cancelled():
+                return
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, Exception):
+                # e.g. KeyboardInterrupt
+                raise exc
+            result.results[tasks[task]] = task.result() if exc is None else exc
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = set(tasks)
+        try:
+            while pending and not result._decided():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    record(task)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        decided = result._decided()
+        for task in pending:
+            if decided:
+                self._background.add(task)
+                task.add_done_callback(record)
+                task.add_done_callback(self._background.discard)
+            else:
+                task.cancel()
+                result.results[tasks[task]] = _timeout_error(timeout)
+
+        if not result.ok:
+            raise GotifyQuorumError(result)
+        return result
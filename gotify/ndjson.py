@@ -0,0 +1,92 @@
+"""Read and write newline-delimited JSON files, optionally gzip compressed."""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import os
+import tempfile
+from array import array
+from itertools import islice
+from typing import Any, BinaryIO, Iterable, Iterator, Union, cast
+
+from .json_codec import JSONCodec
+
+__all__ = ["open_ndjson", "read_ndjson", "read_ndjson_by_id"]
+
+FileOrPath = Union[BinaryIO, str, "os.PathLike[str]"]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _is_gzip(f: BinaryIO) -> bool:
+    # check the magic number without consuming it
+    if hasattr(f, "peek"):
+        return f.peek(2)[:2] == _GZIP_MAGIC
+    if f.seekable():
+        position = f.tell()
+        magic = f.read(2)
+        f.seek(position)
+        return magic == _GZIP_MAGIC
+    return False
+
+
+@contextlib.contextmanager
+def open_ndjson(
+    fp: FileOrPath, mode: str = "rb", compress: bool | None = None
+) -> Iterator[BinaryIO]:
+    """Open a file for reading (`"rb"`) or writing (`"wb"`) NDJSON.
+
+    `fp` is a path or a file opened in binary mode, which isn't closed. When
+    writing, the file is gzip compressed if `compress` is true or, by default,
+    if the path ends with `.gz`. When reading, gzip compressed files are
+    detected automatically unless `compress` is given.
+    """
+    if mode not in ("rb", "wb"):
+        raise ValueError(f"Invalid mode '{mode}'.")
+    with contextlib.ExitStack() as stack:
+        if isinstance(fp, (str, os.PathLike)):
+            if compress is None and mode == "wb":
+                compress = os.fspath(fp).endswith(".gz")
+            f = cast(BinaryIO, stack.enter_context(open(fp, mode)))
+        else:
+            f = fp
+        if compress is None:
+            compress = mode == "rb" and _is_gzip(f)
+        if compress:
+            f = cast(BinaryIO, stack.enter_context(gzip.GzipFile(fileobj=f, mode=mode)))
+        yield f
+
+
+def read_ndjson(f: BinaryIO, json_codec: JSONCodec) -> Iterator[Any]:
+    """Lazily decode the objects of an NDJSON file, skipping blank lines."""
+    for line in f:
+        if line.strip():
+            yield json_codec.loads(line)
+
+
+def read_ndjson_by_id(f: BinaryIO, json_codec: JSONCodec) -> Iterator[Any]:
+    """Decode the objects of an NDJSON file in ascending order of their `"id"`.
+
+    Used to replay exported messages, which are written newest first, in the
+    order they were created. The lines are copied to a temporary file, only
+    their ids and offsets are kept in memory.
+    """
+    ids = array("q")
+    offsets = array("q")
+    with tempfile.TemporaryFile() as tmp:
+        for line in f:
+            if not line.strip():
+                continue
+            ids.append(json_codec.loads(line)["id"])
+            offsets.append(tmp.tell())
+            tmp.write(line if line.endswith(b"\n") else line + b"\n")
+        order: Iterable[int]
+        if all(a > b for a, b in zip(ids, islice(ids, 1, None))):
+            # written by `export_messages()`
+            order = reversed(range(len(ids)))
+        else:
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+        for index in order:
+            tmp.seek(offsets[index])
+            yield json_codec.loads(tmp.readline())
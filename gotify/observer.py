@@ -0,0 +1,113 @@
+"""Observe requests and push message streams, e.g. for tracing or metrics."""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+__all__ = ["Observer", "RequestEvent"]
+
+logger = logging.getLogger(__name__)
+
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url_endpoint: str) -> str:
+    """Replace ids in an endpoint, e.g. `/application/3/message`.
+
+    Returns a template like `/application/{id}/message` that can be used to
+    group requests without creating a metric per resource.
+    """
+    return _ID_RE.sub("/{id}", url_endpoint)
+
+
+@dataclass
+class RequestEvent:
+    """A single attempt to send a request.
+
+    The same object is passed to all hooks of an attempt, so attributes that
+    aren't known yet are `None`.
+
+    Attributes:
+        method (str): HTTP method, e.g. `"POST"`.
+
+        endpoint (str): endpoint template, e.g. `"/application/{id}/message"`.
+
+        url (str): requested URL.
+
+        attempt (int): number of the attempt, starting at 1.
+
+        request_bytes (int): size of the request body.
+
+        status_code (int, optional): status code of the response.
+
+        response_bytes (int, optional): size of the response body.
+
+        ttfb (float, optional): seconds until the response headers were
+            received.
+
+        elapsed (float, optional): seconds until the response body was
+            received or an error occurred.
+
+        exception (BaseException, optional): the error that made the attempt
+            fail.
+
+        retry_delay (float, optional): seconds until the request is retried.
+    """
+
+    method: str
+    endpoint: str
+    url: str
+    attempt: int
+    request_bytes: int = 0
+    status_code: int | None = None
+    response_bytes: int | None = None
+    ttfb: float | None = None
+    elapsed: float | None = None
+    exception: BaseException | None = None
+    retry_delay: float | None = None
+
+
+class Observer:
+    """Base class for observers of `Gotify` and `AsyncGotify`.
+
+    Subclass it, override the hooks you need and pass an instance with
+    `observers`. Hooks are called synchronously, also by `AsyncGotify`, so
+    they shouldn't block. Exceptions raised by hooks are logged and ignored.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called before a request is sent."""
+
+    def on_response(self, event: RequestEvent) -> None:
+        """Called after a response has been received, even an error response."""
+
+    def on_retry(self, event: RequestEvent) -> None:
+        """Called if a failed request will be sent again after `retry_delay`."""
+
+    def on_error(self, event: RequestEvent) -> None:
+        """Called if a request finally failed, e.g. with a `GotifyError`."""
+
+    def on_stream_connect(self, url: str) -> None:
+        """Called after a push message stream has been connected."""
+
+    def on_stream_frame(self, url: str, size: int) -> None:
+        """Called for every push message received with its size in bytes."""
+
+    def on_stream_disconnect(self, url: str, exception: BaseException | None) -> None:
+        """Called after a push message stream has been disconnected.
+
+        `exception` is the error that caused the disconnect or `None` if the
+        stream was closed by the consumer.
+        """
+
+
+def notify(observers: Iterable[Observer], hook: str, *args: object) -> None:
+    """Call a hook of all observers."""
+    for observer in observers:
+        try:
+            getattr(observer, hook)(*args)
+        except Exception:
+            logger.exception("%s.%s() failed", type(observer).__name__, hook)
@@ -0,0 +1,302 @@
+"""Send messages in the background without waiting for the gotify server."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from types import TracebackType
+from typing import Any, Callable, Optional, TypeVar
+
+from .async_gotify import AsyncGotify
+from .gotify import Gotify
+
+__all__ = ["AsyncOutbox", "Outbox"]
+
+logger = logging.getLogger(__name__)
+
+OutboxType = TypeVar("OutboxType", bound="Outbox")
+AsyncOutboxType = TypeVar("AsyncOutboxType", bound="AsyncOutbox")
+
+ErrorCallback = Callable[[dict[str, Any], Exception], None]
+
+_STOP = object()
+
+
+def _log_error(message: dict[str, Any], exc: Exception) -> None:
+    logger.warning("Failed to send message %r: %s", message.get("message"), exc)
+
+
+class Outbox:
+    """Queue messages and send them from background threads."""
+
+    def __init__(
+        self,
+        gotify: Gotify,
+        max_workers: int = 4,
+        maxsize: int = 0,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> None:
+        """Initialise the outbox and start its worker threads.
+
+        Args:
+            gotify (Gotify): client that is used to send the messages.
+
+            max_workers (int, optional): number of messages that are sent
+                concurrently.
+
+            maxsize (int, optional): maximum number of queued messages,
+                `send()` raises `queue.Full` if it is reached. Unbounded if 0.
+
+            on_error (callable, optional): called with the message and the
+                raised exception if a message can't be sent. By default, the
+                error is logged.
+        """
+        self.gotify = gotify
+        self.on_error: ErrorCallback = on_error or _log_error
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize)
+        self._pending = 0
+        self._pending_changed = threading.Condition()
+        self._closed = False
+        self._stopping = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._work, name="gotify-outbox", daemon=True)
+            for _ in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        if gotify.metrics is not None:
+            gotify.metrics.add_gauge(
+                "outbox_queue_depth", self.__len__, "Messages queued in outboxes."
+            )
+
+    def __enter__(self: OutboxType) -> OutboxType:  # -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException],
+        exc_value: BaseException,
+        traceback: TracebackType,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of messages that haven't been sent yet."""
+        return self._pending
+
+    def send(
+        self,
+        message: str,
+        extras: dict | None = None,
+        priority: int | None = None,
+        title: str | None = None,
+    ) -> None:
+        """Queue a message, it is sent by a background thread."""
+        if self._closed:
+            raise RuntimeError("Can't send messages with a closed outbox.")
+        with self._pending_changed:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(
+                {
+                    "message": message,
+                    "extras": extras,
+                    "priority": priority,
+                    "title": title,
+                }
+            )
+        except queue.Full:
+            self._task_done()
+            raise
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all queued messages have been sent.
+
+        Returns `False` if there are still unsent messages after `timeout`
+        seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._pending_changed:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._pending_changed.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Stop accepting messages, send the queued ones and stop the workers.
+
+        Returns `False` if not all messages could be sent within `timeout`
+        seconds, those messages are discarded. Messages that are being sent
+        are finished by the workers in the background.
+        """
+        self._closed = True
+        flushed = self.flush(timeout)
+        self._stopping.set()
+        if not flushed:
+            while True:
+                try:
+                    message = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if message is not _STOP:
+                    self._task_done()
+        self._wake_worker()
+        if flushed:
+            for worker in self._workers:
+                worker.join()
+        return flushed
+
+    def _wake_worker(self) -> None:
+        # a worker waiting for a message passes the sentinel on before it
+        # stops, so a single one wakes up all of them even if the queue is
+        # smaller than the number of workers
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            # workers aren't waiting and stop after their current message
+            pass
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            message = self._queue.get()
+            if message is _STOP:
+                break
+            try:
+                self.gotify.create_message(**message)
+            except Exception as exc:
+                self.on_error(message, exc)
+            finally:
+                self._task_done()
+        self._wake_worker()
+
+    def _task_done(self) -> None:
+        with self._pending_changed:
+            self._pending -= 1
+            self._pending_changed.notify_all()
+
+
+class AsyncOutbox:
+    """Queue messages and send them from background tasks."""
+
+    def __init__(
+        self,
+        gotify: AsyncGotify,
+        concurrency: int = 4,
+        maxsize: int = 0,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> None:
+        """Initialise the outbox.
+
+        The worker tasks are started when the first message is queued.
+
+        Args:
+            gotify (AsyncGotify): client that is used to send the messages.
+
+            concurrency (int, optional): number of messages that are sent
+                concurrently.
+
+            maxsize (int, optional): maximum number of queued messages,
+                `send()` raises `asyncio.QueueFull` if it is reached.
+                Unbounded if 0.
+
+            on_error (callable, optional): called with the message and the
+                raised exception if a message can't be sent. By default, the
+                error is logged.
+        """
+        self.gotify = gotify
+        self.concurrency = concurrency
+        self.maxsize = maxsize
+        self.on_error: ErrorCallback = on_error or _log_error
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._pending = 0
+        self._closed = False
+        if gotify.metrics is not None:
+            gotify.metrics.add_gauge(
+                "outbox_queue_depth", self.__len__, "Messages queued in outboxes."
+            )
+
+    async def __aenter__(self: AsyncOutboxType) -> AsyncOutboxType:  # -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException],
+        exc_value: BaseException,
+        traceback: TracebackType,
+    ) -> None:
+        await self.aclose()
+
+    def __len__(self) -> int:
+        """Return the number of messages that haven't been sent yet."""
+        return self._pending
+
+    def send(
+        self,
+        message: str,
+        extras: dict | None = None,
+        priority: int | None = None,
+        title: str | None = None,
+    ) -> None:
+        """Queue a message, it is sent by a background task."""
+        if self._closed:
+            raise RuntimeError("Can't send messages with a closed outbox.")
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.maxsize)
+            self._workers = [
+                asyncio.create_task(self._work()) for _ in range(self.concurrency)
+            ]
+        self._queue.put_nowait(
+            {"message": message, "extras": extras, "priority": priority, "title": title}
+        )
+        self._pending += 1
+
+    async def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all queued messages have been sent.
+
+        Returns `False` if there are still unsent messages after `timeout`
+        seconds.
+        """
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def aclose(self, timeout: float | None = None) -> bool:
+        """Stop accepting messages, send the queued ones and stop the workers.
+
+        Returns `False` if not all messages could be sent within `timeout`
+        seconds, those messages are discarded.
+        """
+        self._closed = True
+        flushed = await self.flush(timeout)
+        for worker in self._workers:
+            worker.cancel()
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                self._queue.task_done()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._pending = 0
+        return flushed
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            message = await self._queue.get()
+            try:
+                await self.gotify.create_message(**message)
+            except Exception as exc:
+                self.on_error(message, exc)
+            finally:
+                self._pending -= 1
+                self._queue.task_done()
@@ -0,0 +1,69 @@
+"""Client-side rate limiting of requests to a gotify server."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from .errors import GotifyRateLimitError
+
+__all__ = ["RateLimiter"]
+
+
+class RateLimiter:
+    """Token bucket rate limiter with a separate bucket for every key.
+
+    `Gotify` and `AsyncGotify` use the token that authenticates a request as
+    key, so each application or client token is limited independently.
+    """
+
+    def __init__(
+        self, rate: float, burst: int | None = None, block: bool = True
+    ) -> None:
+        """Initialise the rate limiter.
+
+        Args:
+            rate (float): number of requests per second that are allowed on
+                average.
+
+            burst (int, optional): number of requests that can be sent at once
+                before they are throttled. Defaults to `max(1, rate)`.
+
+            block (bool, optional): wait until a request is allowed. If
+                `False`, `GotifyRateLimitError` is raised instead.
+        """
+        if rate <= 0:
+            raise ValueError("'rate' must be positive.")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.block = block
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> None:
+        """Wait until a request for `key` is allowed."""
+        delay = self._reserve(key)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, key: str) -> None:
+        """Wait asynchronously until a request for `key` is allowed."""
+        delay = self._reserve(key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reserve(self, key: str) -> float:
+        # take a token from the bucket and return how long to wait for it,
+        # waiting requests reserve their token so the bucket can become negative
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1 and not self.block:
+                self._buckets[key] = (tokens, now)
+                raise GotifyRateLimitError(
+                    f"Rate limit of {self.rate} requests per second exceeded."
+                )
+            self._buckets[key] = (tokens - 1, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
@@ -0,0 +1,117 @@
+"""Retry requests that failed because of transient errors."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Collection
+
+from .backoff import exponential_backoff
+
+if TYPE_CHECKING:
+    import httpx
+
+__all__ = ["RetryPolicy"]
+
+IDEMPOTENT_METHODS = frozenset({"get", "head", "options", "put", "delete"})
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request is sent again."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Collection[int] = (429, 502, 503, 504),
+        retry_exceptions: tuple[type[BaseException], ...] | None = None,
+        retry_methods: Collection[str] | None = IDEMPOTENT_METHODS,
+        deadline: float | None = None,
+    ) -> None:
+        """Initialise the retry policy.
+
+        Args:
+            max_attempts (int, optional): maximum number of attempts including
+                the first one.
+
+            backoff_base (float, optional): delay in seconds before the first
+                retry which is doubled after every further attempt.
+
+            backoff_max (float, optional): maximum delay between attempts.
+
+            jitter (bool, optional): randomize the delay between attempts.
+
+            retry_statuses (collection of int, optional): response status codes
+                that are retried.
+
+            retry_exceptions (tuple of exception types, optional): exceptions
+                that are retried. By default `httpx.TransportError`, i.e.
+                connection errors and timeouts.
+
+            retry_methods (collection of str, optional): HTTP methods that are
+                retried. By default only idempotent methods are retried, so a
+                message is never created twice. `None` retries all methods.
+
+            deadline (float, optional): maximum time in seconds from the first
+                attempt after which no further attempt is started.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.retry_methods = (
+            None
+            if retry_methods is None
+            else frozenset(method.lower() for method in retry_methods)
+        )
+        self.deadline = deadline
+
+    def get_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        response: httpx.Response | None = None,
+        exception: BaseException | None = None,
+    ) -> float | None:
+        """Return the delay before the next attempt or `None` to give up.
+
+        Args:
+            method (str): HTTP method of the request.
+
+            attempt (int): number of attempts so far.
+
+            elapsed (float): seconds since the first attempt was started.
+
+            response (httpx.Response, optional): the unsuccessful response.
+
+            exception (BaseException, optional): the raised exception.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if self.retry_methods is not None and method.lower() not in self.retry_methods:
+            return None
+        if response is not None and response.status_code not in self.retry_statuses:
+            return None
+        if exception is not None:
+            retry_exceptions = self.retry_exceptions
+            if retry_exceptions is None:
+                import httpx
+
+                retry_exceptions = (httpx.TransportError,)
+            if not isinstance(exception, retry_exceptions):
+                return None
+
+        delay = exponential_backoff(
+            attempt - 1, self.backoff_base, self.backoff_max, self.jitter
+        )
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(self.backoff_max, max(delay, float(retry_after)))
+
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
@@ -0,0 +1,133 @@
+"""Persist messages that couldn't be delivered to the gotify server."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Iterator
+
+from .errors import GotifyCircuitOpenError, GotifyError
+
+__all__ = ["Spool"]
+
+
+def is_spoolable(exc: BaseException) -> bool:
+    """Return whether sending a message might succeed later after `exc`."""
+    import httpx
+
+    if isinstance(exc, GotifyError):
+        return exc.response.is_server_error
+    return isinstance(exc, (httpx.TransportError, GotifyCircuitOpenError))
+
+
+class Spool:
+    """Append-only journal of unsent messages stored in an SQLite database.
+
+    A spool is meant to be used by a single process. Pass it to `Gotify` or
+    `AsyncGotify` to persist messages that can't be delivered because the server
+    is unreachable and to send them again in the original order.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_messages: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Open or create a spool.
+
+        Args:
+            path (str or path-like): path of the database file.
+
+            max_messages (int, optional): maximum number of stored messages,
+                the oldest ones are discarded if it is exceeded.
+
+            max_bytes (int, optional): maximum total size of the stored message
+                payloads, the oldest ones are discarded if it is exceeded.
+        """
+        self.path = path
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "payload TEXT NOT NULL, "
+                "size INTEGER NOT NULL)"
+            )
+        self._count, self._size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM messages"
+        ).fetchone()
+
+    def __len__(self) -> int:
+        """Return the number of stored messages."""
+        return self._count
+
+    def __iter__(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Iterate over the keys and payloads of all messages, oldest first."""
+        last_key = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, payload FROM messages WHERE id > ? ORDER BY id LIMIT 100",
+                    (last_key,),
+                ).fetchall()
+            if not rows:
+                return
+            for last_key, payload in rows:
+                yield last_key, json.loads(payload)
+
+    def append(self, payload: dict[str, Any]) -> None:
+        """Store a message payload."""
+        data = json.dumps(payload)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO messages (payload, size) VALUES (?, ?)",
+                (data, len(data)),
+            )
+            self._count += 1
+            self._size += len(data)
+            self._enforce_limits()
+
+    def remove(self, key: int) -> None:
+        """Remove a message after it has been delivered.
+
+        The database is compacted when the last message is removed.
+        """
+        with self._lock:
+            with self._db:
+                self._delete(key)
+            if not self._count:
+                self._db.execute("VACUUM")
+
+    def compact(self) -> None:
+        """Free the disk space of removed messages."""
+        with self._lock:
+            self._db.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def _delete(self, key: int) -> None:
+        row = self._db.execute(
+            "SELECT size FROM messages WHERE id = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM messages WHERE id = ?", (key,))
+            self._count -= 1
+            self._size -= row[0]
+
+    def _enforce_limits(self) -> None:
+        # discard the oldest messages
+        while self._count and (
+            (self.max_messages is not None and self._count > self.max_messages)
+            or (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            (key,) = self._db.execute("SELECT MIN(id) FROM messages").fetchone()
+            self._delete(key)
@@ -38,3 +38,9 @@ def test(session: nox.Session):
         "--cov-report=xml",
         "--cov-report=term",
     )
+
+
+@nox.session
+def benchmark(session: nox.Session):
+    session.install(".[stream]")
+    session.run("python", "benchmarks/bench.py", *session.posargs)
@@ -1,13 +1,194 @@
+import hashlib
+import json
 import platform
+import re
 import shutil
 import subprocess
+from datetime import datetime, timezone
 from io import BytesIO
 from pathlib import Path
 from time import sleep
+from typing import Any, Callable, Optional
 
 import httpx
 import pytest
 
+from gotify import Gotify
+
+BASE_URL = "http://gotify.example.com"
+APP_TOKEN = "AWH0wZ5r0Mbac.r"
+CLIENT_TOKEN = "C4er8DTiNk08mtt"
+
+_APPLICATION_RE = re.compile(r"/application/(\d+)(/image|/message)?")
+_MESSAGE_RE = re.compile(r"/message/(\d+)")
+
+
+class FakeGotify:
+    """In-memory gotify server for `httpx.MockTransport`.
+
+    Supports applications, uploading their images and paged messages. Every
+    request is recorded in `requests` as `(method, path)`, created messages in
+    `created` as `(token, data)`. `errors` maps `(method, path)` to the status
+    code of an error response. `intercept` is called with every request and
+    can return a response instead of the fake server.
+    """
+
+    base_url = BASE_URL
+
+    def __init__(self) -> None:
+        self.applications: dict[int, dict[str, Any]] = {}
+        self.messages: dict[int, dict[str, Any]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.created: list[tuple[str, dict[str, Any]]] = []
+        self.deleted: list[int] = []
+        self.uploads: list[tuple[int, str]] = []
+        self.errors: dict[tuple[str, str], int] = {}
+        self.intercept: Optional[
+            Callable[[httpx.Request], Optional[httpx.Response]]
+        ] = None
+
+    def add_application(self, name: str, **fields: Any) -> dict[str, Any]:
+        id = max(self.applications, default=0) + 1
+        self.applications[id] = {
+            "id": id,
+            "name": name,
+            "token": f"AppToken{id}",
+            "image": "static/defaultapp.png",
+            **fields,
+        }
+        return self.applications[id]
+
+    def add_messages(self, messages: Any) -> None:
+        self.messages.update((msg["id"], msg) for msg in messages)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        method, path = request.method, request.url.path
+        self.requests.append((method, path))
+        if self.intercept is not None:
+            response = self.intercept(request)
+            if response is not None:
+                return response
+        if (method, path) in self.errors:
+            return self._error(self.errors[method, path])
+        if path == "/application":
+            if method == "POST":
+                data = json.loads(request.content)
+                name = data.pop("name")
+                return httpx.Response(200, json=self.add_application(name, **data))
+            return httpx.Response(200, json=list(self.applications.values()))
+        if path == "/message":
+            if method == "POST":
+                return self._create_message(request)
+            if method == "DELETE":
+                self.messages.clear()
+                return httpx.Response(200)
+            return self._page(request)
+        match = _APPLICATION_RE.fullmatch(path)
+        if match is not None:
+            id = int(match[1])
+            if id not in self.applications:
+                return self._error(404)
+            if match[2] == "/image":
+                return self._upload_image(id, request)
+            if match[2] == "/message":
+                if method == "DELETE":
+                    for msg in [m for m in self.messages.values() if m["appid"] == id]:
+                        del self.messages[msg["id"]]
+                    return httpx.Response(200)
+                return self._page(request, id)
+            if method == "DELETE":
+                del self.applications[id]
+                return httpx.Response(200)
+            return httpx.Response(200, json=self.applications[id])
+        match = _MESSAGE_RE.fullmatch(path)
+        if match is not None:
+            if self.messages.pop(int(match[1]), None) is None:
+                return self._error(404)
+            self.deleted.append(int(match[1]))
+            return httpx.Response(200)
+        return self._error(404)
+
+    def _error(self, status_code: int) -> httpx.Response:
+        return httpx.Response(
+            status_code,
+            json={
+                "error": httpx.codes.get_reason_phrase(status_code),
+                "errorCode": status_code,
+                "errorDescription": "",
+            },
+        )
+
+    def _page(
+        self, request: httpx.Request, app_id: Optional[int] = None
+    ) -> httpx.Response:
+        limit = int(request.url.params.get("limit", 100))
+        since = int(request.url.params.get("since", 0))
+        messages = sorted(
+            (
+                msg
+                for msg in self.messages.values()
+                if (not since or msg["id"] < since)
+                and (app_id is None or msg["appid"] == app_id)
+            ),
+            key=lambda msg: -msg["id"],
+        )
+        page = messages[:limit]
+        paging: dict[str, Any] = {"size": len(page), "limit": limit, "since": 0}
+        if len(messages) > limit:
+            paging["since"] = page[-1]["id"]
+            paging["next"] = (
+                f"{self.base_url}{request.url.path}"
+                f"?limit={limit}&since={page[-1]['id']}"
+            )
+        return httpx.Response(200, json={"messages": page, "paging": paging})
+
+    def _create_message(self, request: httpx.Request) -> httpx.Response:
+        token = request.headers["X-Gotify-Key"]
+        data = json.loads(request.content)
+        self.created.append((token, data))
+        app_id = next(
+            (app["id"] for app in self.applications.values() if app["token"] == token),
+            0,
+        )
+        msg = {
+            "id": max(self.messages, default=0) + 1,
+            "appid": app_id,
+            "date": datetime.now(timezone.utc).isoformat(),
+            **data,
+        }
+        self.messages[msg["id"]] = msg
+        return httpx.Response(200, json=msg)
+
+    def _upload_image(self, id: int, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        filename = re.search(rb'filename="([^"]+)"', body)
+        assert filename is not None
+        self.uploads.append((id, filename[1].decode()))
+        digest = hashlib.sha256(body).hexdigest()[:8]
+        self.applications[id]["image"] = f"image/{digest}.png"
+        return httpx.Response(200, json=self.applications[id])
+
+
+@pytest.fixture
+def fake_gotify():
+    return FakeGotify()
+
+
+@pytest.fixture
+def make_client(fake_gotify):
+    """Create a `Gotify` or `AsyncGotify` client sending requests to a handler.
+
+    By default, requests are handled by `fake_gotify`.
+    """
+
+    def make(cls=Gotify, handler=None, base_url=BASE_URL, **kwargs):
+        kwargs.setdefault("app_token", APP_TOKEN)
+        kwargs.setdefault("client_token", CLIENT_TOKEN)
+        transport = httpx.MockTransport(handler or fake_gotify.handler)
+        return cls(base_url, transport=transport, **kwargs)
+
+    return make
+
 
 @pytest.fixture(scope="module")
 def run_test_server():
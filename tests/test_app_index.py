@@ -0,0 +1,98 @@
+import pytest
+
+from gotify import ApplicationIndex, AsyncGotify, ResponseCache
+
+APPLICATIONS = [
+    {"id": 1, "name": "Backup", "token": "AaaaaaaaaaaaaaA"},
+    {"id": 2, "name": "Monitoring", "token": "AbbbbbbbbbbbbbA"},
+    {"id": 3, "name": "Monitoring", "token": "AcccccccccccccA"},
+]
+
+
+@pytest.fixture
+def server(fake_gotify):
+    for app in APPLICATIONS:
+        fake_gotify.add_application(app["name"], token=app["token"])
+    return fake_gotify
+
+
+def test_application_index():
+    index = ApplicationIndex()
+    assert not index.loaded
+    index.replace(APPLICATIONS)
+    assert index.loaded
+    assert len(index) == 3
+    assert index.by_id(1)["name"] == "Backup"
+    assert [app["id"] for app in index.by_name("Monitoring")] == [2, 3]
+    assert index.by_token("AcccccccccccccA")["id"] == 3
+
+    index.update({"id": 2, "name": "Metrics", "token": "AbbbbbbbbbbbbbA"})
+    assert [app["id"] for app in index.by_name("Monitoring")] == [3]
+    assert index.by_name("Metrics")[0]["id"] == 2
+
+    index.remove(3)
+    assert index.by_name("Monitoring") == []
+    assert index.by_token("AcccccccccccccA") is None
+    assert len(index) == 2
+
+
+def test_gotify_application_lookup(server, make_client):
+    gf = make_client()
+
+    assert gf.get_application_by_name("Backup")["id"] == 1
+    assert gf.get_application_by_token("AbbbbbbbbbbbbbA")["id"] == 2
+    with pytest.raises(ValueError):
+        gf.get_application_by_name("Monitoring")
+    assert server.requests == [("GET", "/application")]
+
+    gf.create_application("Deploy")
+    gf.get_messages(app_id="Deploy")
+    gf.delete_messages(app_id="Backup")
+    assert server.requests[1:] == [
+        ("POST", "/application"),
+        ("GET", "/application/4/message"),
+        ("DELETE", "/application/1/message"),
+    ]
+
+    gf.delete_application(1)
+    with pytest.raises(KeyError):
+        gf.get_application_by_name("Unknown")
+    assert server.requests[-1] == ("GET", "/application")
+
+
+async def test_async_gotify_application_lookup(server, make_client):
+    agf = make_client(AsyncGotify)
+
+    assert (await agf.get_application_by_name("Backup"))["id"] == 1
+    assert (await agf.get_application_by_token("AbbbbbbbbbbbbbA"))["id"] == 2
+    with pytest.raises(ValueError):
+        await agf.get_application_by_name("Monitoring")
+
+    await agf.get_messages(app_id="Backup")
+    assert server.requests == [
+        ("GET", "/application"),
+        ("GET", "/application/1/message"),
+    ]
+    with pytest.raises(KeyError):
+        await agf.get_application_by_token("unknown")
+
+
+def test_gotify_application_lookup_with_cache(server, make_client):
+    gf = make_client(cache=ResponseCache())
+    gf.get_applications()
+    # created by another client, the cached response doesn't contain it
+    server.add_application("New", token="AeeeeeeeeeeeeeA")
+    assert gf.get_applications()[-1]["id"] == 3
+
+    assert gf.get_application_by_name("New")["id"] == 4
+    assert gf.get_applications()[-1]["id"] == 4
+    assert server.requests == [("GET", "/application")] * 2
+
+
+async def test_async_gotify_application_lookup_with_cache(server, make_client):
+    agf = make_client(AsyncGotify, cache=ResponseCache())
+    await agf.get_applications()
+    server.add_application("New", token="AeeeeeeeeeeeeeA")
+
+    assert (await agf.get_application_by_token("AeeeeeeeeeeeeeA"))["id"] == 4
+    assert server.requests == [("GET", "/application")] * 2
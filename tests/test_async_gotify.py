@@ -6,7 +6,7 @@ from typing import Any, List
 import pytest
 from typeguard import check_type
 
-from gotify import AsyncGotify, GotifyConfigurationError, GotifyError
+from gotify import AsyncGotify, GotifyConfigurationError, GotifyError, Observer
 from gotify.response_types import (
     Application,
     Client,
@@ -123,6 +123,36 @@ class TestAsyncGotify:
 
         self.data["msg-id"] = r1["id"]
 
+    async def test_create_messages(self):
+        r1 = await agf.create_messages(
+            ["BulkMessage1", "", {"message": "BulkMessage3", "priority": 2}],
+            concurrency=2,
+        )
+        assert len(r1) == 3
+        check_type(r1[0], Message)
+        assert r1[0]["message"] == "BulkMessage1"
+        assert isinstance(r1[1], GotifyError)
+        assert "Bad Request" in str(r1[1])
+        check_type(r1[2], Message)
+        assert r1[2]["priority"] == 2
+
+        async def messages():
+            for i in range(10):
+                yield f"BulkMessage-{i}"
+
+        r2 = await agf.create_messages(messages(), concurrency=4)
+        assert [msg["message"] for msg in r2] == [f"BulkMessage-{i}" for i in range(10)]
+
+    async def test_iter_messages(self):
+        expected = (await agf.get_messages(limit=200))["messages"]
+        assert len(expected) > 3
+
+        r1 = [msg async for msg in agf.iter_messages(page_size=3)]
+        assert r1 == expected
+
+        r2 = [msg async for msg in agf.iter_messages(page_size=3, prefetch=True)]
+        assert r2 == expected
+
     async def test_delete_message(self):
         r = await agf.delete_message(self.data["msg-id"])
         assert r is None
@@ -240,6 +270,18 @@ class TestAsyncGotify:
         r = await agf.get_version()
         check_type(r, VersionInfo)
 
+    async def test_persistent_http_client(self):
+        await agf.get_health()
+        http_client = agf.http_client
+        assert http_client is not None
+
+        await agf.get_version()
+        assert agf.http_client is http_client
+
+        await agf.aclose()
+        assert agf.http_client is None
+        assert http_client.is_closed
+
     async def test_stream(self):
         n = 5
 
@@ -263,3 +305,33 @@ class TestAsyncGotify:
             await agen.aclose()
 
         await asyncio.gather(recv(), send())
+
+    async def test_stream_reconnect(self):
+        n = 5
+
+        connected = asyncio.Event()
+
+        class ConnectObserver(Observer):
+            def on_stream_connect(self, url):
+                connected.set()
+
+        async def send():
+            # messages sent before the stream connected count as seen
+            await asyncio.wait_for(connected.wait(), 10)
+            async with AsyncGotify(BASE_URL, app_token=APP_TOKEN) as app_gf:
+                for i in range(n):
+                    await app_gf.create_message(f"reconnect-msg-{i}")
+
+        async def recv():
+            client_gf = AsyncGotify(
+                BASE_URL, client_token=CLIENT_TOKEN, observers=[ConnectObserver()]
+            )
+            i = 0
+            async for msg in (agen := client_gf.stream(reconnect=True)):
+                assert msg["message"] == f"reconnect-msg-{i}"
+                if i == n - 1:
+                    break
+                i += 1
+            await agen.aclose()
+
+        await asyncio.gather(recv(), send())
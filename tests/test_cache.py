@@ -0,0 +1,66 @@
+import time
+
+from gotify import AsyncGotify, ResponseCache
+
+
+def test_cache():
+    cache = ResponseCache(ttl={"/application": 0.05}, maxsize=2)
+    cache.set("/application", "key1", [{"id": 1}])
+    cache.set("/message", "key2", {"messages": []})
+    assert len(cache) == 1
+
+    found, value = cache.get("/application", "key1")
+    assert found
+    assert value == [{"id": 1}]
+    value.append({"id": 2})
+    assert cache.get("/application", "key1") == (True, [{"id": 1}])
+
+    cache.invalidate("/application/1/image")
+    assert cache.get("/application", "key1") == (False, None)
+
+    cache.set("/application", "key1", [])
+    time.sleep(0.05)
+    assert cache.get("/application", "key1") == (False, None)
+
+
+def test_cache_lru():
+    cache = ResponseCache(ttl=60, maxsize=2)
+    cache.set("/application", "key1", 1)
+    cache.set("/client", "key2", 2)
+    cache.get("/application", "key1")
+    cache.set("/user", "key3", 3)
+    assert cache.get("/application", "key1") == (True, 1)
+    assert cache.get("/client", "key2") == (False, None)
+    assert cache.get("/user", "key3") == (True, 3)
+
+
+def test_gotify_cache(fake_gotify, make_client):
+    server = fake_gotify
+    gf = make_client(cache=ResponseCache())
+
+    assert gf.get_applications() == []
+    assert gf.get_applications() == []
+    gf.get_messages()
+    gf.get_messages()
+    assert server.requests == [
+        ("GET", "/application"),
+        ("GET", "/message"),
+        ("GET", "/message"),
+    ]
+
+    gf.create_application("TestApplication")
+    assert len(gf.get_applications()) == 1
+    assert server.requests[-2:] == [("POST", "/application"), ("GET", "/application")]
+
+
+async def test_async_gotify_cache(fake_gotify, make_client):
+    server = fake_gotify
+    agf = make_client(AsyncGotify, cache=ResponseCache())
+
+    assert await agf.get_applications() == []
+    assert await agf.get_applications() == []
+    assert len(server.requests) == 1
+
+    await agf.create_application("TestApplication")
+    assert len(await agf.get_applications()) == 1
+    assert len(server.requests) == 3
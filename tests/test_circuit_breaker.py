@@ -0,0 +1,88 @@
+import time
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, CircuitBreaker, GotifyCircuitOpenError
+
+
+class Server:
+    def __init__(self):
+        self.up = False
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        if not self.up:
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"health": "green", "database": "green"})
+        return httpx.Response(200, json={"version": "2.4.0"})
+
+
+def test_state_transitions():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    assert breaker.before_request() is False
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(GotifyCircuitOpenError):
+        breaker.before_request()
+
+    time.sleep(0.05)
+    assert breaker.state == "half-open"
+    assert breaker.before_request() is True
+    with pytest.raises(GotifyCircuitOpenError):
+        breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.05)
+    assert breaker.before_request() is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_gotify_circuit_breaker(make_client):
+    server = Server()
+    gf = make_client(
+        handler=server.handler,
+        circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=0.05),
+    )
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            gf.get_version()
+    with pytest.raises(GotifyCircuitOpenError):
+        gf.get_version()
+    assert len(server.requests) == 2
+
+    server.up = True
+    time.sleep(0.05)
+    assert gf.get_version()["version"] == "2.4.0"
+    assert gf.circuit_breaker.state == "closed"
+
+
+async def test_async_gotify_circuit_breaker_health_probe(make_client):
+    server = Server()
+    agf = make_client(
+        AsyncGotify,
+        handler=server.handler,
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=1, recovery_timeout=0.05, probe_health=True
+        ),
+    )
+    with pytest.raises(httpx.ConnectError):
+        await agf.get_version()
+    with pytest.raises(GotifyCircuitOpenError):
+        await agf.get_version()
+
+    time.sleep(0.05)
+    with pytest.raises(GotifyCircuitOpenError):
+        await agf.get_version()
+    assert server.requests == ["/version", "/health"]
+
+    server.up = True
+    time.sleep(0.05)
+    assert (await agf.get_version())["version"] == "2.4.0"
+    assert server.requests[-2:] == ["/health", "/version"]
@@ -0,0 +1,181 @@
+import time
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, EndpointPool, GotifyError, RetryPolicy
+
+URLS = ["http://a.example.com", "http://b.example.com", "http://c.example.com"]
+
+
+class FakeReplicas:
+    def __init__(self, down=(), unhealthy=()):
+        self.down = set(down)
+        self.unhealthy = set(unhealthy)
+        self.hosts = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.hosts.append(host)
+        if host in self.down:
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path == "/health":
+            health = "red" if host in self.unhealthy else "green"
+            return httpx.Response(200, json={"health": health, "database": health})
+        return httpx.Response(200, json={"version": "2.4.0", "host": host})
+
+
+def test_endpoint_pool_priority():
+    pool = EndpointPool(URLS)
+    assert pool.select() == URLS[0]
+    pool.record_failure(URLS[0])
+    assert pool.select() == URLS[1]
+    assert pool.healthy() == URLS[1:]
+
+
+def test_endpoint_pool_round_robin():
+    pool = EndpointPool(URLS, strategy="round-robin")
+    assert [pool.select() for _ in range(4)] == URLS + URLS[:1]
+
+
+def test_endpoint_pool_least_latency():
+    pool = EndpointPool(URLS, strategy="least-latency", smoothing=0.5)
+    pool.record_success(URLS[0], 0.3)
+    pool.record_success(URLS[1], 0.1)
+    pool.record_success(URLS[2], 0.2)
+    assert pool.select() == URLS[1]
+    pool.record_success(URLS[1], 0.5)
+    assert pool.latency(URLS[1]) == pytest.approx(0.3)
+    assert pool.select() == URLS[2]
+
+
+def test_endpoint_pool_readmission():
+    pool = EndpointPool(URLS[:2], failure_threshold=2, recovery_timeout=0.05)
+    pool.record_failure(URLS[0])
+    assert pool.select() == URLS[0]
+    pool.record_failure(URLS[0])
+    assert pool.select() == URLS[1]
+    assert not pool.is_recovering(URLS[0])
+    time.sleep(0.05)
+    assert pool.is_recovering(URLS[0])
+    assert pool.select() == URLS[0]
+    # a failure while recovering ejects the endpoint again
+    pool.record_failure(URLS[0])
+    assert pool.select() == URLS[1]
+    time.sleep(0.05)
+    pool.record_success(URLS[0])
+    assert pool.healthy() == URLS[:2]
+
+
+def test_endpoint_pool_all_ejected():
+    pool = EndpointPool(URLS[:2])
+    pool.record_failure(URLS[1])
+    pool.record_failure(URLS[0])
+    assert pool.select() == URLS[1]
+
+
+def test_endpoint_pool_exclude():
+    pool = EndpointPool(URLS, strategy="least-latency")
+    assert pool.select(exclude={URLS[0]}) == URLS[1]
+    assert pool.select(exclude=URLS[1:]) == URLS[0]
+    # all endpoints are excluded
+    assert pool.select(exclude=URLS) == URLS[0]
+
+
+def test_endpoint_pool_invalid():
+    with pytest.raises(ValueError):
+        EndpointPool([])
+    with pytest.raises(ValueError):
+        EndpointPool(URLS, strategy="random")
+
+
+def test_gotify_failover(make_client):
+    replicas = FakeReplicas(down={"a.example.com"})
+    gotify = make_client(base_url=URLS, handler=replicas.handler)
+    assert gotify.base_url == URLS[0]
+    assert gotify.get_version()["host"] == "b.example.com"
+    assert gotify.get_version()["host"] == "b.example.com"
+    assert replicas.hosts == ["a.example.com", "b.example.com", "b.example.com"]
+    assert gotify.endpoints is not None
+    assert gotify.endpoints.healthy() == URLS[1:]
+
+
+@pytest.mark.parametrize("strategy", ["priority", "round-robin", "least-latency"])
+def test_gotify_failover_below_failure_threshold(strategy, make_client):
+    replicas = FakeReplicas(down={"a.example.com"})
+    pool = EndpointPool(URLS[:2], strategy=strategy, failure_threshold=3)
+    gotify = make_client(base_url=pool, handler=replicas.handler)
+    assert gotify.get_version()["host"] == "b.example.com"
+    assert replicas.hosts == ["a.example.com", "b.example.com"]
+    # the endpoint isn't ejected yet
+    assert pool.healthy() == URLS[:2]
+
+
+def test_gotify_failover_all_down(make_client):
+    replicas = FakeReplicas(down={"a.example.com", "b.example.com"})
+    gotify = make_client(base_url=URLS[:2], handler=replicas.handler)
+    with pytest.raises(httpx.ConnectError):
+        gotify.get_version()
+    assert replicas.hosts == ["a.example.com", "b.example.com"]
+
+
+def test_gotify_failover_service_unavailable(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "a.example.com":
+            return httpx.Response(503, json={"error": "Service Unavailable"})
+        return httpx.Response(200, json={"version": "2.4.0"})
+
+    gotify = make_client(base_url=URLS, handler=handler)
+    assert gotify.get_version() == {"version": "2.4.0"}
+
+
+def test_gotify_failover_server_error_uses_retry_policy(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "a.example.com":
+            return httpx.Response(500, json={"error": "Internal Server Error"})
+        return httpx.Response(200, json={"version": "2.4.0"})
+
+    gotify = make_client(base_url=URLS, handler=handler)
+    with pytest.raises(GotifyError):
+        gotify.get_version()
+    gotify.retry = RetryPolicy(backoff_base=0, retry_statuses=(500,))
+    assert gotify.get_version() == {"version": "2.4.0"}
+
+
+def test_gotify_probe_health(make_client):
+    replicas = FakeReplicas(unhealthy={"a.example.com"})
+    pool = EndpointPool(URLS[:2], recovery_timeout=0.05, probe_health=True)
+    gotify = make_client(base_url=pool, handler=replicas.handler)
+    pool.eject(URLS[0])
+    time.sleep(0.05)
+    assert gotify.get_version()["host"] == "b.example.com"
+    assert replicas.hosts == ["a.example.com", "b.example.com"]
+    replicas.unhealthy.clear()
+    time.sleep(0.05)
+    assert gotify.get_version()["host"] == "a.example.com"
+
+
+def test_gotify_check_endpoints(make_client):
+    replicas = FakeReplicas(down={"a.example.com"}, unhealthy={"c.example.com"})
+    gotify = make_client(base_url=URLS, handler=replicas.handler)
+    assert gotify.check_endpoints() == dict(zip(URLS, [False, True, False]))
+    assert gotify.endpoints is not None
+    assert gotify.endpoints.healthy() == URLS[1:2]
+
+
+async def test_async_gotify_failover(make_client):
+    replicas = FakeReplicas(down={"a.example.com"})
+    pool = EndpointPool(URLS, strategy="round-robin")
+    gotify = make_client(AsyncGotify, base_url=pool, handler=replicas.handler)
+    hosts = [(await gotify.get_version())["host"] for _ in range(4)]
+    assert hosts == ["b.example.com", "c.example.com"] * 2
+    assert await gotify.check_endpoints() == dict(zip(URLS, [False, True, True]))
+
+
+@pytest.mark.parametrize("strategy", ["priority", "round-robin", "least-latency"])
+async def test_async_gotify_failover_below_failure_threshold(strategy, make_client):
+    replicas = FakeReplicas(down={"a.example.com"})
+    pool = EndpointPool(URLS[:2], strategy=strategy, failure_threshold=3)
+    gotify = make_client(AsyncGotify, base_url=pool, handler=replicas.handler)
+    assert (await gotify.get_version())["host"] == "b.example.com"
+    assert replicas.hosts == ["a.example.com", "b.example.com"]
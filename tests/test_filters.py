@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from gotify import AsyncGotify, GotifyError
+from gotify.filters import message_filter
+
+NOW = datetime.now(timezone.utc)
+
+
+def message(id, priority=None, days=0, appid=1):
+    return {
+        "id": id,
+        "appid": appid,
+        "message": f"Backup #{id}",
+        "priority": priority,
+        "date": (NOW - timedelta(days=days)).isoformat(),
+    }
+
+
+def pages(server):
+    return sum(method == "GET" for method, _ in server.requests)
+
+
+def test_message_filter():
+    msg = message(1, priority=2, days=10)
+    assert message_filter(priority_below=3)(msg)
+    assert not message_filter(priority_below=2)(msg)
+    assert message_filter(priority_below=1)(message(2))
+    assert message_filter(older_than=timedelta(days=5))(msg)
+    assert not message_filter(older_than=timedelta(days=11))(msg)
+    assert message_filter(older_than=datetime.now() - timedelta(days=5))(msg)
+    assert message_filter(ids=[1, 2])(msg)
+    assert not message_filter(ids=[2], priority_below=3)(msg)
+    assert message_filter(lambda msg: "Backup" in msg["message"])(msg)
+    with pytest.raises(ValueError):
+        message_filter()
+
+
+def test_delete_messages_where(fake_gotify, make_client):
+    messages = [message(id, priority=id % 5, days=id) for id in range(1, 101)]
+    fake_gotify.add_messages(messages)
+    gotify = make_client()
+    progress = []
+    deleted = gotify.delete_messages_where(
+        older_than=timedelta(days=50, hours=12),
+        priority_below=2,
+        page_size=10,
+        max_workers=3,
+        progress=lambda checked, deleted: progress.append((checked, deleted)),
+    )
+    expected = [id for id in range(51, 101) if id % 5 < 2]
+    assert deleted == len(expected)
+    assert sorted(fake_gotify.deleted) == expected
+    assert pages(fake_gotify) == 10
+    assert progress[-1] == (100, deleted)
+    assert progress == sorted(progress)
+
+
+def test_delete_messages_where_ids(fake_gotify, make_client):
+    fake_gotify.add_messages([message(id) for id in range(1, 11)])
+    gotify = make_client()
+    # only ids: no messages are requested and missing ones are skipped
+    assert gotify.delete_messages_where(ids=[3, 4, 42]) == 2
+    assert pages(fake_gotify) == 0
+    assert sorted(fake_gotify.deleted) == [3, 4]
+
+
+def test_delete_messages_where_app(fake_gotify, make_client):
+    fake_gotify.add_application("backup")
+    fake_gotify.add_application("ci")
+    messages = [message(id, appid=id % 2 + 1) for id in range(1, 11)]
+    fake_gotify.add_messages(messages)
+    gotify = make_client()
+    assert gotify.delete_messages_where(lambda msg: msg["id"] > 4, app_id=2) == 3
+    assert sorted(fake_gotify.deleted) == [5, 7, 9]
+
+
+def test_delete_messages_where_error(fake_gotify, make_client):
+    fake_gotify.add_messages([message(id) for id in range(1, 11)])
+    fake_gotify.errors["DELETE", "/message/5"] = 500
+    gotify = make_client()
+    with pytest.raises(GotifyError):
+        gotify.delete_messages_where(lambda msg: True, max_workers=1)
+
+
+async def test_async_delete_messages_where(fake_gotify, make_client):
+    messages = [message(id, priority=id % 5, days=id) for id in range(1, 101)]
+    fake_gotify.add_messages(messages)
+    gotify = make_client(AsyncGotify)
+    progress = []
+    deleted = await gotify.delete_messages_where(
+        older_than=NOW - timedelta(days=50, hours=12),
+        priority_below=2,
+        page_size=10,
+        concurrency=3,
+        progress=lambda checked, deleted: progress.append((checked, deleted)),
+    )
+    expected = [id for id in range(51, 101) if id % 5 < 2]
+    assert deleted == len(expected)
+    assert sorted(fake_gotify.deleted) == expected
+    assert progress[-1][1] == deleted
+
+    assert await gotify.delete_messages_where(ids=[1, 51]) == 1
+
+
+async def test_async_delete_messages_where_error(fake_gotify, make_client):
+    fake_gotify.add_messages([message(id) for id in range(1, 11)])
+    fake_gotify.errors["DELETE", "/message/5"] = 500
+    gotify = make_client(AsyncGotify)
+    with pytest.raises(GotifyError):
+        await gotify.delete_messages_where(lambda msg: True, concurrency=2)
+    assert 5 not in fake_gotify.deleted
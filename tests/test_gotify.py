@@ -1,3 +1,4 @@
+import threading
 from copy import deepcopy
 from pathlib import Path
 from typing import Any, List
@@ -5,7 +6,7 @@ from typing import Any, List
 import pytest
 from typeguard import check_type
 
-from gotify import Gotify, GotifyConfigurationError, GotifyError
+from gotify import Gotify, GotifyConfigurationError, GotifyError, Observer
 from gotify.response_types import (
     Application,
     Client,
@@ -120,6 +121,34 @@ class TestGotify:
 
         self.data["msg-id"] = r1["id"]
 
+    def test_create_messages(self):
+        r1 = gf.create_messages(
+            ["BulkMessage1", "", {"message": "BulkMessage3", "priority": 2}],
+            max_workers=2,
+        )
+        assert len(r1) == 3
+        check_type(r1[0], Message)
+        assert r1[0]["message"] == "BulkMessage1"
+        assert isinstance(r1[1], GotifyError)
+        assert "Bad Request" in str(r1[1])
+        check_type(r1[2], Message)
+        assert r1[2]["priority"] == 2
+
+        r2 = gf.create_messages(
+            (f"BulkMessage-{i}" for i in range(10)), max_workers=4, timeout=30
+        )
+        assert [msg["message"] for msg in r2] == [f"BulkMessage-{i}" for i in range(10)]
+
+    def test_iter_messages(self):
+        expected = gf.get_messages(limit=200)["messages"]
+        assert len(expected) > 3
+
+        r1 = list(gf.iter_messages(page_size=3))
+        assert r1 == expected
+
+        r2 = list(gf.iter_messages(page_size=3, prefetch=True))
+        assert r2 == expected
+
     def test_delete_message(self):
         r = gf.delete_message(self.data["msg-id"])
         assert r is None
@@ -236,3 +265,44 @@ class TestGotify:
     def test_get_version(self):
         r = gf.get_version()
         check_type(r, VersionInfo)
+
+    def test_persistent_http_client(self):
+        gf.get_health()
+        http_client = gf.http_client
+        assert http_client is not None
+
+        gf.get_version()
+        assert gf.http_client is http_client
+
+        gf.close()
+        assert gf.http_client is None
+        assert http_client.is_closed
+
+    def test_stream(self):
+        n = 5
+
+        connected = threading.Event()
+
+        class ConnectObserver(Observer):
+            def on_stream_connect(self, url):
+                connected.set()
+
+        def send():
+            # messages sent before the stream connected count as seen
+            assert connected.wait(10)
+            with Gotify(BASE_URL, app_token=APP_TOKEN) as app_gf:
+                for i in range(n):
+                    app_gf.create_message(f"sync-msg-{i}")
+
+        client_gf = Gotify(
+            BASE_URL, client_token=CLIENT_TOKEN, observers=[ConnectObserver()]
+        )
+        gen = client_gf.stream(reconnect=True)
+        sender = threading.Thread(target=send)
+        sender.start()
+        for i, msg in enumerate(gen):
+            assert msg["message"] == f"sync-msg-{i}"
+            if i == n - 1:
+                break
+        gen.close()
+        sender.join()
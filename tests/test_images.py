@@ -0,0 +1,124 @@
+import hashlib
+import json
+
+import pytest
+
+from gotify import AsyncGotify, GotifyError, ImageManifest
+from gotify.images import file_digest
+
+
+@pytest.fixture
+def server(fake_gotify):
+    for name in ("backup", "monitoring", "ci"):
+        fake_gotify.add_application(name)
+    return fake_gotify
+
+
+@pytest.fixture
+def images(tmp_path):
+    paths = {}
+    for name in ("backup", "monitoring"):
+        paths[name] = tmp_path / f"{name}.png"
+        paths[name].write_bytes(name.encode() * 1000)
+    return paths
+
+
+def test_file_digest(tmp_path):
+    path = tmp_path / "img.png"
+    path.write_bytes(b"image" * 100_000)
+    assert file_digest(path) == hashlib.sha256(b"image" * 100_000).hexdigest()
+    path.write_bytes(b"")
+    assert file_digest(path) == hashlib.sha256().hexdigest()
+
+
+def test_image_manifest(tmp_path):
+    path = tmp_path / "manifest.json"
+    manifest = ImageManifest(path)
+    assert len(manifest) == 0
+    manifest.set(1, "abc", "image/abc.png")
+    manifest.save()
+    assert json.loads(path.read_text()) == {
+        "1": {"sha256": "abc", "image": "image/abc.png"}
+    }
+
+    manifest = ImageManifest(path)
+    assert manifest.is_current(1, "abc", "image/abc.png")
+    assert not manifest.is_current(1, "abc", "image/def.png")
+    assert not manifest.is_current(1, "def", "image/abc.png")
+    manifest.remove(1)
+    assert not manifest.is_current(1, "abc", "image/abc.png")
+
+
+def test_upload_application_image_from_path(server, make_client, images):
+    gotify = make_client()
+    application = gotify.upload_application_image(1, images["backup"])
+    assert application["image"].startswith("image/")
+    assert server.uploads == [(1, "backup.png")]
+
+
+def test_sync_application_images(server, make_client, images, tmp_path):
+    gotify = make_client()
+    manifest_path = tmp_path / "manifest.json"
+    mapping = {1: images["backup"], "monitoring": images["monitoring"]}
+
+    results = gotify.sync_application_images(mapping, manifest_path)
+    assert results[1]["id"] == 1
+    assert results["monitoring"]["id"] == 2
+    assert sorted(server.uploads) == [(1, "backup.png"), (2, "monitoring.png")]
+
+    # unchanged images are skipped
+    assert gotify.sync_application_images(mapping, manifest_path) == {
+        1: None,
+        "monitoring": None,
+    }
+    assert len(server.uploads) == 2
+
+    # changed files and images replaced on the server are uploaded again
+    images["backup"].write_bytes(b"new backup image")
+    server.applications[2]["image"] = "image/replaced.png"
+    results = gotify.sync_application_images(mapping, manifest_path)
+    assert results[1]["id"] == 1
+    assert results["monitoring"]["id"] == 2
+    assert len(server.uploads) == 4
+
+
+def test_sync_application_images_errors(server, make_client, images, tmp_path):
+    gotify = make_client()
+    manifest = ImageManifest()
+    results = gotify.sync_application_images(
+        {1: images["backup"], 4: images["monitoring"], 3: tmp_path / "missing.png"},
+        manifest,
+    )
+    assert results[1]["id"] == 1
+    assert isinstance(results[4], GotifyError)
+    assert isinstance(results[3], FileNotFoundError)
+    assert len(manifest) == 1
+
+    # an unknown name doesn't abort the batch
+    manifest_path = tmp_path / "manifest.json"
+    results = gotify.sync_application_images(
+        {"unknown": images["monitoring"], 2: images["monitoring"]}, manifest_path
+    )
+    assert isinstance(results["unknown"], KeyError)
+    assert results[2]["id"] == 2
+    assert "2" in json.loads(manifest_path.read_text())
+
+
+async def test_async_sync_application_images(server, make_client, images, tmp_path):
+    gotify = make_client(AsyncGotify)
+    manifest_path = tmp_path / "manifest.json"
+    mapping = {"backup": images["backup"], 2: images["monitoring"]}
+
+    results = await gotify.sync_application_images(
+        mapping, manifest_path, concurrency=1
+    )
+    assert results["backup"]["id"] == 1
+    assert results[2]["id"] == 2
+    assert await gotify.sync_application_images(mapping, manifest_path) == {
+        "backup": None,
+        2: None,
+    }
+    assert sorted(server.uploads) == [(1, "backup.png"), (2, "monitoring.png")]
+
+    results = await gotify.sync_application_images({"unknown": images["backup"]})
+    assert isinstance(results["unknown"], KeyError)
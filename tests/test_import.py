@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import textwrap
+
+import httpx
+
+
+def run(code: str) -> None:
+    subprocess.run([sys.executable, "-c", textwrap.dedent(code)], check=True)
+
+
+def test_lazy_import():
+    run("""
+        import sys
+
+        import gotify
+
+        assert "httpx" not in sys.modules
+        assert "gotify.gotify" not in sys.modules
+        assert "gotify.async_gotify" not in sys.modules
+
+        gf = gotify.Gotify("http://gotify.example.com", client_token="token")
+        agf = gotify.AsyncGotify("http://gotify.example.com")
+        gotify.Spool(":memory:")
+        gotify.RetryPolicy()
+        assert "httpx" not in sys.modules
+
+        gf._get_http_client()
+        assert "httpx" in sys.modules
+        """)
+
+
+def test_lazy_attributes():
+    import gotify
+    from gotify.gotify import Gotify
+
+    assert gotify.Gotify is Gotify
+    assert set(gotify.__all__) <= set(dir(gotify))
+    for name in gotify.__all__:
+        assert getattr(gotify, name).__name__ == name
+
+
+def test_retry_exceptions_default():
+    from gotify import RetryPolicy
+
+    policy = RetryPolicy()
+    assert policy.get_delay("get", 1, 0, exception=httpx.ConnectError("")) is not None
+    assert policy.get_delay("get", 1, 0, exception=ValueError()) is None
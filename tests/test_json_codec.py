@@ -0,0 +1,84 @@
+import json
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, GotifyError
+from gotify.json_codec import (
+    MsgspecCodec,
+    OrjsonCodec,
+    StdlibJSONCodec,
+    default_codec,
+)
+
+
+def available_codecs():
+    codecs = [StdlibJSONCodec()]
+    for codec in (OrjsonCodec, MsgspecCodec):
+        try:
+            codecs.append(codec())
+        except ImportError:
+            pass
+    return codecs
+
+
+class RecordingCodec(StdlibJSONCodec):
+    def __init__(self):
+        self.calls = []
+
+    def dumps(self, obj):
+        self.calls.append("dumps")
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.calls.append("loads")
+        return super().loads(data)
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/error":
+        return httpx.Response(
+            400,
+            json={"error": "Bad Request", "errorCode": 400, "errorDescription": "x"},
+        )
+    assert request.headers["Content-Type"] == "application/json"
+    return httpx.Response(200, json={"id": 1, **json.loads(request.content)})
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda c: type(c).__name__)
+def test_codec(codec):
+    obj = {"message": "Grüße", "extras": {"a": [1, 2.5, None, True]}}
+    assert codec.loads(codec.dumps(obj)) == obj
+    assert codec.loads(json.dumps(obj)) == obj
+    with pytest.raises(ValueError):
+        codec.loads(b"<html>")
+
+
+def test_default_codec():
+    assert default_codec() is default_codec()
+    assert type(default_codec()) in {type(c) for c in available_codecs()}
+
+
+def test_gotify_json_codec(make_client):
+    codec = RecordingCodec()
+    gf = make_client(handler=handler, json_codec=codec)
+
+    assert gf.create_message("Grüße", extras={"a": 1}) == {
+        "id": 1,
+        "message": "Grüße",
+        "extras": {"a": 1},
+    }
+    assert codec.calls == ["dumps", "loads"]
+
+    with pytest.raises(GotifyError) as exc_info:
+        gf._request("/error", method="post", auth_mode="app")
+    assert exc_info.value.error["errorDescription"] == "x"
+    assert codec.calls[-1] == "loads"
+
+
+async def test_async_gotify_json_codec(make_client):
+    codec = RecordingCodec()
+    agf = make_client(AsyncGotify, handler=handler, json_codec=codec)
+
+    assert (await agf.create_message("Hello"))["message"] == "Hello"
+    assert codec.calls == ["dumps", "loads"]
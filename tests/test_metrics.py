@@ -0,0 +1,104 @@
+import gc
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, GotifyError, Metrics, Outbox
+from gotify.metrics import Histogram
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/client/3":
+        return httpx.Response(404, json={"error": "Not Found"})
+    return httpx.Response(200, content=b'{"id": 1}')
+
+
+def test_histogram():
+    hist = Histogram([0.1, 1])
+    for value in (0.05, 0.1, 0.5, 5):
+        hist.observe(value)
+    assert hist.cumulative_counts() == [(0.1, 2), (1, 3), (float("inf"), 4)]
+    assert hist.as_dict() == {
+        "buckets": {"0.1": 2, "1": 3, "+Inf": 4},
+        "sum": 5.65,
+        "count": 4,
+    }
+
+
+def test_gotify_metrics(make_client):
+    metrics = Metrics(buckets=[0.1, 1])
+    gf = make_client(handler=handler, metrics=metrics)
+
+    gf.get_messages(app_id=1)
+    gf.get_messages(app_id=2)
+    with pytest.raises(GotifyError):
+        gf.delete_client(3)
+
+    data = metrics.as_dict()
+    requests = {(r["method"], r["endpoint"], r["status"]): r for r in data["requests"]}
+    ok = requests["GET", "/application/{id}/message", "2xx"]
+    assert ok["count"] == 2
+    assert ok["response_bytes"] == 18
+    assert ok["duration"]["count"] == ok["ttfb"]["count"] == 2
+    assert requests["DELETE", "/client/{id}", "4xx"]["count"] == 1
+    assert data["errors"] == [
+        {
+            "method": "DELETE",
+            "endpoint": "/client/{id}",
+            "error": "GotifyError",
+            "count": 1,
+        }
+    ]
+
+    text = metrics.to_prometheus()
+    assert "# TYPE gotify_requests_total counter" in text
+    assert (
+        'gotify_requests_total{method="GET",endpoint="/application/{id}/message",'
+        'status="2xx"} 2'
+    ) in text
+    assert (
+        'gotify_request_duration_seconds_bucket{method="DELETE",'
+        'endpoint="/client/{id}",status="4xx",le="+Inf"} 1'
+    ) in text
+    assert "gotify_stream_frames_total 0" in text
+
+    metrics.reset()
+    assert metrics.as_dict()["requests"] == []
+
+
+def test_outbox_queue_depth(make_client):
+    metrics = Metrics()
+    gf = make_client(metrics=metrics)
+    outbox = Outbox(gf)
+    outbox.close()
+    assert metrics.gauges() == {"outbox_queue_depth": 0}
+    assert "gotify_outbox_queue_depth 0" in metrics.to_prometheus()
+
+    del outbox
+    gc.collect()
+    assert metrics.gauges() == {"outbox_queue_depth": 0}
+
+
+def test_gauges():
+    metrics = Metrics()
+    depth = [3]
+
+    def gauge():
+        return depth[0]
+
+    metrics.add_gauge("queue_depth", gauge, "Queued items.")
+    metrics.add_gauge("queue_depth", lambda: 2)
+    assert metrics.gauges() == {"queue_depth": 5}
+    assert "# HELP gotify_queue_depth Queued items." in metrics.to_prometheus()
+    metrics.remove_gauge("queue_depth", gauge)
+    assert metrics.gauges() == {"queue_depth": 2}
+
+
+async def test_async_gotify_metrics(make_client):
+    metrics = Metrics()
+    agf = make_client(AsyncGotify, handler=handler, metrics=metrics)
+
+    await agf.get_version()
+    assert [(r["endpoint"], r["count"]) for r in metrics.as_dict()["requests"]] == [
+        ("/version", 1)
+    ]
@@ -0,0 +1,98 @@
+import json
+import pickle
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from gotify import AsyncGotify
+from gotify.models import ApplicationModel, MessageModel, UserModel, parse_date
+
+MESSAGE = {
+    "id": 25,
+    "appid": 5,
+    "message": "**Backup** was successfully finished.",
+    "title": "Backup",
+    "priority": 2,
+    "date": "2018-02-27T19:36:10.5045044+01:00",
+    "extras": {"client::display": {"contentType": "text/markdown"}},
+}
+APPLICATION = {
+    "id": 5,
+    "name": "Backup Server",
+    "description": "Backup server for the interwebs",
+    "token": "AWH0wZ5r0Mbac.r",
+    "image": "image/image.jpeg",
+    "internal": False,
+    "defaultPriority": 4,
+    "lastUsed": None,
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/application":
+        return httpx.Response(200, json=[APPLICATION])
+    if request.url.path == "/current/user":
+        return httpx.Response(200, json={"id": 1, "name": "admin", "admin": True})
+    if request.method == "POST":
+        return httpx.Response(200, json=MESSAGE)
+    return httpx.Response(200, json={"messages": [MESSAGE], "paging": {"size": 1}})
+
+
+def test_parse_date():
+    assert parse_date("2018-02-27T19:36:10.5045044+01:00") == datetime(
+        2018, 2, 27, 19, 36, 10, 504504, timezone(timedelta(hours=1))
+    )
+    assert parse_date("2018-02-27T19:36:10.5Z") == datetime(
+        2018, 2, 27, 19, 36, 10, 500000, timezone.utc
+    )
+    assert parse_date("2018-02-27T19:36:10+01:00").microsecond == 0
+    assert parse_date("2024-01-01T00:00:00Z") == datetime(
+        2024, 1, 1, tzinfo=timezone.utc
+    )
+
+
+def test_message_model():
+    msg = MessageModel.from_dict(MESSAGE)
+    assert not hasattr(msg, "__dict__")
+    assert msg.id == msg["id"] == 25
+    assert msg.date.year == 2018
+    assert msg["date"] == MESSAGE["date"]
+    assert msg.extras is MESSAGE["extras"]
+    assert msg.extras == msg["extras"] == MESSAGE["extras"]
+    assert msg.to_dict() == MESSAGE
+    assert msg == MessageModel.from_dict(json.loads(json.dumps(MESSAGE)))
+    assert pickle.loads(pickle.dumps(msg)) == msg
+
+    msg = MessageModel.from_dict({"id": 1, "appid": 1, "message": "Hello"})
+    assert msg.title is None
+    assert "title" not in msg
+    assert msg.get("title", "") == ""
+    assert msg.extras is None
+
+
+def test_application_model():
+    app = ApplicationModel.from_dict(APPLICATION)
+    assert app.default_priority == app["defaultPriority"] == 4
+    assert app.last_used is None
+    assert "token" in app
+    assert UserModel.from_dict({"id": 1, "name": "admin"}).admin is None
+
+
+def test_gotify_models(make_client):
+    gf = make_client(handler=handler)
+    assert gf.get_messages()["messages"] == [MESSAGE]
+
+    gf.models = True
+    page = gf.get_messages()
+    assert page["messages"] == [MessageModel.from_dict(MESSAGE)]
+    assert list(gf.iter_messages()) == page["messages"]
+    assert isinstance(gf.create_message("Hello"), MessageModel)
+    assert gf.get_application_by_name("Backup Server").id == 5
+    assert gf.get_current_user().admin
+
+
+async def test_async_gotify_models(make_client):
+    agf = make_client(AsyncGotify, handler=handler, models=True)
+    page = await agf.get_messages()
+    assert page["messages"] == [MessageModel.from_dict(MESSAGE)]
+    assert await agf.get_applications() == [ApplicationModel.from_dict(APPLICATION)]
@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from gotify import (
+    AsyncGotify,
+    AsyncMultiGotify,
+    Gotify,
+    GotifyError,
+    GotifyQuorumError,
+    MultiGotify,
+)
+
+APP_TOKEN = "AWH0wZ5r0Mbac.r"
+
+
+def handler(status_code=200, delay=0.0, event=None):
+    def handle(request: httpx.Request) -> httpx.Response:
+        if event is not None:
+            event.wait(5)
+        time.sleep(delay)
+        if status_code != 200:
+            return httpx.Response(
+                status_code,
+                json={
+                    "error": "Error",
+                    "errorCode": status_code,
+                    "errorDescription": "",
+                },
+            )
+        return httpx.Response(200, json={"id": 1, "message": "hello"})
+
+    return handle
+
+
+def async_handler(status_code=200, delay=0.0):
+    sync_handle = handler(status_code)
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return sync_handle(request)
+
+    return handle
+
+
+def gotify(name, handle):
+    return Gotify(
+        f"http://{name}.example.com",
+        app_token=APP_TOKEN,
+        transport=httpx.MockTransport(handle),
+    )
+
+
+def async_gotify(name, handle):
+    return AsyncGotify(
+        f"http://{name}.example.com",
+        app_token=APP_TOKEN,
+        transport=httpx.MockTransport(handle),
+    )
+
+
+def test_multi_gotify_all():
+    targets = [gotify("a", handler()), gotify("b", handler())]
+    with MultiGotify(targets) as multi:
+        result = multi.create_message("hello")
+    assert result.ok
+    assert result.succeeded == ["http://a.example.com", "http://b.example.com"]
+    assert result.results["http://a.example.com"] == {"id": 1, "message": "hello"}
+
+
+def test_multi_gotify_quorum():
+    event = threading.Event()
+    targets = {
+        "a": gotify("a", handler()),
+        "b": gotify("b", handler(500, event=event)),
+        "c": gotify("c", handler()),
+    }
+    with MultiGotify(targets, complete="quorum") as multi:
+        # b is held back until the quorum has been reached
+        result = multi.create_message("hello")
+        assert result.succeeded == ["a", "c"]
+        assert result.pending == ["b"]
+        event.set()
+
+        # fails as soon as b failed, a and c may still be pending
+        with pytest.raises(GotifyQuorumError) as exc_info:
+            multi.create_message("hello", complete="all")
+    result = exc_info.value.result
+    assert isinstance(result.failed["b"], GotifyError)
+    assert result.succeeded == ["a", "c"]
+    assert str(GotifyQuorumError(result)) == (
+        "Message was accepted by 2 of 3 servers, 3 required."
+    )
+
+
+def test_multi_gotify_any_completes_in_background():
+    event = threading.Event()
+    targets = {
+        "fast": gotify("a", handler()),
+        "slow": gotify("b", handler(event=event)),
+    }
+    with MultiGotify(targets, complete="any") as multi:
+        result = multi.create_message("hello")
+        assert result.succeeded == ["fast"]
+        assert result.pending == ["slow"]
+        event.set()
+    assert result.succeeded == ["fast", "slow"]
+
+
+def test_multi_gotify_timeout():
+    targets = {"fast": gotify("a", handler()), "slow": gotify("b", handler(delay=1))}
+    with MultiGotify(targets, timeout=0.2) as multi:
+        with pytest.raises(GotifyQuorumError) as exc_info:
+            multi.create_message("hello")
+    assert exc_info.value.result.succeeded == ["fast"]
+    assert isinstance(exc_info.value.result.failed["slow"], TimeoutError)
+
+
+def test_multi_gotify_timeout_several_pending():
+    event = threading.Event()
+    targets = {name: gotify(name, handler(event=event)) for name in "abc"}
+    with MultiGotify(targets, timeout=0.2) as multi:
+        with pytest.raises(GotifyQuorumError) as exc_info:
+            multi.create_message("hello")
+        event.set()
+    result = exc_info.value.result
+    assert result.pending == []
+    assert all(isinstance(exc, TimeoutError) for exc in result.failed.values())
+    assert list(result.failed) == ["a", "b", "c"]
+
+
+def test_multi_gotify_invalid_targets():
+    with pytest.raises(ValueError):
+        MultiGotify([gotify("a", handler()), gotify("a", handler())])
+    with pytest.raises(ValueError):
+        MultiGotify([])
+    with pytest.raises(ValueError):
+        MultiGotify([gotify("a", handler())], complete=2)
+
+
+async def test_async_multi_gotify_quorum():
+    targets = {
+        "a": async_gotify("a", async_handler()),
+        "b": async_gotify("b", async_handler(500)),
+        "c": async_gotify("c", async_handler()),
+    }
+    async with AsyncMultiGotify(targets, complete="quorum") as multi:
+        result = await multi.create_message("hello")
+        assert result.succeeded == ["a", "c"]
+        assert isinstance(result.failed["b"], GotifyError)
+
+        with pytest.raises(GotifyQuorumError):
+            await multi.create_message("hello", complete=3)
+
+
+async def test_async_multi_gotify_any_completes_in_background():
+    targets = {
+        "fast": async_gotify("a", async_handler()),
+        "slow": async_gotify("b", async_handler(delay=0.1)),
+    }
+    async with AsyncMultiGotify(targets, complete="any") as multi:
+        result = await multi.create_message("hello")
+        assert result.succeeded == ["fast"]
+        assert result.pending == ["slow"]
+    assert result.succeeded == ["fast", "slow"]
+
+
+async def test_async_multi_gotify_timeout():
+    targets = {
+        "fast": async_gotify("a", async_handler()),
+        "slow": async_gotify("b", async_handler(delay=5)),
+    }
+    start = time.monotonic()
+    async with AsyncMultiGotify(targets, timeout=0.1) as multi:
+        with pytest.raises(GotifyQuorumError) as exc_info:
+            await multi.create_message("hello")
+    assert time.monotonic() - start < 1
+    assert exc_info.value.result.succeeded == ["fast"]
+    assert isinstance(exc_info.value.result.failed["slow"], TimeoutError)
+
+
+async def test_async_multi_gotify_timeout_several_pending():
+    targets = {name: async_gotify(name, async_handler(delay=5)) for name in "abc"}
+    start = time.monotonic()
+    async with AsyncMultiGotify(targets, timeout=0.1) as multi:
+        with pytest.raises(GotifyQuorumError) as exc_info:
+            await multi.create_message("hello")
+        assert not multi._background
+    assert time.monotonic() - start < 1
+    result = exc_info.value.result
+    assert list(result.failed) == ["a", "b", "c"]
+    assert all(isinstance(exc, TimeoutError) for exc in result.failed.values())
@@ -0,0 +1,167 @@
+import gzip
+import io
+import json
+import time
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, GotifyError, RateLimiter
+from gotify.json_codec import StdlibJSONCodec
+from gotify.ndjson import open_ndjson, read_ndjson, read_ndjson_by_id
+
+IMPORTED_FIELDS = ("message", "title", "priority", "extras")
+
+
+def message(id, appid=1):
+    return {
+        "id": id,
+        "appid": appid,
+        "message": f"Backup #{id}",
+        "title": "Backup",
+        "priority": id % 3,
+        "date": "2018-02-27T19:36:10.5045044+01:00",
+        "extras": {"client::display": {"contentType": "text/markdown"}},
+    }
+
+
+def message_id(data):
+    return int(data["message"].rsplit("#", 1)[1])
+
+
+def fail_after(server, count):
+    def intercept(request):
+        if request.method == "POST" and len(server.created) >= count:
+            return httpx.Response(400, json={"error": "Bad Request"})
+        return None
+
+    server.intercept = intercept
+
+
+@pytest.fixture
+def fake_gotify(fake_gotify):
+    fake_gotify.add_application("backup")
+    fake_gotify.add_application("ci")
+    return fake_gotify
+
+
+def test_open_ndjson(tmp_path):
+    codec = StdlibJSONCodec()
+    path = tmp_path / "messages.ndjson.gz"
+    with open_ndjson(path, "wb") as f:
+        f.write(b'{"id": 1}\n\n{"id": 2}\n')
+    assert gzip.decompress(path.read_bytes()) == b'{"id": 1}\n\n{"id": 2}\n'
+    with open_ndjson(path) as f:
+        assert list(read_ndjson(f, codec)) == [{"id": 1}, {"id": 2}]
+
+    # compression is detected in file objects
+    buffer = io.BytesIO(path.read_bytes())
+    with open_ndjson(buffer) as f:
+        assert list(read_ndjson(f, codec)) == [{"id": 1}, {"id": 2}]
+    assert not buffer.closed
+
+    with pytest.raises(ValueError):
+        with open_ndjson(path, "r"):
+            pass
+
+
+@pytest.mark.parametrize("models", [False, True])
+def test_export_messages(tmp_path, fake_gotify, make_client, models):
+    messages = [message(id) for id in range(25, 0, -1)]
+    fake_gotify.add_messages(messages)
+    path = tmp_path / "messages.ndjson"
+    assert make_client(models=models).export_messages(path, page_size=10) == 25
+    lines = path.read_bytes().splitlines()
+    assert [json.loads(line) for line in lines] == messages
+
+
+def test_export_import_gzip(tmp_path, fake_gotify, make_client):
+    messages = [message(id, appid=id % 2 + 1) for id in range(10, 0, -1)]
+    fake_gotify.add_messages(messages)
+    gotify = make_client()
+    path = tmp_path / "messages.ndjson.gz"
+    assert gotify.export_messages(path) == 10
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+
+    def delay(request):
+        # older messages are answered slower, so they'd be overtaken if the
+        # messages of an application were sent concurrently
+        if request.method == "POST":
+            time.sleep(0.02 - 0.002 * message_id(json.loads(request.content)))
+
+    fake_gotify.intercept = delay
+    assert gotify.import_messages(path, max_workers=3) == 10
+    # without app tokens, the applications with the same ids are used
+    for app_id in (1, 2):
+        created = fake_gotify.created
+        assert [data for token, data in created if token == f"AppToken{app_id}"] == [
+            {key: msg[key] for key in IMPORTED_FIELDS}
+            for msg in reversed(messages)
+            if msg["appid"] == app_id
+        ]
+
+    fake_gotify.intercept = None
+    fake_gotify.created.clear()
+    assert gotify.import_messages(path, max_workers=1) == 10
+    assert [message_id(data) for _, data in fake_gotify.created] == list(range(1, 11))
+
+
+def test_read_ndjson_by_id():
+    codec = StdlibJSONCodec()
+    lines = b'{"id": 2}\n{"id": 3}\n\n{"id": 1}'
+    assert list(read_ndjson_by_id(io.BytesIO(lines), codec)) == [
+        {"id": 1},
+        {"id": 2},
+        {"id": 3},
+    ]
+
+
+def test_import_messages_tokens(fake_gotify, make_client):
+    lines = b"".join(
+        json.dumps(message(id, appid=7)).encode() + b"\n" for id in range(3)
+    )
+    gotify = make_client(app_token="Default")
+    assert gotify.import_messages(io.BytesIO(lines), app_tokens={7: "Mapped"}) == 3
+    assert {token for token, _ in fake_gotify.created} == {"Mapped"}
+
+    # app_token isn't used implicitly
+    with pytest.raises(KeyError):
+        gotify.import_messages(io.BytesIO(lines))
+
+    lines += json.dumps(message(3, appid=1)).encode() + b"\n"
+    assert gotify.import_messages(io.BytesIO(lines), fallback_token="Default") == 4
+    assert sorted(token for token, _ in fake_gotify.created[-4:]) == [
+        "AppToken1",
+        "Default",
+        "Default",
+        "Default",
+    ]
+
+
+def test_import_messages_error(fake_gotify, make_client):
+    lines = b"".join(json.dumps(message(id)).encode() + b"\n" for id in range(20))
+    fail_after(fake_gotify, 5)
+    with pytest.raises(GotifyError):
+        make_client().import_messages(io.BytesIO(lines), max_workers=2)
+    assert len(fake_gotify.created) == 5
+
+
+async def test_async_export_import(tmp_path, fake_gotify, make_client):
+    messages = [message(id, appid=id % 2 + 1) for id in range(30, 0, -1)]
+    fake_gotify.add_messages(messages)
+    path = tmp_path / "messages.ndjson"
+    gotify = make_client(AsyncGotify)
+    assert await gotify.export_messages(path, page_size=7) == 30
+    assert [json.loads(line) for line in path.read_bytes().splitlines()] == messages
+
+    rate_limit = RateLimiter(rate=1000, burst=5)
+    assert (
+        await gotify.import_messages(path, concurrency=4, rate_limit=rate_limit) == 30
+    )
+    assert [message_id(data) for _, data in fake_gotify.created] == list(range(1, 31))
+
+    fake_gotify.created.clear()
+    fail_after(fake_gotify, 5)
+    with pytest.raises(GotifyError):
+        await gotify.import_messages(path, concurrency=2)
+    assert len(fake_gotify.created) == 5
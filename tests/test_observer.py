@@ -0,0 +1,151 @@
+import json
+import threading
+
+import httpx
+import pytest
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+from gotify import AsyncGotify, GotifyError, RetryPolicy
+from gotify.observer import Observer, endpoint_template
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.events = []
+
+    def on_request(self, event):
+        self.events.append(("request", event.method, event.endpoint, event.attempt))
+
+    def on_response(self, event):
+        assert 0 <= event.ttfb <= event.elapsed
+        self.events.append(("response", event.status_code, event.response_bytes))
+
+    def on_retry(self, event):
+        self.events.append(("retry", event.attempt))
+
+    def on_error(self, event):
+        self.events.append(("error", type(event.exception).__name__))
+
+    def on_stream_connect(self, url):
+        self.events.append(("connect", url))
+
+    def on_stream_frame(self, url, size):
+        self.events.append(("frame", size))
+
+    def on_stream_disconnect(self, url, exception):
+        self.events.append(("disconnect", exception))
+
+
+class FailingObserver(Observer):
+    def on_request(self, event):
+        raise RuntimeError
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/client/3":
+        return httpx.Response(503, json={"error": "Service Unavailable"})
+    return httpx.Response(200, content=b'{"id": 1}')
+
+
+def test_endpoint_template():
+    assert endpoint_template("/application/12/message") == "/application/{id}/message"
+    assert endpoint_template("/message/3") == "/message/{id}"
+    assert endpoint_template("/application") == "/application"
+
+
+def test_gotify_observer(make_client):
+    observer = RecordingObserver()
+    gf = make_client(
+        handler=handler,
+        retry=RetryPolicy(max_attempts=2, backoff_base=0),
+        observers=[FailingObserver(), observer],
+    )
+
+    gf.get_messages(app_id=12)
+    assert observer.events == [
+        ("request", "GET", "/application/{id}/message", 1),
+        ("response", 200, 9),
+    ]
+
+    observer.events.clear()
+    with pytest.raises(GotifyError):
+        gf.delete_client(3)
+    assert observer.events == [
+        ("request", "DELETE", "/client/{id}", 1),
+        ("response", 503, 31),
+        ("retry", 1),
+        ("request", "DELETE", "/client/{id}", 2),
+        ("response", 503, 31),
+        ("error", "GotifyError"),
+    ]
+
+
+async def test_async_gotify_observer(make_client):
+    observer = RecordingObserver()
+    agf = make_client(AsyncGotify, handler=handler, observers=[observer])
+
+    await agf.get_user(5)
+    with pytest.raises(GotifyError):
+        await agf.delete_client(3)
+    assert observer.events == [
+        ("request", "GET", "/user/{id}", 1),
+        ("response", 200, 9),
+        ("request", "DELETE", "/client/{id}", 1),
+        ("response", 503, 31),
+        ("error", "GotifyError"),
+    ]
+
+
+@pytest.fixture
+def stream_server():
+    # the size of non-ASCII frames is counted in bytes, not characters
+    frames = [
+        json.dumps({"id": id, "message": "Grüße"}, ensure_ascii=False) for id in (1, 2)
+    ]
+
+    def handler(websocket):
+        for frame in frames:
+            websocket.send(frame)
+        try:
+            websocket.recv()
+        except ConnectionClosed:
+            pass
+
+    with serve(handler, "127.0.0.1", 0) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        host, port = server.socket.getsockname()[:2]
+        yield f"http://{host}:{port}"
+        server.shutdown()
+
+
+def test_gotify_stream_observer(stream_server, make_client):
+    observer = RecordingObserver()
+    gf = make_client(base_url=stream_server, observers=[observer])
+    stream = gf.stream()
+    assert [next(stream)["id"], next(stream)["id"]] == [1, 2]
+    stream.close()
+
+    url = stream_server.replace("http", "ws") + "/stream"
+    assert observer.events == [
+        ("connect", url),
+        ("frame", 31),
+        ("frame", 31),
+        ("disconnect", None),
+    ]
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+async def test_async_gotify_stream_observer(stream_server, make_client):
+    observer = RecordingObserver()
+    agf = make_client(AsyncGotify, base_url=stream_server, observers=[observer])
+    stream = agf.stream()
+    assert (await stream.__anext__())["id"] == 1
+    await stream.aclose()
+
+    assert [event[0] for event in observer.events] == [
+        "connect",
+        "frame",
+        "disconnect",
+    ]
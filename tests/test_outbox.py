@@ -0,0 +1,97 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, AsyncOutbox, Gotify, Outbox
+
+BASE_URL = "http://localhost:30080"
+APP_TOKEN = "AGo8b9paHo5wPkI"
+CLIENT_TOKEN = "C4er8DTiNk08mtt"
+
+
+@pytest.mark.usefixtures("run_test_server")
+class TestOutbox:
+    def test_send(self):
+        gf = Gotify(BASE_URL, app_token=APP_TOKEN, client_token=CLIENT_TOKEN)
+        with Outbox(gf, max_workers=2) as outbox:
+            for i in range(10):
+                outbox.send(f"OutboxMessage-{i}")
+            assert outbox.flush(timeout=30)
+            assert len(outbox) == 0
+
+        messages = [msg["message"] for msg in gf.get_messages()["messages"]]
+        for i in range(10):
+            assert f"OutboxMessage-{i}" in messages
+
+        with pytest.raises(RuntimeError):
+            outbox.send("foobar")
+
+    def test_on_error(self):
+        errors = []
+        gf = Gotify(BASE_URL, app_token="invalid")
+        with Outbox(gf, on_error=lambda msg, exc: errors.append(msg)) as outbox:
+            outbox.send("OutboxMessage")
+        assert [msg["message"] for msg in errors] == ["OutboxMessage"]
+
+
+def test_close_timeout_with_hung_server(make_client):
+    received = threading.Semaphore(0)
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.release()
+        release.wait(10)
+        return httpx.Response(200, json={"id": 1, "message": "hello"})
+
+    gf = make_client(handler=handler)
+    outbox = Outbox(gf, max_workers=4, maxsize=1)
+    for i in range(4):
+        outbox.send(f"OutboxMessage-{i}")
+        assert received.acquire(timeout=5)
+    # all workers are busy and the queue is full
+    outbox.send("OutboxMessage-4")
+
+    start = time.monotonic()
+    assert not outbox.close(timeout=0.2)
+    assert time.monotonic() - start < 1
+    release.set()
+    for worker in outbox._workers:
+        worker.join(5)
+        assert not worker.is_alive()
+
+
+def test_close_more_workers_than_queue_size(make_client):
+    gf = make_client()
+    outbox = Outbox(gf, max_workers=4, maxsize=1)
+    outbox.send("OutboxMessage")
+    assert outbox.close(timeout=5)
+    assert not any(worker.is_alive() for worker in outbox._workers)
+
+
+@pytest.mark.usefixtures("run_test_server")
+class TestAsyncOutbox:
+    async def test_send(self):
+        agf = AsyncGotify(BASE_URL, app_token=APP_TOKEN, client_token=CLIENT_TOKEN)
+        async with AsyncOutbox(agf, concurrency=2) as outbox:
+            for i in range(10):
+                outbox.send(f"AsyncOutboxMessage-{i}")
+            assert await outbox.flush(timeout=30)
+            assert len(outbox) == 0
+
+        messages = [msg["message"] for msg in (await agf.get_messages())["messages"]]
+        for i in range(10):
+            assert f"AsyncOutboxMessage-{i}" in messages
+
+        with pytest.raises(RuntimeError):
+            outbox.send("foobar")
+
+    async def test_on_error(self):
+        errors = []
+        agf = AsyncGotify(BASE_URL, app_token="invalid")
+        async with AsyncOutbox(
+            agf, on_error=lambda msg, exc: errors.append(msg)
+        ) as outbox:
+            outbox.send("AsyncOutboxMessage")
+        assert [msg["message"] for msg in errors] == ["AsyncOutboxMessage"]
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from gotify import AsyncGotify, GotifyRateLimitError, Observer, RateLimiter
+
+
+class ErrorObserver(Observer):
+    def __init__(self):
+        self.errors = []
+
+    def on_error(self, event):
+        self.errors.append((event.method, event.endpoint, type(event.exception)))
+
+
+def test_burst():
+    limiter = RateLimiter(rate=10, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire("token")
+    assert time.monotonic() - start < 0.05
+
+    limiter.acquire("token")
+    assert time.monotonic() - start >= 0.09
+
+
+def test_separate_buckets():
+    limiter = RateLimiter(rate=1, burst=1, block=False)
+    limiter.acquire("token1")
+    limiter.acquire("token2")
+    with pytest.raises(GotifyRateLimitError):
+        limiter.acquire("token1")
+
+
+async def test_aacquire():
+    limiter = RateLimiter(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.aacquire("token")
+    assert time.monotonic() - start >= 0.09
+
+
+def test_gotify_rate_limit(fake_gotify, make_client):
+    gf = make_client(rate_limit=RateLimiter(rate=20, burst=1))
+    start = time.monotonic()
+    for _ in range(3):
+        gf.create_message("Hello")
+    assert time.monotonic() - start >= 0.09
+    assert len(fake_gotify.created) == 3
+
+
+def test_gotify_rate_limit_per_token(fake_gotify, make_client):
+    observer = ErrorObserver()
+    gf = make_client(
+        # the same token, so only separate limiters keep the requests apart
+        app_token="Token",
+        client_token="Token",
+        rate_limit=RateLimiter(rate=1, block=False),
+        client_rate_limit=RateLimiter(rate=1, block=False),
+        observers=[observer],
+    )
+    gf.create_message("Hello")
+    gf.get_messages()
+    gf.app_token = "OtherToken"
+    gf.create_message("Hello")
+
+    with pytest.raises(GotifyRateLimitError):
+        gf.get_messages()
+    gf.app_token = "Token"
+    with pytest.raises(GotifyRateLimitError):
+        gf.create_message("Hello")
+
+    assert fake_gotify.requests == [
+        ("POST", "/message"),
+        ("GET", "/message"),
+        ("POST", "/message"),
+    ]
+    assert [token for token, _ in fake_gotify.created] == ["Token", "OtherToken"]
+    assert observer.errors == [
+        ("GET", "/message", GotifyRateLimitError),
+        ("POST", "/message", GotifyRateLimitError),
+    ]
+
+
+async def test_async_gotify_rate_limit(fake_gotify, make_client):
+    agf = make_client(AsyncGotify, rate_limit=RateLimiter(rate=20, burst=1))
+    start = time.monotonic()
+    for _ in range(3):
+        await agf.create_message("Hello")
+    assert time.monotonic() - start >= 0.09
+    assert len(fake_gotify.created) == 3
+
+
+async def test_async_gotify_rate_limit_per_token(fake_gotify, make_client):
+    observer = ErrorObserver()
+    agf = make_client(
+        AsyncGotify,
+        app_token="Token",
+        client_token="Token",
+        rate_limit=RateLimiter(rate=1, block=False),
+        client_rate_limit=RateLimiter(rate=1, block=False),
+        observers=[observer],
+    )
+    await agf.create_message("Hello")
+    await agf.get_messages()
+    agf.app_token = "OtherToken"
+    await agf.create_message("Hello")
+
+    with pytest.raises(GotifyRateLimitError):
+        await agf.get_messages()
+    agf.app_token = "Token"
+    with pytest.raises(GotifyRateLimitError):
+        await agf.create_message("Hello")
+
+    assert fake_gotify.requests == [
+        ("POST", "/message"),
+        ("GET", "/message"),
+        ("POST", "/message"),
+    ]
+    assert [token for token, _ in fake_gotify.created] == ["Token", "OtherToken"]
+    assert observer.errors == [
+        ("GET", "/message", GotifyRateLimitError),
+        ("POST", "/message", GotifyRateLimitError),
+    ]
@@ -0,0 +1,60 @@
+import httpx
+import pytest
+
+from gotify import AsyncGotify, GotifyError, RetryPolicy
+
+
+def flaky_handler(failures: int):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= failures:
+            return httpx.Response(503, text="<html>Service Unavailable</html>")
+        return httpx.Response(200, json={"health": "green", "database": "green"})
+
+    return handler, calls
+
+
+def test_get_delay():
+    policy = RetryPolicy(max_attempts=3, backoff_base=1, jitter=False)
+    response = httpx.Response(503)
+    assert policy.get_delay("get", 1, 0, response=response) == 1
+    assert policy.get_delay("get", 2, 0, response=response) == 2
+    assert policy.get_delay("get", 3, 0, response=response) is None
+    assert policy.get_delay("post", 1, 0, response=response) is None
+    assert policy.get_delay("get", 1, 0, response=httpx.Response(404)) is None
+    assert policy.get_delay("get", 1, 0, exception=httpx.ConnectError("")) == 1
+    assert policy.get_delay("get", 1, 0, exception=ValueError()) is None
+
+    retry_after = httpx.Response(429, headers={"Retry-After": "5"})
+    assert policy.get_delay("get", 1, 0, response=retry_after) == 5
+
+    policy = RetryPolicy(backoff_base=1, jitter=False, retry_methods=None, deadline=1.5)
+    assert policy.get_delay("post", 1, 0, response=response) == 1
+    assert policy.get_delay("post", 2, 0, response=response) is None
+
+
+def test_gotify_retry(make_client):
+    handler, calls = flaky_handler(failures=2)
+    gf = make_client(handler=handler, retry=RetryPolicy(backoff_base=0.01))
+    assert gf.get_health()["health"] == "green"
+    assert len(calls) == 3
+
+
+def test_gotify_no_retry(make_client):
+    handler, calls = flaky_handler(failures=1)
+    gf = make_client(handler=handler)
+    with pytest.raises(GotifyError) as exc_info:
+        gf.get_health()
+    assert "503 Service Unavailable" in str(exc_info.value)
+    assert len(calls) == 1
+
+
+async def test_async_gotify_retry(make_client):
+    handler, calls = flaky_handler(failures=2)
+    agf = make_client(
+        AsyncGotify, handler=handler, retry=RetryPolicy(backoff_base=0.01)
+    )
+    assert (await agf.get_health())["health"] == "green"
+    assert len(calls) == 3
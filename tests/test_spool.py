@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, Gotify, Spool
+
+BASE_URL = "http://localhost:30080"
+UNREACHABLE_URL = "http://localhost:30079"
+APP_TOKEN = "AGo8b9paHo5wPkI"
+CLIENT_TOKEN = "C4er8DTiNk08mtt"
+
+
+def test_spool(tmp_path):
+    spool = Spool(tmp_path / "spool.db")
+    for i in range(3):
+        spool.append({"message": f"msg-{i}"})
+    assert len(spool) == 3
+
+    keys = []
+    for key, payload in spool:
+        assert payload == {"message": f"msg-{len(keys)}"}
+        keys.append(key)
+
+    spool.remove(keys[0])
+    spool.close()
+
+    spool = Spool(tmp_path / "spool.db")
+    assert [payload["message"] for _, payload in spool] == ["msg-1", "msg-2"]
+    for key, _ in spool:
+        spool.remove(key)
+    assert len(spool) == 0
+    assert list(spool) == []
+
+
+def test_spool_limits(tmp_path):
+    spool = Spool(tmp_path / "spool.db", max_messages=2)
+    for i in range(5):
+        spool.append({"message": f"msg-{i}"})
+    assert [payload["message"] for _, payload in spool] == ["msg-3", "msg-4"]
+
+    spool = Spool(tmp_path / "spool2.db", max_bytes=50)
+    for i in range(5):
+        spool.append({"message": f"msg-{i}"})
+    assert [payload["message"] for _, payload in spool] == ["msg-3", "msg-4"]
+
+
+@pytest.mark.usefixtures("run_test_server")
+def test_gotify_spool(tmp_path):
+    gf = Gotify(
+        UNREACHABLE_URL,
+        app_token=APP_TOKEN,
+        client_token=CLIENT_TOKEN,
+        spool=Spool(tmp_path / "spool.db"),
+    )
+    for i in range(3):
+        with pytest.raises(httpx.ConnectError):
+            gf.create_message(f"SpooledMessage-{i}")
+    assert len(gf.spool) == 3
+
+    gf.config(base_url=BASE_URL)
+    r = gf.create_message("SpooledMessage-3")
+    assert len(gf.spool) == 0
+
+    messages = gf.get_messages(limit=4)["messages"]
+    assert [msg["message"] for msg in messages] == [
+        f"SpooledMessage-{i}" for i in reversed(range(4))
+    ]
+    assert messages[0]["id"] == r["id"]
+
+
+@pytest.mark.usefixtures("run_test_server")
+async def test_async_gotify_spool(tmp_path):
+    agf = AsyncGotify(
+        UNREACHABLE_URL,
+        app_token=APP_TOKEN,
+        client_token=CLIENT_TOKEN,
+        spool=Spool(tmp_path / "spool.db"),
+    )
+    for i in range(3):
+        with pytest.raises(httpx.ConnectError):
+            await agf.create_message(f"AsyncSpooledMessage-{i}")
+    assert len(agf.spool) == 3
+
+    agf.config(base_url=BASE_URL)
+    assert await agf.flush_spool() == 3
+    assert len(agf.spool) == 0
+
+    messages = (await agf.get_messages(limit=3))["messages"]
+    assert [msg["message"] for msg in messages] == [
+        f"AsyncSpooledMessage-{i}" for i in reversed(range(3))
+    ]
+
+
+async def test_async_flush_spool_concurrently(tmp_path, make_client):
+    sent = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        sent.append(json.loads(request.content)["message"])
+        return httpx.Response(200, json={"id": len(sent)})
+
+    spool = Spool(tmp_path / "spool.db")
+    for i in range(5):
+        spool.append({"message": f"msg-{i}"})
+    agf = make_client(AsyncGotify, handler=handler, spool=spool)
+    counts = await asyncio.gather(agf.flush_spool(), agf.flush_spool())
+    assert sorted(counts) == [0, 5]
+    assert sent == [f"msg-{i}" for i in range(5)]
+    assert len(spool) == 0
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import threading
+
+import pytest
+import websockets.sync.client
+from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
+
+from gotify import AsyncGotify
+from gotify.backoff import exponential_backoff
+
+
+def message(id):
+    return {"id": id, "appid": 1, "message": f"Message {id}"}
+
+
+class FakeWebSocket:
+    # sends `frames` and then drops the connection unless it's the last one
+    def __init__(self, frames, drop):
+        self.frames = [json.dumps(message(id)) for id in frames]
+        self.drop = drop
+        self.closed = threading.Event()
+
+    def recv(self):
+        if self.frames:
+            return self.frames.pop(0)
+        if self.drop:
+            raise ConnectionClosedError(None, None)
+        self.closed.wait(5)
+        raise ConnectionClosedOK(None, None)
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeAsyncWebSocket(FakeWebSocket):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def recv(self):
+        if self.frames or self.drop:
+            return super().recv()
+        await asyncio.Event().wait()
+
+
+class FakeConnect:
+    """Replace `websockets` connect functions with scripted connections.
+
+    Every connection is a tuple of the ids of messages that the server
+    received while connecting and the ids sent over the websocket.
+    """
+
+    def __init__(self, server, connections, websocket_class=FakeWebSocket):
+        self.server = server
+        self.connections = list(connections)
+        self.websocket_class = websocket_class
+        self.calls = 0
+
+    def __call__(self, url, **kwargs):
+        self.calls += 1
+        new, frames = self.connections.pop(0)
+        self.server.add_messages(message(id) for id in new)
+        return self.websocket_class(frames, drop=bool(self.connections))
+
+
+# - message 4 is sent while connecting and is back-filled, so its frame is
+#   skipped
+# - the connection drops after message 5, messages 6 and 7 are missed and
+#   back-filled after reconnecting
+# - the server replays 5 and 7 which are skipped
+CONNECTIONS = [((4,), (4, 5)), ((5, 6, 7), (5, 7, 8))]
+
+
+@pytest.fixture
+def server(fake_gotify):
+    fake_gotify.add_messages(message(id) for id in (1, 2, 3))
+    return fake_gotify
+
+
+def test_exponential_backoff():
+    delays = [
+        exponential_backoff(attempt, 0.5, 3, jitter=False) for attempt in range(5)
+    ]
+    assert delays == [0.5, 1, 2, 3, 3]
+    assert exponential_backoff(10_000, jitter=False) == 60
+    assert all(0 <= exponential_backoff(3, 1) <= 8 for _ in range(100))
+
+
+def test_gotify_stream_reconnect(server, make_client, monkeypatch):
+    connect = FakeConnect(server, CONNECTIONS)
+    monkeypatch.setattr(websockets.sync.client, "connect", connect)
+    gf = make_client()
+
+    stream = gf.stream(reconnect=True, backoff_base=0)
+    ids = [next(stream)["id"] for _ in range(5)]
+    stream.close()
+
+    assert ids == [4, 5, 6, 7, 8]
+    assert connect.calls == 2
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+async def test_async_gotify_stream_reconnect(server, make_client, monkeypatch):
+    connect = FakeConnect(server, CONNECTIONS, FakeAsyncWebSocket)
+    monkeypatch.setattr("websockets.client.connect", connect)
+    agf = make_client(AsyncGotify)
+
+    stream = agf.stream(reconnect=True, backoff_base=0)
+    ids = [(await stream.__anext__())["id"] for _ in range(5)]
+    await stream.aclose()
+
+    assert ids == [4, 5, 6, 7, 8]
+    assert connect.calls == 2
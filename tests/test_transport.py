@@ -0,0 +1,45 @@
+import importlib.util
+
+import httpx
+import pytest
+
+from gotify import AsyncGotify, Gotify
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"version": "2.4.0", "path": request.url.path})
+
+
+def test_gotify_transport(make_client):
+    with make_client(handler=handler) as gf:
+        assert gf.get_version() == {"version": "2.4.0", "path": "/version"}
+
+
+async def test_async_gotify_transport(make_client):
+    agf = make_client(AsyncGotify, handler=handler)
+    assert await agf.get_version() == {"version": "2.4.0", "path": "/version"}
+    await agf.aclose()
+
+
+def test_gotify_http2_requires_h2(fake_gotify):
+    if importlib.util.find_spec("h2") is not None:
+        pytest.skip("h2 is installed")
+    with pytest.raises(ImportError):
+        Gotify(fake_gotify.base_url, http2=True)._get_http_client()
+
+
+async def test_async_gotify_http2(monkeypatch, fake_gotify):
+    pytest.importorskip("h2")
+    created = []
+
+    class AsyncClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", AsyncClient)
+    limits = httpx.Limits(max_connections=1)
+    async with AsyncGotify(fake_gotify.base_url, http2=True, limits=limits) as agf:
+        assert isinstance(agf.http_client, AsyncClient)
+    assert created[0]["http2"] is True
+    assert created[0]["limits"] is limits